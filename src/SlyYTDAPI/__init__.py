@@ -1,3 +1,9 @@
 from SlyAPI import OAuth2 as OAuth2, UrlApiKey as UrlApiKey
 from .ytdapi import *
-from .members import YouTubeData_WithMembers as YouTubeData_WithMembers
\ No newline at end of file
+from .members import YouTubeData_WithMembers as YouTubeData_WithMembers
+from .quota import QuotaScheduler as QuotaScheduler, Priority as Priority, QuotaExhausted as QuotaExhausted
+from .cache import MemoryCache as MemoryCache, SqliteCache as SqliteCache
+from .session import SessionConfig as SessionConfig
+from .instrument import Instrument as Instrument, HistogramRecorder as HistogramRecorder
+from .retry import RetryPolicy as RetryPolicy, RateLimiter as RateLimiter, CircuitBreaker as CircuitBreaker, CircuitOpen as CircuitOpen
+from .pool import CredentialPool as CredentialPool, Balance as Balance
\ No newline at end of file
@@ -0,0 +1,135 @@
+'''
+Response caching with ETag revalidation
+https://developers.google.com/youtube/v3/getting-started#etags
+'''
+import json
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+from urllib.parse import urlencode
+from SlyAPI.web import JsonMap
+
+# seconds a response is used before revalidating it, by endpoint.
+# endpoints not listed are not cached.
+DEFAULT_TTL: dict[str, float] = {
+    '/videos':          5 * 60,
+    '/channels':        60 * 60,
+    '/playlistItems':   10 * 60,
+}
+
+@dataclass
+class CacheEntry:
+    etag: str|None
+    stored_at: float
+    body: JsonMap
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    # stale entries confirmed unchanged by 304 Not Modified
+    revalidated: int = 0
+
+class ResponseCache(ABC):
+    '''
+    Base class for response caches, keyed on endpoint and parameters.
+    Responses younger than their endpoint's TTL are returned without a
+    request. Older responses are revalidated with If-None-Match.
+    Authorization is not part of the key, so do not share a cache between
+    clients that see different results for `mine` requests.
+    '''
+    ttl: dict[str, float]
+    stats: CacheStats
+
+    def __init__(self, ttl: dict[str, float]|None = None, clock: Callable[[], float] = time.time):
+        self.ttl = DEFAULT_TTL | (ttl or {})
+        self.stats = CacheStats()
+        self._clock = clock
+
+    def key(self, endpoint: str, params: dict[str, str|int]) -> str|None:
+        '''Cache key for a request, or None if the endpoint is not cached.'''
+        if endpoint not in self.ttl:
+            return None
+        return endpoint + '?' + urlencode(sorted(params.items()))
+
+    def is_fresh(self, endpoint: str, entry: CacheEntry) -> bool:
+        return self._clock() - entry.stored_at < self.ttl[endpoint]
+
+    def store(self, key: str, body: JsonMap):
+        etag = body.get('etag')
+        self.put(key, CacheEntry(etag if isinstance(etag, str) else None, self._clock(), body))
+
+    @abstractmethod
+    def get(self, key: str) -> CacheEntry|None: pass
+
+    @abstractmethod
+    def put(self, key: str, entry: CacheEntry): pass
+
+    @abstractmethod
+    def touch(self, key: str):
+        '''Mark an entry as fresh again after revalidation.'''
+
+class MemoryCache(ResponseCache):
+    'Least-recently-used cache of up to `max_entries` responses.'
+    max_entries: int
+    _entries: OrderedDict[str, CacheEntry]
+
+    def __init__(self, max_entries: int = 1024, ttl: dict[str, float]|None = None,
+        clock: Callable[[], float] = time.time):
+        super().__init__(ttl, clock)
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key: str) -> CacheEntry|None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, entry: CacheEntry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def touch(self, key: str):
+        if entry := self._entries.get(key):
+            entry.stored_at = self._clock()
+
+class SqliteCache(ResponseCache):
+    'Cache persisted to an SQLite database file.'
+    _db: sqlite3.Connection
+
+    def __init__(self, path: str, ttl: dict[str, float]|None = None,
+        clock: Callable[[], float] = time.time):
+        super().__init__(ttl, clock)
+        self._db = sqlite3.connect(path)
+        self._db.execute('''CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY, etag TEXT, stored_at REAL, body TEXT)''')
+        self._db.commit()
+
+    def get(self, key: str) -> CacheEntry|None:
+        row = self._db.execute(
+            'SELECT etag, stored_at, body FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, stored_at, body = row
+        return CacheEntry(etag, stored_at, json.loads(body))
+
+    def put(self, key: str, entry: CacheEntry):
+        self._db.execute(
+            'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)',
+            (key, entry.etag, entry.stored_at, json.dumps(entry.body)))
+        self._db.commit()
+
+    def touch(self, key: str):
+        self._db.execute(
+            'UPDATE responses SET stored_at = ? WHERE key = ?', (self._clock(), key))
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,110 @@
+'''
+Coalescing of concurrent identical requests, and of concurrent single-ID
+lookups into one 50-ID request
+'''
+import asyncio
+from typing import Any, Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+T = TypeVar('T')
+
+class SingleFlight(Generic[K, T]):
+    '''
+    Runs at most one call per key at a time. Callers with the same key
+    while a call is in flight wait for its result instead of calling again.
+    A cancelled caller does not cancel the call for the others.
+    '''
+    # calls that were answered by another caller's call
+    shared: int
+    _in_flight: dict[K, 'asyncio.Task[T]']
+
+    def __init__(self):
+        self.shared = 0
+        self._in_flight = {}
+
+    async def do(self, key: K, call: Callable[[], Awaitable[T]]) -> T:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+def _observe(future: 'asyncio.Future[Any]'):
+    # its callers may all be cancelled, so nothing else would retrieve the exception
+    if not future.cancelled():
+        future.exception()
+
+class MicroBatcher(Generic[K, T]):
+    '''
+    Collects keys requested within `window` seconds of the first, and looks
+    them up with one call to `fetch`, up to `max_size` keys per call.
+    `fetch` returns the values found by key; keys it omits resolve to None.
+    '''
+    window: float
+    max_size: int
+    # calls to fetch
+    batches: int
+    _fetch: Callable[[list[K]], Awaitable[dict[K, T]]]
+    _pending: dict[K, 'asyncio.Future[T|None]']
+    _timer: asyncio.TimerHandle|None
+    _running: set['asyncio.Task[None]']
+
+    def __init__(self, fetch: Callable[[list[K]], Awaitable[dict[K, T]]],
+        window: float = 0.005, max_size: int = 50):
+        self.window = window
+        self.max_size = max_size
+        self.batches = 0
+        self._fetch = fetch
+        self._pending = {}
+        self._timer = None
+        self._running = set()
+
+    async def get(self, key: K) -> T|None:
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            future.add_done_callback(_observe)
+            self._pending[key] = future
+            if len(self._pending) >= self.max_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            self.batches += 1
+            task = asyncio.ensure_future(self._run(batch))
+            # keep a reference until done, so the task is not collected
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: dict[K, 'asyncio.Future[T|None]']):
+        try:
+            found = await self._fetch(list(batch))
+        except BaseException as e:
+            for future in batch.values():
+                if future.done() or future.cancelled():
+                    continue
+                # a cancelled fetch cancels its waiters, rather than failing them with CancelledError
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        for key, future in batch.items():
+            if not (future.done() or future.cancelled()):
+                future.set_result(found.get(key))
+
+def request_key(path: str, params: dict[str, Any]) -> tuple[str, tuple[tuple[str, Any], ...]]:
+    'Key identifying a GET request by its endpoint and parameters.'
+    return path, tuple(sorted(params.items()))
@@ -0,0 +1,530 @@
+'''
+Crawling channels, their uploads, videos and comments with several worker
+processes, from a frontier of tasks in SQLite which survives crashes
+'''
+import asyncio
+import bisect
+import hashlib
+import json
+import multiprocessing
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Awaitable, Callable, Generator, Iterable, Iterator
+from aiohttp import ClientError
+from SlyAPI.web import ApiError
+from .ytdapi import YouTubeData, Part
+from .export import video_row
+from .harvest import CommentHarvester
+from .resolve import ChannelResolver
+from .retry import QUOTA_REASONS, CircuitOpen, error_reason
+from .store import SqliteStore
+from .sync import uploads_playlist_id
+
+class TaskKind(Enum):
+    # key: a channel URL, handle or ID. Result: the channel ID
+    RESOLVE_CHANNEL     = 'resolve_channel'
+    # key: a channel ID. Result: the number of uploads listed
+    LIST_UPLOADS        = 'list_uploads'
+    # key: a video ID. Result: the video, as from `video_row`
+    HYDRATE_VIDEO       = 'hydrate_video'
+    # key: a video ID. Result: its comments
+    HARVEST_COMMENTS    = 'harvest_comments'
+
+class TaskState(Enum):
+    PENDING = 0
+    LEASED  = 1
+    DONE    = 2
+    FAILED  = 3
+
+@dataclass(frozen=True, slots=True)
+class Task:
+    kind: TaskKind
+    key: str
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], 'big')
+
+class HashRing:
+    '''
+    Assigns keys to `shards` by consistent hashing: each shard has
+    `replicas` points on a ring of hashes, and owns the keys hashed just
+    before its points. Changing the number of shards moves only about 1/N
+    of the keys.
+    '''
+    shards: int
+    replicas: int
+
+    def __init__(self, shards: int, replicas: int = 64):
+        if shards < 1:
+            raise ValueError("At least one shard is needed")
+        self.shards = shards
+        self.replicas = replicas
+        points = sorted((_hash(F"{shard}:{i}"), shard) for shard in range(shards) for i in range(replicas))
+        self._points = [point for point, _ in points]
+        self._owners = [shard for _, shard in points]
+
+    def shard(self, key: str) -> int:
+        i = bisect.bisect(self._points, _hash(key))
+        return self._owners[i % len(self._points)]
+
+def _json(value: Any) -> Any:
+    match value:
+        case datetime():
+            return value.isoformat()
+        case Enum():
+            return value.value
+        case _:
+            raise TypeError(F"Cannot serialize {type(value).__name__}")
+
+# seconds to wait for another worker's write to the database
+_LOCK_TIMEOUT = 60.0
+
+class Frontier:
+    '''
+    Tasks to crawl and their results, in an SQLite database in WAL mode
+    shared by all worker processes. Each task belongs to the shard of its
+    key, and is only leased by the worker of that shard. Results and the
+    tasks found from them are saved in the same transaction as the task is
+    completed, so a crash loses only the work of leased tasks, which
+    `recover` makes pending again. Tasks are never added twice.
+    A task tried again after an error is not leased until its backoff ends.
+    '''
+    path: str
+    ring: HashRing
+    _db: sqlite3.Connection
+
+    def __init__(self, path: str, ring: HashRing):
+        self.path = path
+        self.ring = ring
+        # transactions are begun explicitly, to take the write lock before reading
+        self._db = sqlite3.connect(path, timeout=_LOCK_TIMEOUT, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode = WAL')
+        self._db.execute('PRAGMA synchronous = NORMAL')
+        with self._transaction():
+            self._db.execute('''CREATE TABLE IF NOT EXISTS tasks (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                shard INTEGER NOT NULL,
+                state INTEGER NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                -- seconds since the epoch, before which the task is not leased
+                ready_at REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (kind, key))''')
+            self._db.execute('CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, shard, kind)')
+            self._db.execute('''CREATE TABLE IF NOT EXISTS results (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT,
+                PRIMARY KEY (kind, key))''')
+            self._db.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)')
+
+    @contextmanager
+    def _transaction(self) -> Generator[None, None, None]:
+        self._db.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self._db.execute('ROLLBACK')
+            raise
+        self._db.execute('COMMIT')
+
+    def _insert(self, tasks: Iterable[Task]) -> int:
+        before = self._db.total_changes
+        self._db.executemany('INSERT OR IGNORE INTO tasks (kind, key, shard) VALUES (?, ?, ?)', (
+            (task.kind.value, task.key, self.ring.shard(task.key)) for task in tasks))
+        return self._db.total_changes - before
+
+    def add(self, tasks: Iterable[Task]) -> int:
+        '''Add tasks which are not in the frontier yet. Returns how many were added.'''
+        with self._transaction():
+            return self._insert(tasks)
+
+    def lease(self, shard: int, kind: TaskKind, limit: int, minimum: int = 1) -> list[Task]:
+        '''Up to `limit` pending tasks of a shard, or none if fewer than `minimum` are pending.'''
+        now = time.time()
+        # only take the write lock if there may be enough
+        pending, = self._db.execute(
+            'SELECT COUNT(*) FROM (SELECT 1 FROM tasks WHERE state = ? AND shard = ? AND kind = ? AND ready_at <= ? LIMIT ?)',
+            (TaskState.PENDING.value, shard, kind.value, now, minimum)).fetchone()
+        if pending < minimum:
+            return []
+        with self._transaction():
+            rows = self._db.execute(
+                'SELECT key FROM tasks WHERE state = ? AND shard = ? AND kind = ? AND ready_at <= ? LIMIT ?',
+                (TaskState.PENDING.value, shard, kind.value, now, limit)).fetchall()
+            if len(rows) < minimum:
+                return []
+            self._db.executemany(
+                'UPDATE tasks SET state = ?, attempts = attempts + 1 WHERE kind = ? AND key = ?',
+                ((TaskState.LEASED.value, kind.value, key) for key, in rows))
+        return [Task(kind, key) for key, in rows]
+
+    def complete(self, results: dict[Task, Any], found: Iterable[Task] = ()):
+        '''Save the results of leased tasks, and add the tasks found from them.'''
+        with self._transaction():
+            self._db.executemany('INSERT OR REPLACE INTO results VALUES (?, ?, ?)', (
+                (task.kind.value, task.key, json.dumps(value, default=_json))
+                for task, value in results.items()))
+            self._db.executemany('UPDATE tasks SET state = ? WHERE kind = ? AND key = ?', (
+                (TaskState.DONE.value, task.kind.value, task.key) for task in results))
+            self._insert(found)
+
+    def fail(self, tasks: Iterable[Task], error: str):
+        '''Give up on leased tasks, which will not succeed if tried again.'''
+        with self._transaction():
+            self._db.executemany('UPDATE tasks SET state = ?, error = ? WHERE kind = ? AND key = ?', (
+                (TaskState.FAILED.value, error, task.kind.value, task.key) for task in tasks))
+
+    def retry(self, tasks: Iterable[Task], error: str, backoff: float, max_attempts: int):
+        '''
+        Make leased tasks which failed, but may succeed later, pending again
+        after `backoff` seconds, doubled for each attempt before. Those which
+        were leased `max_attempts` times already are failed instead.
+        '''
+        with self._transaction():
+            self._db.executemany('''UPDATE tasks SET
+                state = CASE WHEN attempts >= ? THEN ? ELSE ? END,
+                error = ?,
+                ready_at = ? + ? * (1 << (attempts - 1))
+                WHERE kind = ? AND key = ? AND state = ?''', (
+                (max_attempts, TaskState.FAILED.value, TaskState.PENDING.value, error,
+                    time.time(), backoff, task.kind.value, task.key, TaskState.LEASED.value)
+                for task in tasks))
+
+    def release(self, tasks: Iterable[Task]):
+        '''Make leased tasks pending again, without counting the attempt, such as when the quota runs out.'''
+        with self._transaction():
+            self._db.executemany(
+                'UPDATE tasks SET state = ?, attempts = attempts - 1 WHERE kind = ? AND key = ? AND state = ?', (
+                (TaskState.PENDING.value, task.kind.value, task.key, TaskState.LEASED.value) for task in tasks))
+
+    def recover(self, shard: int, max_attempts: int) -> int:
+        '''
+        Make tasks leased by a previous worker of a shard pending again,
+        unless they were leased `max_attempts` times already: those are
+        failed, so a task which crashes workers does not stop the crawl.
+        Returns how many are pending again.
+        '''
+        with self._transaction():
+            self._db.execute(
+                'UPDATE tasks SET state = ?, error = ? WHERE state = ? AND shard = ? AND attempts >= ?',
+                (TaskState.FAILED.value, 'worker stopped', TaskState.LEASED.value, shard, max_attempts))
+            return self._db.execute(
+                'UPDATE tasks SET state = ? WHERE state = ? AND shard = ?',
+                (TaskState.PENDING.value, TaskState.LEASED.value, shard)).rowcount
+
+    def reshard(self) -> int:
+        '''
+        Move unfinished tasks to their shard in `ring`, if it has a different
+        number of shards from when they were added. Returns how many moved.
+        '''
+        layout = F"{self.ring.shards}:{self.ring.replicas}"
+        with self._transaction():
+            row = self._db.execute("SELECT value FROM meta WHERE name = 'ring'").fetchone()
+            if row is not None and row[0] == layout:
+                return 0
+            rows = self._db.execute('SELECT kind, key, shard FROM tasks WHERE state < ?',
+                (TaskState.DONE.value,)).fetchall()
+            moved = [
+                (shard, kind, key) for kind, key, old in rows
+                if (shard := self.ring.shard(key)) != old
+            ]
+            self._db.executemany('UPDATE tasks SET shard = ? WHERE kind = ? AND key = ?', moved)
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('ring', ?)", (layout,))
+        return len(moved)
+
+    def outstanding(self, kinds: Iterable[TaskKind]|None = None) -> int:
+        '''Tasks pending or leased in all shards, of `kinds` or of any kind.'''
+        if kinds is None:
+            return self._db.execute('SELECT COUNT(*) FROM tasks WHERE state < ?',
+                (TaskState.DONE.value,)).fetchone()[0]
+        kinds = [kind.value for kind in kinds]
+        return self._db.execute(
+            F"SELECT COUNT(*) FROM tasks WHERE state < ? AND kind IN ({', '.join('?' * len(kinds))})",
+            (TaskState.DONE.value, *kinds)).fetchone()[0]
+
+    def counts(self) -> dict[tuple[TaskKind, TaskState], int]:
+        return {
+            (TaskKind(kind), TaskState(state)): count
+            for kind, state, count in self._db.execute(
+                'SELECT kind, state, COUNT(*) FROM tasks GROUP BY kind, state')
+        }
+
+    def results(self, kind: TaskKind) -> Iterator[tuple[str, Any]]:
+        for key, value in self._db.execute('SELECT key, value FROM results WHERE kind = ?', (kind.value,)):
+            yield key, json.loads(value)
+
+    def close(self):
+        self._db.close()
+
+@dataclass
+class _Settings:
+    path: str
+    client: Callable[[], YouTubeData]
+    shards: int
+    replicas: int
+    parts: set[Part]
+    uploads_limit: int|None
+    comments: bool
+    concurrency: int
+    max_attempts: int
+    backoff: float
+    poll_interval: float
+
+def _permanent(error: ApiError) -> bool:
+    'Whether the request would fail again, such as for a video with comments disabled.'
+    return 400 <= error.status < 500 and error.status != 429 and error_reason(error) not in QUOTA_REASONS
+
+# exit code of a worker which stopped because the quota is exceeded (EX_TEMPFAIL)
+_QUOTA_EXIT = 75
+
+class _Worker:
+    'Crawls the tasks of one shard, in a process of its own.'
+    settings: _Settings
+    shard: int
+    frontier: Frontier
+    yt: YouTubeData
+    resolver: ChannelResolver
+    harvester: CommentHarvester
+    # whether the quota ran out, so no more tasks are leased
+    stopped: bool
+
+    def __init__(self, settings: _Settings, shard: int):
+        self.settings = settings
+        self.shard = shard
+        self.frontier = Frontier(settings.path, HashRing(settings.shards, settings.replicas))
+        self.stopped = False
+
+    async def run(self):
+        s = self.settings
+        self.frontier.recover(self.shard, s.max_attempts)
+        handles = SqliteStore(s.path, 'handles', _LOCK_TIMEOUT)
+        async with s.client() as yt:
+            self.yt = yt
+            self.resolver = ChannelResolver(yt, handles, s.concurrency)
+            self.harvester = CommentHarvester(yt, s.concurrency)
+            await asyncio.gather(
+                self._loop(TaskKind.RESOLVE_CHANNEL, self._resolve, 50),
+                self._loop(TaskKind.LIST_UPLOADS, self._uploads, 1),
+                self._loop(TaskKind.HYDRATE_VIDEO, self._hydrate, 50),
+                self._loop(TaskKind.HARVEST_COMMENTS, self._comments, 1))
+        handles.close()
+        self.frontier.close()
+
+    async def _loop(self, kind: TaskKind, run: Callable[[list[Task]], Awaitable[None]], size: int):
+        '''
+        Keep up to `concurrency` leases of `size` tasks of a kind in flight,
+        until no tasks of any kind are left in any shard, or the worker stops.
+        '''
+        s = self.settings
+        in_flight: set[asyncio.Future[None]] = set()
+        try:
+            while True:
+                while not self.stopped and len(in_flight) < s.concurrency:
+                    # wait for requests of 50 IDs while any worker may find more
+                    minimum = size if kind == TaskKind.HYDRATE_VIDEO and self.frontier.outstanding(
+                        [TaskKind.RESOLVE_CHANNEL, TaskKind.LIST_UPLOADS]) else 1
+                    tasks = self.frontier.lease(self.shard, kind, size, minimum)
+                    if not tasks:
+                        break
+                    in_flight.add(asyncio.ensure_future(self._guard(tasks, run)))
+                if in_flight:
+                    done, in_flight = await asyncio.wait(in_flight,
+                        timeout=s.poll_interval, return_when=asyncio.FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                elif self.stopped:
+                    return
+                # other shards may still find tasks for this one, until all are done
+                elif self.frontier.outstanding():
+                    await asyncio.sleep(s.poll_interval)
+                else:
+                    return
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    async def _guard(self, tasks: list[Task], run: Callable[[list[Task]], Awaitable[None]]):
+        '''
+        Run a lease of tasks. If the quota is exceeded, they are released
+        and the worker stops; if the request would fail again, they are
+        failed; after other errors of the API or connection, they are tried
+        again later.
+        '''
+        s = self.settings
+        try:
+            await run(tasks)
+        except CircuitOpen:
+            self.stopped = True
+            self.frontier.release(tasks)
+        except ApiError as e:
+            if error_reason(e) in QUOTA_REASONS:
+                self.stopped = True
+                self.frontier.release(tasks)
+            elif _permanent(e):
+                self.frontier.fail(tasks, F"{e.status} {error_reason(e)}")
+            else:
+                self.frontier.retry(tasks, F"{e.status} {error_reason(e)}", s.backoff, s.max_attempts)
+        except (ClientError, asyncio.TimeoutError) as e:
+            self.frontier.retry(tasks, repr(e), s.backoff, s.max_attempts)
+
+    async def _resolve(self, tasks: list[Task]):
+        try:
+            ids = await self.resolver.ids(task.key for task in tasks)
+        except ApiError as e:
+            if len(tasks) == 1 or not _permanent(e):
+                raise
+            # find which one fails by looking each up alone. those already found are in the store
+            for task in tasks:
+                await self._guard([task], self._resolve)
+            return
+        self.frontier.complete(
+            { task: ids[task.key] for task in tasks },
+            [Task(TaskKind.LIST_UPLOADS, id) for id in ids.values() if id is not None])
+
+    async def _uploads(self, tasks: list[Task]):
+        task, = tasks
+        ids = [
+            video.id async for video in self.yt.get_playlist_videos(
+                uploads_playlist_id(task.key), limit=self.settings.uploads_limit, lazy=True)
+        ]
+        self.frontier.complete({ task: len(ids) }, [Task(TaskKind.HYDRATE_VIDEO, id) for id in ids])
+
+    async def _hydrate(self, tasks: list[Task]):
+        s = self.settings
+        videos = { v.id: v for v in await self.yt.videos([t.key for t in tasks], s.parts) }
+        results = { task: None if (v := videos.get(task.key)) is None else video_row(v) for task in tasks }
+        found = [
+            Task(TaskKind.HARVEST_COMMENTS, id)
+            for id, video in videos.items()
+            if s.comments and getattr(video, 'comment_count', None) != 0
+        ]
+        self.frontier.complete(results, found)
+
+    async def _comments(self, tasks: list[Task]):
+        task, = tasks
+        comments = [
+            {
+                'id': c.id,
+                'parent_id': c.parent_id,
+                'author_channel_id': c.author_channel_id,
+                'body': c.body,
+                'created_at': c.created_at,
+            }
+            async for c in self.harvester.harvest(task.key)
+        ]
+        self.frontier.complete({ task: comments })
+
+def _work(settings: _Settings, shard: int):
+    worker = _Worker(settings, shard)
+    asyncio.run(worker.run())
+    if worker.stopped:
+        sys.exit(_QUOTA_EXIT)
+
+class CrawlError(Exception):
+    '''Raised when a worker process keeps stopping with an error.'''
+
+class Crawler:
+    '''
+    Crawls from channels to their uploads, videos, and the comments on them,
+    with `workers` processes. Add tasks, such as channels to resolve, then
+    `run` until all are done; results are read with `results`.
+    Each task belongs to a worker by consistent hashing of its key, and
+    each worker uses its own `YouTubeData` from `client`, which must be
+    picklable, such as a module-level function. Videos are requested 50 IDs
+    at a time, and each worker has up to `concurrency` requests of each
+    kind in flight.
+    The frontier of tasks is saved in an SQLite database at `path`. Tasks
+    which fail with server errors, 429 or connection errors are tried again
+    after `backoff` seconds, doubling, up to `max_attempts` times. When a
+    worker process stops with an error, it is started again to continue
+    its leased tasks, up to `restarts` times in all. When the quota is
+    exceeded, workers stop and `run` returns early with `quota_exceeded`
+    set. After an interrupted `run`, running again with the same `path`
+    continues the crawl.
+    Workers are started with `start_method`: 'fork' starts them faster
+    where available, but 'spawn' is safe with threads in this process.
+    '''
+    path: str
+    workers: int
+    restarts: int
+    frontier: Frontier
+    # whether the last run stopped because the quota is exceeded
+    quota_exceeded: bool
+    # counters
+    crashes: int
+
+    def __init__(self, path: str, client: Callable[[], YouTubeData],
+        workers: int = 4,
+        parts: set[Part] = {Part.SNIPPET, Part.DETAILS, Part.STATISTICS},
+        # the most an uploads playlist lists, and pages of 50 instead of the default 5
+        uploads_limit: int|None = 20_000,
+        comments: bool = True,
+        concurrency: int = 4,
+        max_attempts: int = 3,
+        backoff: float = 1.0,
+        restarts: int = 3,
+        poll_interval: float = 0.05,
+        start_method: str = 'spawn'):
+        self.path = path
+        self.workers = workers
+        self.restarts = restarts
+        self.quota_exceeded = False
+        self.crashes = 0
+        self._settings = _Settings(path, client, workers, 64, parts, uploads_limit, comments,
+            concurrency, max_attempts, backoff, poll_interval)
+        self._context = multiprocessing.get_context(start_method)
+        self.frontier = Frontier(path, HashRing(workers))
+
+    def add(self, kind: TaskKind, keys: Iterable[str]) -> int:
+        '''Add tasks to the frontier. Returns how many were not in it yet.'''
+        return self.frontier.add(Task(kind, key) for key in keys)
+
+    def results(self, kind: TaskKind) -> Iterator[tuple[str, Any]]:
+        '''The key and result of each task of a kind which is done.'''
+        return self.frontier.results(kind)
+
+    def counts(self) -> dict[tuple[TaskKind, TaskState], int]:
+        return self.frontier.counts()
+
+    async def run(self):
+        '''
+        Crawl until no tasks are pending, or the quota is exceeded.
+        Blocks only the calling task, not the event loop.
+        '''
+        self.frontier.reshard()
+        self.quota_exceeded = False
+        def start(shard: int) -> Any:
+            process = self._context.Process(target=_work, args=(self._settings, shard),
+                name=F"crawler-{shard}", daemon=True)
+            process.start()
+            return process
+        running = { shard: start(shard) for shard in range(self.workers) }
+        try:
+            while running:
+                await asyncio.sleep(self._settings.poll_interval)
+                for shard, process in list(running.items()):
+                    if process.exitcode is None:
+                        continue
+                    del running[shard]
+                    if process.exitcode == _QUOTA_EXIT:
+                        self.quota_exceeded = True
+                    elif process.exitcode != 0:
+                        self.crashes += 1
+                        if self.crashes > self.restarts:
+                            raise CrawlError(F"worker {shard} stopped with exit code {process.exitcode}")
+                        running[shard] = start(shard)
+        finally:
+            for process in running.values():
+                process.terminate()
+            for process in running.values():
+                await asyncio.to_thread(process.join)
+
+    def close(self):
+        self.frontier.close()
@@ -0,0 +1,109 @@
+'''
+Bulk harvesting of all comments on a video, including every reply
+https://developers.google.com/youtube/v3/docs/commentThreads/list
+https://developers.google.com/youtube/v3/docs/comments/list
+'''
+import asyncio
+from typing import Any, AsyncGenerator
+from SlyAPI import *
+from SlyAPI.web import ParamsDict
+from .ytdapi import YouTubeData, Comment, CommentOrder, Part
+
+_DONE: Any = object()
+
+class CommentHarvester:
+    '''
+    Streams every comment on a video as flat `Comment`s: each top-level
+    comment, followed eventually by its replies, which have `parent_id` set.
+    Threads are paged 100 at a time. Threads with more replies than the few
+    embedded in them have their replies paged from `/comments`, with up to
+    `concurrency` threads at once.
+    At most `buffer` comments wait to be consumed: a slow consumer pauses
+    the requests, so memory stays flat for any number of comments.
+    '''
+    yt: YouTubeData
+    concurrency: int
+    buffer: int
+    order: CommentOrder
+    # counters, across all harvests
+    threads: int
+    comments: int
+    # threads whose replies were paged separately
+    expanded: int
+
+    def __init__(self, yt: YouTubeData, concurrency: int = 8, buffer: int = 1000,
+        order: CommentOrder = CommentOrder.TIME):
+        self.yt = yt
+        self.concurrency = concurrency
+        self.buffer = buffer
+        self.order = order
+        self.threads = 0
+        self.comments = 0
+        self.expanded = 0
+
+    def harvest(self, video_id: str) -> AsyncLazy[Comment]:
+        return AsyncLazy(self._harvest(video_id))
+
+    async def _harvest(self, video_id: str) -> AsyncGenerator[Comment, None]:
+        queue: asyncio.Queue[Any] = asyncio.Queue(self.buffer)
+        producer = asyncio.ensure_future(self._threads(video_id, queue))
+        try:
+            while True:
+                item = await queue.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                self.comments += 1
+                yield item
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+    async def _threads(self, video_id: str, queue: 'asyncio.Queue[Any]'):
+        slots = asyncio.Semaphore(self.concurrency)
+        expanding: set[asyncio.Task[None]] = set()
+        params: ParamsDict = {
+            'part': {Part.SNIPPET, Part.REPLIES},
+            'videoId': video_id,
+            'order': self.order,
+            'maxResults': 100,
+        }
+        try:
+            async for thread in self.yt.paginated('/commentThreads', params, None):
+                self.threads += 1
+                embedded: list[Any] = thread.get('replies', {}).get('comments', [])
+                top = Comment(thread['snippet']['topLevelComment'])
+                top.reply_count = thread['snippet'].get('totalReplyCount', 0)
+                await queue.put(top)
+                if top.reply_count > len(embedded):
+                    # waiting for a slot also pauses paging threads
+                    await slots.acquire()
+                    task = asyncio.ensure_future(self._replies(top.id, queue))
+                    expanding.add(task)
+                    task.add_done_callback(expanding.discard)
+                    task.add_done_callback(lambda _: slots.release())
+                else:
+                    for reply in embedded:
+                        await queue.put(Comment(reply))
+            while expanding:
+                await asyncio.wait(expanding)
+            await queue.put(_DONE)
+        except Exception as e:
+            await queue.put(e)
+        finally:
+            for task in list(expanding):
+                task.cancel()
+
+    async def _replies(self, thread_id: str, queue: 'asyncio.Queue[Any]'):
+        params: ParamsDict = {
+            'part': Part.SNIPPET,
+            'parentId': thread_id,
+            'maxResults': 100,
+        }
+        try:
+            self.expanded += 1
+            async for reply in self.yt.paginated('/comments', params, None):
+                await queue.put(Comment(reply))
+        except Exception as e:
+            await queue.put(e)
@@ -0,0 +1,109 @@
+'''
+Looking up videos and channels for large streams of IDs, with duplicates and
+deleted or private IDs
+'''
+import asyncio
+from collections import OrderedDict, deque
+from typing import Any, AsyncGenerator, AsyncIterable, Awaitable, Callable, Iterable
+from SlyAPI import *
+from .ytdapi import YouTubeData, Video, Channel, Part
+
+async def _aiter(ids: Iterable[str]|AsyncIterable[str]) -> AsyncGenerator[str, None]:
+    if isinstance(ids, AsyncIterable):
+        async for id in ids:
+            yield id
+    else:
+        for id in ids:
+            yield id
+
+class Hydrator:
+    '''
+    Looks up IDs 50 per request, with up to `concurrency` requests at once,
+    yielding `(id, item)` for each distinct ID in the order first seen.
+    The item is None if the ID was not found, and the ID is added to `missing`.
+    IDs are read from the source only as results are consumed, so memory is
+    bounded by the requests in flight and the IDs remembered to skip
+    repeats: all of them, or only the last `dedupe_window`.
+    '''
+    yt: YouTubeData
+    concurrency: int
+    dedupe_window: int|None
+    # counters, across all lookups
+    ids: int
+    duplicates: int
+    requests: int
+    missing: set[str]
+
+    def __init__(self, yt: YouTubeData, concurrency: int = 4, dedupe_window: int|None = None):
+        self.yt = yt
+        self.concurrency = concurrency
+        self.dedupe_window = dedupe_window
+        self.ids = 0
+        self.duplicates = 0
+        self.requests = 0
+        self.missing = set()
+
+    def videos(self, ids: Iterable[str]|AsyncIterable[str],
+        parts: Part|set[Part] = {Part.ID, Part.SNIPPET}) -> AsyncLazy[tuple[str, Video|None]]:
+        '''
+        Each distinct video in `ids`, or None if it does not exist or is
+        private. Await the result and pass it to `dict` for a mapping.
+        '''
+        async def fetch(batch: list[str]) -> list[Video]:
+            return await self.yt.videos(batch, parts)
+        return AsyncLazy(self._hydrate(ids, fetch))
+
+    def channels(self, ids: Iterable[str]|AsyncIterable[str],
+        parts: Part|set[Part] = Part.SNIPPET) -> AsyncLazy[tuple[str, Channel|None]]:
+        '''Each distinct channel in `ids`, or None if it does not exist.'''
+        async def fetch(batch: list[str]) -> list[Channel]:
+            return await self.yt.channels(batch, parts)
+        return AsyncLazy(self._hydrate(ids, fetch))
+
+    async def _batches(self, ids: Iterable[str]|AsyncIterable[str]) -> AsyncGenerator[list[str], None]:
+        seen: OrderedDict[str, None] = OrderedDict()
+        batch: list[str] = []
+        async for id in _aiter(ids):
+            self.ids += 1
+            if id in seen:
+                self.duplicates += 1
+                continue
+            seen[id] = None
+            if self.dedupe_window is not None and len(seen) > self.dedupe_window:
+                seen.popitem(last=False)
+            batch.append(id)
+            if len(batch) == 50:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def _hydrate(self, ids: Iterable[str]|AsyncIterable[str],
+        fetch: Callable[[list[str]], Awaitable[list[Any]]]) -> AsyncGenerator[tuple[str, Any], None]:
+        async def lookup(batch: list[str]) -> dict[str, Any]:
+            self.requests += 1
+            return { item.id: item for item in await fetch(batch) }
+
+        batches = self._batches(ids)
+        in_flight: deque[tuple[list[str], asyncio.Future[dict[str, Any]]]] = deque()
+        try:
+            while True:
+                while len(in_flight) < max(1, self.concurrency):
+                    batch = await anext(batches, None)
+                    if batch is None:
+                        break
+                    in_flight.append((batch, asyncio.ensure_future(lookup(batch))))
+                if not in_flight:
+                    return
+                batch, future = in_flight[0]
+                found = await future
+                in_flight.popleft()
+                for id in batch:
+                    item = found.get(id)
+                    if item is None:
+                        self.missing.add(id)
+                    yield id, item
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+            await batches.aclose()
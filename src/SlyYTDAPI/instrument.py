@@ -0,0 +1,154 @@
+'''
+Instrumentation of requests and pages: where the time, bytes and quota go
+'''
+import math
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field, fields
+
+@dataclass(slots=True)
+class PageEvent:
+    '''One GET request, or one cache hit in place of a request.'''
+    endpoint: str
+    # bytes of the encoded query parameters
+    params_size: int = 0
+    # bytes of the response body, 0 if none was received
+    bytes: int = 0
+    # requests sent: 0 for a cache hit or a response shared by coalescing
+    requests: int = 0
+    # seconds waiting for the quota scheduler
+    queued: float = 0.0
+    # seconds from sending the request until the body was received
+    latency: float = 0.0
+    # seconds decoding JSON. with an executor, also building the models
+    decode: float = 0.0
+    items: int = 0
+    units: int = 0
+
+@dataclass(slots=True)
+class CallEvent:
+    '''One call of a list method, such as `videos`, reported when its last item is yielded or it is closed.'''
+    name: str
+    endpoint: str
+    pages: int = 0
+    # items yielded to the caller
+    items: int = 0
+    bytes: int = 0
+    queued: float = 0.0
+    latency: float = 0.0
+    decode: float = 0.0
+    # seconds building models, such as `Video`, from decoded items
+    parse: float = 0.0
+    units: int = 0
+    # seconds from the first request until the end, including time spent by the caller
+    seconds: float = 0.0
+
+    def add(self, page: PageEvent):
+        self.pages += 1
+        self.bytes += page.bytes
+        self.queued += page.queued
+        self.latency += page.latency
+        self.decode += page.decode
+        self.units += page.units
+
+class Instrument:
+    '''
+    Receives an event for every page and every call of a `YouTubeData` client
+    it is passed to as `instrument`. Methods are called on the event loop, so
+    should be quick. Override either; by default they do nothing.
+    Pages which belong to a call are also counted in its `CallEvent`, except
+    a response shared by coalescing, which counts toward the first caller.
+    '''
+    def page(self, event: PageEvent):
+        pass
+
+    def call(self, event: CallEvent):
+        pass
+
+# the page being requested, and the call whose items are being produced, in this context
+_page: ContextVar[PageEvent|None] = ContextVar('_page', default=None)
+_call: ContextVar[CallEvent|None] = ContextVar('_call', default=None)
+
+class Histogram:
+    '''
+    Counts of values in logarithmic buckets, four per doubling, so
+    percentiles are within 19% of the true value. Uses constant memory.
+    '''
+    count: int
+    total: float
+    min: float
+    max: float
+    buckets: Counter[int]
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.buckets = Counter()
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        # values of 0 or less share the lowest bucket
+        self.buckets[math.floor(4 * math.log2(value)) if value > 0 else -2**31] += 1
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        '''Upper bound of the bucket containing the `q`th percentile, 0 to 100.'''
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                if bucket == -2**31:
+                    return max(self.min, 0.0)
+                return min(2 ** ((bucket + 1) / 4), self.max)
+        return self.max
+
+PAGE_METRICS = [f.name for f in fields(PageEvent) if f.name != 'endpoint']
+CALL_METRICS = [f.name for f in fields(CallEvent) if f.name not in ('name', 'endpoint')]
+
+@dataclass
+class HistogramRecorder(Instrument):
+    '''
+    Aggregates events in memory: a `Histogram` of each metric of pages by
+    endpoint, and of calls by method name.
+    '''
+    pages: dict[str, dict[str, Histogram]] = field(default_factory=dict)
+    calls: dict[str, dict[str, Histogram]] = field(default_factory=dict)
+
+    def page(self, event: PageEvent):
+        histograms = self.pages.get(event.endpoint)
+        if histograms is None:
+            histograms = self.pages[event.endpoint] = { m: Histogram() for m in PAGE_METRICS }
+        for metric, histogram in histograms.items():
+            histogram.add(getattr(event, metric))
+
+    def call(self, event: CallEvent):
+        histograms = self.calls.get(event.name)
+        if histograms is None:
+            histograms = self.calls[event.name] = { m: Histogram() for m in CALL_METRICS }
+        for metric, histogram in histograms.items():
+            histogram.add(getattr(event, metric))
+
+    def report(self) -> str:
+        '''A table of page counts, quota, median and 99th percentile times in ms, and mean sizes.'''
+        lines = [F"{'':<20}{'pages':>7}{'units':>7}{'latency':>15}{'decode':>15}{'parse':>15}{'KiB':>8}{'items':>7}"]
+        def times(h: Histogram) -> str:
+            return F"{h.percentile(50)*1000:.1f}/{h.percentile(99)*1000:.1f}"
+        for endpoint, h in sorted(self.pages.items()):
+            lines.append(F"{endpoint:<20}{h['latency'].count:>7}{h['units'].total:>7.0f}"
+                + F"{times(h['latency']):>15}{times(h['decode']):>15}{'':>15}"
+                + F"{h['bytes'].mean()/1024:>8.1f}{h['items'].mean():>7.1f}")
+        for name, h in sorted(self.calls.items()):
+            lines.append(F"{name + '()':<20}{h['pages'].total:>7.0f}{h['units'].total:>7.0f}"
+                + F"{times(h['latency']):>15}{times(h['decode']):>15}{times(h['parse']):>15}"
+                + F"{h['bytes'].mean()/1024:>8.1f}{h['items'].mean():>7.1f}")
+        return '\n'.join(lines)
@@ -2,44 +2,237 @@
 YouTube Live Chat Endpoints for the Data API v3
 https://developers.google.com/youtube/v3/live/docs
 """
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Any, AsyncGenerator, Awaitable, Callable, TypeAlias
+from SlyAPI import *
+from SlyAPI.web import ApiError, ParamsDict
 from .ytdapi import YouTubeData, Part, yt_date
+from .retry import error_reason
 
-# class _LiveChatEvent: pass
+class _LiveChatEvent:
+    id: str
+    # part: snippet
+    created_at: datetime
 
-class ChatEnd: pass
+    def __init__(self, source: dict[str, Any]):
+        self.id = source['id']
+        self.created_at = yt_date(source['snippet']['publishedAt'])
 
-class ChatMessageDeleted:
-    id: str
+class _AuthoredEvent(_LiveChatEvent):
+    author_channel_id: str
+    # part: authorDetails
+    author_name: str|None
 
-class SponsorOnlyStart: pass
+    def __init__(self, source: dict[str, Any]):
+        super().__init__(source)
+        self.author_channel_id = source['snippet']['authorChannelId']
+        self.author_name = source.get('authorDetails', {}).get('displayName')
 
-class SponsorOnlyEnd: pass
+class ChatEnd(_LiveChatEvent): pass
 
-class NewSponsor:
-    id: str
-    name: str
-    channel_id: str
+class ChatMessageDeleted(_LiveChatEvent):
+    deleted_message_id: str
 
-class SuperChat: pass
+    def __init__(self, source: dict[str, Any]):
+        super().__init__(source)
+        self.deleted_message_id = source['snippet']['messageDeletedDetails']['deletedMessageId']
 
-class SuperSticker: pass
+class SponsorOnlyStart(_LiveChatEvent): pass
 
-class Tombstone: pass
+class SponsorOnlyEnd(_LiveChatEvent): pass
 
-class UserBanned: pass
+class NewSponsor(_AuthoredEvent):
+    level_name: str
+    is_upgrade: bool
 
-class MembershipGifting: pass
+    @property
+    def name(self):
+        return self.author_name
 
-class MembershipGiftReceived: pass
+    @property
+    def channel_id(self):
+        return self.author_channel_id
 
-class TextChat:
-    id: str
+    def __init__(self, source: dict[str, Any]):
+        super().__init__(source)
+        details = source['snippet'].get('newSponsorDetails', {})
+        self.level_name = details.get('memberLevelName')
+        self.is_upgrade = details.get('isUpgrade', False)
+
+class SuperChat(_AuthoredEvent):
+    amount_micros: int
+    currency: str
+    amount_display: str
+    body: str|None
+    tier: int
+
+    def __init__(self, source: dict[str, Any]):
+        super().__init__(source)
+        details = source['snippet']['superChatDetails']
+        self.amount_micros = int(details['amountMicros'])
+        self.currency = details['currency']
+        self.amount_display = details['amountDisplayString']
+        self.body = details.get('userComment')
+        self.tier = details.get('tier')
+
+class SuperSticker(_AuthoredEvent):
+    sticker_id: str
+    sticker_alt_text: str
+    amount_micros: int
+    currency: str
+    amount_display: str
+    tier: int
+
+    def __init__(self, source: dict[str, Any]):
+        super().__init__(source)
+        details = source['snippet']['superStickerDetails']
+        self.sticker_id = details['superStickerMetadata']['stickerId']
+        self.sticker_alt_text = details['superStickerMetadata'].get('altText')
+        self.amount_micros = int(details['amountMicros'])
+        self.currency = details['currency']
+        self.amount_display = details['amountDisplayString']
+        self.tier = details.get('tier')
+
+class Tombstone(_LiveChatEvent): pass
+
+class UserBanned(_LiveChatEvent):
+    channel_id: str
+    name: str
+    ban_type: str
+    ban_duration_seconds: int|None
+
+    def __init__(self, source: dict[str, Any]):
+        super().__init__(source)
+        details = source['snippet']['userBannedDetails']
+        self.channel_id = details['bannedUserDetails']['channelId']
+        self.name = details['bannedUserDetails'].get('displayName')
+        self.ban_type = details['banType']
+        duration = details.get('banDurationSeconds')
+        self.ban_duration_seconds = int(duration) if duration is not None else None
+
+class MembershipGifting(_AuthoredEvent):
+    count: int
+    level_name: str
+
+    def __init__(self, source: dict[str, Any]):
+        super().__init__(source)
+        details = source['snippet']['membershipGiftingDetails']
+        self.count = details['giftMembershipsCount']
+        self.level_name = details['giftMembershipsLevelName']
+
+class MembershipGiftReceived(_AuthoredEvent):
+    level_name: str
+    gifter_channel_id: str
+    gifting_message_id: str
+
+    def __init__(self, source: dict[str, Any]):
+        super().__init__(source)
+        details = source['snippet']['giftMembershipReceivedDetails']
+        self.level_name = details['memberLevelName']
+        self.gifter_channel_id = details['gifterChannelId']
+        self.gifting_message_id = details['associatedMembershipGiftingMessageId']
+
+class TextChat(_AuthoredEvent):
     # part: snippet
-    author_name: str
-    author_channel_id: str
     body: str
-    created_at: datetime
+
+    def __init__(self, source: dict[str, Any]):
+        super().__init__(source)
+        self.body = source['snippet']['textMessageDetails']['messageText']
+
+LiveChatEvent: TypeAlias = ChatEnd | ChatMessageDeleted | SponsorOnlyStart | SponsorOnlyEnd \
+    | NewSponsor | SuperChat | SuperSticker | Tombstone | UserBanned \
+    | MembershipGifting | MembershipGiftReceived | TextChat
+
+# snippet.type -> event class
+EVENT_TYPES: dict[str, Callable[[dict[str, Any]], LiveChatEvent]] = {
+    'textMessageEvent':             TextChat,
+    'superChatEvent':               SuperChat,
+    'superStickerEvent':            SuperSticker,
+    'newSponsorEvent':              NewSponsor,
+    'messageDeletedEvent':          ChatMessageDeleted,
+    'userBannedEvent':              UserBanned,
+    'sponsorOnlyModeStartedEvent':  SponsorOnlyStart,
+    'sponsorOnlyModeEndedEvent':    SponsorOnlyEnd,
+    'membershipGiftingEvent':       MembershipGifting,
+    'giftMembershipReceivedEvent':  MembershipGiftReceived,
+    'chatEndedEvent':               ChatEnd,
+    'tombstone':                    Tombstone,
+}
+
+@dataclass
+class ChatCursor:
+    '''
+    How far a `live_chat` stream has read. Pass the same cursor to
+    `live_chat` again to resume: the page being read when the stream
+    stopped is read again, without the messages already yielded.
+    '''
+    # of the first page not yet read to the end
+    page_token: str|None = None
+    # IDs of the last messages yielded, oldest first
+    seen: OrderedDict[str, None] = field(default_factory=OrderedDict)
 
 class YouTubeDataWithLiveChat(YouTubeData):
-    _next_page: str|None = None
\ No newline at end of file
+
+    def live_chat(self,
+        chat_id: str,
+        page_token: str|None=None,
+        dedupe_window: int=10_000,
+        sleep: Callable[[float], Awaitable[None]]=asyncio.sleep,
+        cursor: ChatCursor|None=None) -> AsyncLazy[LiveChatEvent]:
+        '''
+        Stream events from a live chat, such as `LivestreamDetails.chat_id`,
+        until the chat ends. Polls as often as the server allows, and skips
+        message types without a class in `EVENT_TYPES`.
+        The last `dedupe_window` message IDs are remembered, so no message is
+        yielded twice. To resume later, pass a `cursor`, which is kept up to
+        date as events are yielded, or start from `page_token`.
+        '''
+        if cursor is None:
+            cursor = ChatCursor(page_token)
+        return AsyncLazy(self._live_chat(chat_id, cursor, dedupe_window, sleep))
+
+    async def _live_chat(self,
+        chat_id: str,
+        cursor: ChatCursor,
+        dedupe_window: int,
+        sleep: Callable[[float], Awaitable[None]]) -> AsyncGenerator[LiveChatEvent, None]:
+        seen = cursor.seen
+        while True:
+            requested_at = time.monotonic()
+            params: ParamsDict = {
+                'liveChatId': chat_id,
+                'part': {Part.SNIPPET, Part.AUTHOR_DETAILS},
+                'maxResults': 2000,
+                'pageToken': cursor.page_token,
+            }
+            try:
+                page = await self.get_json('/liveChat/messages', params)
+            except ApiError as e:
+                if e.status in (403, 404) and error_reason(e) == 'liveChatEnded':
+                    return
+                raise
+            for item in page.get('items', []): # type: ignore
+                message_id: str = item['id']
+                if message_id in seen:
+                    continue
+                seen[message_id] = None
+                if len(seen) > dedupe_window:
+                    seen.popitem(last=False)
+                if make := EVENT_TYPES.get(item['snippet']['type']):
+                    event = make(item)
+                    yield event
+                    if isinstance(event, ChatEnd):
+                        return
+            # only once every item of the page is yielded
+            next_page: str|None = page.get('nextPageToken') # type: ignore
+            if page.get('offlineAt') or not next_page:
+                return
+            cursor.page_token = next_page
+            # the interval counts from the request, so time spent by the consumer is not added
+            interval = int(page.get('pollingIntervalMillis', 5000)) / 1000 # type: ignore
+            await sleep(max(0.0, interval - (time.monotonic() - requested_at)))
@@ -2,13 +2,17 @@
 YouTube Members Endpoints for the Data API v3
 https://developers.google.com/youtube/v3/docs/members
 '''
+import asyncio
+import random
 from datetime import datetime
 from enum import Enum
-from typing import Any, TypedDict, cast
+from typing import Any, AsyncGenerator, Awaitable, Callable, TypedDict, cast
+from aiohttp import ClientError
 from SlyAPI.oauth2 import OAuth2
 from SlyAPI import *
-from SlyAPI.web import JsonMap, ParamsDict
+from SlyAPI.web import ApiError, JsonMap, ParamsDict
 from .ytdapi import YouTubeData, Part, yt_date
+from .store import StateStore
 
 class _MembersPollResponse(TypedDict):
     kind: str
@@ -78,8 +82,8 @@ class YouTubeData_WithMembers(YouTubeData):
 
     _next_page: str|None = None
 
-    def __init__(self, auth: OAuth2) -> None:
-        super().__init__(auth)
+    def __init__(self, auth: OAuth2, **kwargs: Any) -> None:
+        super().__init__(auth, **kwargs)
     
     def get_my_members(self,
         level_id: str|None=None,
@@ -95,14 +99,14 @@ class YouTubeData_WithMembers(YouTubeData):
             'filterByMemberChannelId': ','.join(member_channel_ids or []),
             'maxResults': 1000 if limit is None else min(1000, limit)
         }
-        return self.paginated(
+        return self._traced('get_my_members', '/members', self.paginated(
             '/members', params, limit
-            ).map(Membership)
+            ), Membership)
     
     async def _members_poll(self, pageToken: str|None) -> _MembersPollResponse:
         params: ParamsDict = {
             'part': Part.SNIPPET,
-            'membersMode': MembersMode.UPDATES,
+            'mode': MembersMode.UPDATES,
             'pageToken': pageToken
         }
         return cast(_MembersPollResponse, await self.get_json('/members', params))
@@ -124,4 +128,111 @@ class YouTubeData_WithMembers(YouTubeData):
             return [Membership(r) for r in response['items']]
 
     async def get_my_levels(self) -> list[MemberLevel]:
-        return [MemberLevel(r) for r in (await self._memberships_levels({Part.ID,Part.SNIPPET}))['items']]
\ No newline at end of file
+        return [MemberLevel(r) for r in (await self._memberships_levels({Part.ID,Part.SNIPPET}))['items']]
+
+class MemberPoller:
+    '''
+    Long-running poll for new members, as an async iterator of `Membership`.
+    The page token is saved to `store` after the members of each poll are
+    consumed, so a restarted poller continues where the last one stopped.
+    The interval between polls shrinks by `speedup` after a poll with new
+    members and grows by `slowdown` after one without, within
+    `min_interval` and `max_interval` seconds.
+    Failed polls are retried after a jittered exponential backoff, and the
+    error is raised after `max_errors` failures in a row.
+    '''
+    yt: YouTubeData_WithMembers
+    store: StateStore|None
+    key: str
+    min_interval: float
+    max_interval: float
+    interval: float
+    speedup: float
+    slowdown: float
+    max_errors: int
+    max_backoff: float
+
+    polls: int
+    members: int
+    errors: int
+
+    def __init__(self, yt: YouTubeData_WithMembers,
+        store: StateStore|None=None,
+        key: str='members:next_page',
+        min_interval: float=10.0,
+        max_interval: float=600.0,
+        speedup: float=0.5,
+        slowdown: float=1.5,
+        max_errors: int=10,
+        max_backoff: float=600.0,
+        sleep: Callable[[float], Awaitable[None]]=asyncio.sleep,
+        jitter: Callable[[], float]=random.random):
+        self.yt = yt
+        self.store = store
+        self.key = key
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.speedup = speedup
+        self.slowdown = slowdown
+        self.max_errors = max_errors
+        self.max_backoff = max_backoff
+        self.polls = 0
+        self.members = 0
+        self.errors = 0
+        self._sleep = sleep
+        self._jitter = jitter
+        self._next_page = store.get(key) if store else None
+        self._stopped = False
+
+    def stop(self):
+        '''Stop polling after the current poll.'''
+        self._stopped = True
+
+    def backoff(self, failures: int) -> float:
+        '''Seconds to wait after `failures` failed polls in a row: half fixed, half random.'''
+        delay = min(self.max_backoff, self.min_interval * 2 ** (failures - 1))
+        return delay / 2 + delay / 2 * self._jitter()
+
+    def _adapt(self, new_members: int):
+        if new_members:
+            self.interval = max(self.min_interval, self.interval * self.speedup)
+        else:
+            self.interval = min(self.max_interval, self.interval * self.slowdown)
+
+    def __aiter__(self) -> AsyncGenerator[Membership, None]:
+        return self._poll()
+
+    async def _poll(self) -> AsyncGenerator[Membership, None]:
+        failures = 0
+        while not self._stopped:
+            try:
+                response = await self.yt._members_poll(self._next_page)
+            except (ApiError, ClientError, asyncio.TimeoutError):
+                self.errors += 1
+                failures += 1
+                if failures >= self.max_errors:
+                    raise
+                await self._sleep(self.backoff(failures))
+                continue
+            failures = 0
+            self.polls += 1
+            # the first poll without a token never has members
+            items = response.get('items', []) if self._next_page is not None else []
+            for item in items:
+                self.members += 1
+                yield Membership(item)
+            # saved only once every member was consumed, so none are skipped after a restart
+            self._next_page = response['nextPageToken']
+            if self.store is not None:
+                self.store.set(self.key, self._next_page)
+            self._adapt(len(items))
+            if not self._stopped:
+                await self._sleep(self.interval)
+
+    async def run(self, callback: Callable[[Membership], Awaitable[None]|None]):
+        '''Poll until stopped, calling `callback` for each new member.'''
+        async for member in self:
+            result = callback(member)
+            if result is not None:
+                await result
@@ -0,0 +1,141 @@
+'''
+Local copies of playlists, refreshed with conditional requests and resumed
+after failures from saved page tokens
+https://developers.google.com/youtube/v3/docs/playlistItems/list
+'''
+from typing import Any
+from SlyAPI.web import ParamsDict
+from .ytdapi import YouTubeData, Video, Part
+from .store import StateStore
+
+class PlaylistMirror:
+    '''
+    Keeps the items of playlists in `store`, one key per page of 50.
+    `sync` walks a playlist, saving each page and the token of the next one
+    as it goes, so a walk which fails, such as by running out of quota,
+    continues from the last saved page when synced again.
+    Once complete, a playlist is revalidated by the etag of its first page:
+    if unchanged, nothing more is requested. Otherwise it is walked again,
+    sending each page's previous etag so unchanged pages are not downloaded.
+    Items keep the `parts` they were requested with.
+    '''
+    yt: YouTubeData
+    store: StateStore
+    parts: set[Part]
+    # counters, across all syncs
+    requests: int
+    # pages confirmed unchanged by 304 Not Modified
+    not_modified: int
+    # syncs which continued an incomplete walk
+    resumed: int
+
+    def __init__(self, yt: YouTubeData, store: StateStore,
+        parts: Part|set[Part] = {Part.SNIPPET, Part.DETAILS}):
+        self.yt = yt
+        self.store = store
+        self.parts = parts.intersection({Part.ID, Part.SNIPPET, Part.STATUS, Part.DETAILS})
+        self.requests = 0
+        self.not_modified = 0
+        self.resumed = 0
+
+    def _key(self, playlist_id: str, page: int|None = None) -> str:
+        if page is None:
+            return F"playlist:{playlist_id}"
+        return F"playlist:{playlist_id}:{page}"
+
+    async def _page(self, playlist_id: str, token: str|None, etag: str|None) -> dict[str, Any]|None:
+        '''A page of items, or None if its etag matches.'''
+        params: ParamsDict = {
+            'part': self.parts,
+            'playlistId': playlist_id,
+            'maxResults': 50,
+            'pageToken': token,
+        }
+        self.requests += 1
+        page = await self.yt.get_json_if_modified('/playlistItems', params, etag)
+        if page is None:
+            self.not_modified += 1
+        return page # type: ignore
+
+    async def sync(self, playlist_id: str, full: bool = False) -> bool:
+        '''
+        Bring the copy of a playlist up to date.
+        Returns whether it changed, or was walked for the first time.
+        If `full`, every page is revalidated even if the first is unchanged,
+        to find changes which leave the first page and total as they were,
+        such as a replaced video further on.
+        '''
+        key = self._key(playlist_id)
+        state: dict[str, Any]|None = self.store.get(key)
+        page: dict[str, Any]|None = None
+        if state is None:
+            state = { 'complete': False, 'total': None, 'next': None, 'tokens': [], 'etags': [],
+                'previous': { 'tokens': [], 'etags': [] } }
+        elif not state['complete']:
+            self.resumed += 1
+        else:
+            previous = { 'tokens': state['tokens'], 'etags': state['etags'] }
+            page = await self._page(playlist_id, None, state['etags'][0])
+            if page is None:
+                if not full:
+                    return False
+                page = self._unchanged(playlist_id, 0, previous)
+            elif not full and (
+                # without etags, compare the total and the first page
+                page.get('etag') is None
+                and page.get('pageInfo', {}).get('totalResults') == state['total']
+                and page.get('items', []) == self.store.get(self._key(playlist_id, 0))
+            ):
+                return False
+            # walk again, revalidating each page against the previous walk.
+            # pages from the store have no total, so keep the last one known
+            state = { 'complete': False, 'total': state['total'], 'next': None, 'tokens': [], 'etags': [],
+                'previous': previous }
+
+        previous = state['previous']
+        while True:
+            index = len(state['etags'])
+            token = state['next'] or ''
+            if page is None:
+                etag = None
+                if index < len(previous['etags']) and previous['tokens'][index] == token:
+                    etag = previous['etags'][index]
+                page = await self._page(playlist_id, token or None, etag)
+                if page is None:
+                    page = self._unchanged(playlist_id, index, previous)
+            self.store.set(self._key(playlist_id, index), page.get('items', []))
+            state['tokens'].append(token)
+            state['etags'].append(page.get('etag'))
+            state['total'] = page.get('pageInfo', {}).get('totalResults', state['total'])
+            state['next'] = page.get('nextPageToken')
+            self.store.set(key, state)
+            if not state['next']:
+                break
+            page = None
+
+        for stale in range(len(state['etags']), len(previous['etags'])):
+            self.store.delete(self._key(playlist_id, stale))
+        self.store.set(key, {
+            'complete': True, 'total': state['total'], 'tokens': state['tokens'], 'etags': state['etags'],
+        })
+        return state['etags'] != previous['etags'] or None in state['etags']
+
+    def _unchanged(self, playlist_id: str, index: int, previous: dict[str, Any]) -> dict[str, Any]:
+        '''A page the same as in the previous walk, from the store.'''
+        following = previous['tokens'][index + 1: index + 2]
+        return {
+            'etag': previous['etags'][index],
+            'items': self.store.get(self._key(playlist_id, index)),
+            'nextPageToken': following[0] if following else None,
+        }
+
+    def videos(self, playlist_id: str, lazy: bool = False) -> list[Video]:
+        '''The videos of a playlist as of its last complete sync, or so far if incomplete.'''
+        state = self.store.get(self._key(playlist_id))
+        if state is None:
+            return []
+        return [
+            self.yt.make_video(item, lazy)
+            for page in range(len(state['etags']))
+            for item in self.store.get(self._key(playlist_id, page)) or []
+        ]
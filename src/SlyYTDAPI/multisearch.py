@@ -0,0 +1,119 @@
+'''
+Searching the videos of many channels at once, merged into one stream
+https://developers.google.com/youtube/v3/docs/search/list
+'''
+import asyncio
+import heapq
+from datetime import datetime, timedelta
+from typing import Any, AsyncGenerator
+from SlyAPI import *
+from SlyAPI.web import ParamsDict
+from .ytdapi import YouTubeData, Video, Order
+from .quota import endpoint_cost
+
+EPOCH = datetime(1970, 1, 1)
+
+class MultiChannelSearch:
+    '''
+    Searches several channels, up to `concurrency` requests at once, and
+    merges the results newest first.
+    Every search page costs 100 quota units: at most `quota_budget` units
+    are spent by this object, after which each channel's results end early
+    and the channel is added to `truncated`.
+    '''
+    yt: YouTubeData
+    concurrency: int
+    quota_budget: int|None
+    # counters, across all searches
+    requests: int
+    units: int
+    truncated: set[str]
+
+    def __init__(self, yt: YouTubeData, concurrency: int = 8, quota_budget: int|None = None):
+        self.yt = yt
+        self.concurrency = concurrency
+        self.quota_budget = quota_budget
+        self.requests = 0
+        self.units = 0
+        self.truncated = set()
+
+    def search(self,
+        channel_ids: list[str],
+        after: datetime|None = None,
+        before: datetime|None = None,
+        query: str|None = None,
+        per_channel_limit: int|None = 50,
+        limit: int|None = None,
+        lazy: bool = False) -> AsyncLazy[Video]:
+        '''
+        Videos of all `channel_ids` published in the window from `after` to
+        `before`, newest first. Each channel contributes up to
+        `per_channel_limit` videos, and no more requests are made once
+        `limit` videos have been yielded.
+        '''
+        params = self.yt.search_params(query, None, after, before, None, Order.DATE, limit=per_channel_limit)
+        return AsyncLazy(self._merged(channel_ids, params, per_channel_limit, limit, lazy))
+
+    def _spend(self) -> bool:
+        cost = endpoint_cost('/search')
+        if self.quota_budget is not None and self.units + cost > self.quota_budget:
+            return False
+        self.units += cost
+        self.requests += 1
+        return True
+
+    async def _channel(self, channel_id: str, params: ParamsDict, limit: int|None,
+        slots: asyncio.Semaphore, lazy: bool) -> AsyncGenerator[Video, None]:
+        params = params | { 'channelId': channel_id, 'maxResults': min(50, limit) if limit else 50 }
+        count = 0
+        while True:
+            if not self._spend():
+                self.truncated.add(channel_id)
+                return
+            async with slots:
+                page = await self.yt.get_json('/search', params)
+            items: list[Any] = page.get('items', []) # type: ignore
+            for item in items:
+                yield self.yt.make_video(item, lazy)
+                count += 1
+                if limit is not None and count >= limit:
+                    return
+            page_token = page.get('nextPageToken')
+            if not items or not page_token:
+                return
+            params['pageToken'] = page_token
+
+    async def _merged(self, channel_ids: list[str], params: ParamsDict,
+        per_channel_limit: int|None, limit: int|None, lazy: bool) -> AsyncGenerator[Video, None]:
+        slots = asyncio.Semaphore(self.concurrency)
+        streams = [self._channel(id, params, per_channel_limit, slots, lazy) for id in channel_ids]
+        # newest first, then in the order of channel_ids
+        heap: list[tuple[timedelta, int, Video]] = []
+
+        async def advance(i: int):
+            try:
+                video = await anext(streams[i])
+            except StopAsyncIteration:
+                return
+            heapq.heappush(heap, (EPOCH - video.published_at, i, video))
+
+        try:
+            # the first page of every channel is needed before the newest is known
+            first = [asyncio.ensure_future(advance(i)) for i in range(len(streams))]
+            try:
+                await asyncio.gather(*first)
+            except BaseException:
+                for task in first:
+                    task.cancel()
+                await asyncio.gather(*first, return_exceptions=True)
+                raise
+            count = 0
+            while heap and (limit is None or count < limit):
+                _, i, video = heapq.heappop(heap)
+                yield video
+                count += 1
+                if limit is None or count < limit:
+                    await advance(i)
+        finally:
+            for stream in streams:
+                await stream.aclose()
@@ -0,0 +1,131 @@
+'''
+Spreading requests across several API keys or OAuth2 accounts, each with its own quota
+https://developers.google.com/youtube/v3/getting-started#quota
+'''
+import itertools
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable
+from urllib.parse import urlparse
+from aiohttp import ClientSession
+from SlyAPI import UrlApiKey
+from SlyAPI.auth import Auth
+from SlyAPI.web import ApiError, Request
+from .quota import QuotaScheduler, Priority, ENDPOINT_COSTS, endpoint_cost
+from .retry import CircuitOpen, QUOTA_REASONS, error_reason
+
+class Balance(Enum):
+    # the credential with the most quota left in its window
+    MOST_REMAINING  = 'most_remaining'
+    # each available credential in turn
+    ROUND_ROBIN     = 'round_robin'
+
+@dataclass
+class Credential:
+    auth: Auth
+    # units spent with this credential, in a rolling window of its budget
+    quota: QuotaScheduler
+    quota_errors: int = 0
+    # while the API reports its quota exceeded
+    exhausted_until: float|None = None
+
+# the credential which signed the request being sent, in this context
+_signed_with: ContextVar[Credential|None] = ContextVar('_signed_with', default=None)
+
+def _endpoint(url: str) -> str:
+    path = urlparse(url).path
+    for endpoint in ENDPOINT_COSTS:
+        if path.endswith(endpoint):
+            return endpoint
+    return path
+
+class CredentialPool(Auth):
+    '''
+    Signs each request with one of several credentials, such as the API keys
+    of separate projects, chosen by `balance`. Units spent are counted per
+    credential against `budget` in a rolling `window`, as the API does.
+    When a credential is reported over quota, it is skipped for `cooldown`
+    seconds and the request is sent again with another, if any is left.
+    Otherwise `CircuitOpen` is raised until one is available.
+    Pass the pool to `YouTubeData` in place of a single key.
+    '''
+    credentials: list[Credential]
+    balance: Balance
+    cooldown: float
+    # requests sent again with another credential after quotaExceeded
+    failovers: int
+
+    def __init__(self, credentials: list[Auth|str],
+        budget: int = 10_000,
+        window: float = 24 * 60 * 60,
+        balance: Balance = Balance.MOST_REMAINING,
+        cooldown: float = 60 * 60,
+        clock: Callable[[], float] = time.monotonic):
+        if not credentials:
+            raise ValueError("At least one credential is needed")
+        self.credentials = [
+            Credential(
+                UrlApiKey('key', auth) if isinstance(auth, str) else auth,
+                QuotaScheduler(budget, window, { p: 1.0 for p in Priority }, clock=clock))
+            for auth in credentials
+        ]
+        self.balance = balance
+        self.cooldown = cooldown
+        self.failovers = 0
+        self._clock = clock
+        self._turns = itertools.cycle(self.credentials)
+
+    def _available(self, units: int) -> list[Credential]:
+        now = self._clock()
+        return [
+            c for c in self.credentials
+            if (c.exhausted_until is None or c.exhausted_until <= now) and c.quota.remaining() >= units
+        ]
+
+    def _choose(self, endpoint: str) -> Credential:
+        available = self._available(endpoint_cost(endpoint))
+        if not available:
+            now = self._clock()
+            retry_after = min(
+                max(0.0, c.exhausted_until - now) if c.exhausted_until is not None else c.quota.window
+                for c in self.credentials)
+            raise CircuitOpen(endpoint, retry_after)
+        if self.balance == Balance.ROUND_ROBIN:
+            while (credential := next(self._turns)) not in available:
+                pass
+            return credential
+        # fewest requests first among equals, so a fresh pool is used evenly
+        return max(available, key=lambda c: (c.quota.remaining(), -c.quota.stats.requests))
+
+    async def sign(self, client: ClientSession, request: Request) -> Request:
+        endpoint = _endpoint(request.url)
+        credential = self._choose(endpoint)
+        await credential.quota.acquire(endpoint)
+        _signed_with.set(credential)
+        return await credential.auth.sign(client, request)
+
+    def failover(self, error: BaseException) -> bool:
+        '''
+        If `error` reports the quota of the credential which signed the
+        failed request is exceeded, stop using it for a while. Returns
+        whether another credential can be tried.
+        '''
+        credential = _signed_with.get()
+        if credential is None or not isinstance(error, ApiError) or error_reason(error) not in QUOTA_REASONS:
+            return False
+        credential.quota_errors += 1
+        credential.exhausted_until = self._clock() + self.cooldown
+        if not self._available(0):
+            return False
+        self.failovers += 1
+        return True
+
+    def spread(self) -> float:
+        '''
+        Units spent in the window with the least used credential over the
+        most used: 1.0 when the load is even, towards 0.0 as it is uneven.
+        '''
+        units = [c.quota.spent() for c in self.credentials]
+        return min(units) / max(units) if max(units) else 1.0
@@ -0,0 +1,94 @@
+'''
+Partial responses: request only the parts and fields needed for some
+attributes of a model, and build the model with only those attributes
+https://developers.google.com/youtube/v3/getting-started#fields
+'''
+from typing import Any, Callable, Generic, Iterable, TypeVar
+
+M = TypeVar('M')
+
+_MISSING: Any = object()
+
+class Field:
+    '''
+    Where an attribute comes from in a resource: a path such as
+    `statistics/viewCount`, whose first segment is the part, and how to
+    convert the value found there. A path of only the part uses all of it.
+    '''
+    path: tuple[str, ...]
+    convert: Callable[[Any], Any]|None
+    # convert also takes the client, for attributes that hold a reference to it
+    with_youtube: bool
+
+    def __init__(self, path: str, convert: Callable[..., Any]|None = None, with_youtube: bool = False):
+        self.path = tuple(path.split('/'))
+        self.convert = convert
+        self.with_youtube = with_youtube
+
+    @property
+    def part(self) -> str:
+        return self.path[0]
+
+def fields_expression(paths: Iterable[tuple[str, ...]], container: str = 'items') -> str:
+    '''
+    The `fields` filter selecting `paths` of each resource in `container`,
+    along with resource IDs and the token for the next page.
+    '''
+    tree: dict[str, Any] = { 'id': None }
+    for path in paths:
+        node = tree
+        for segment in path[:-1]:
+            child = node.setdefault(segment, {})
+            if child is None: # already selected in whole
+                break
+            node = child
+        else:
+            node[path[-1]] = None
+    def render(node: dict[str, Any]) -> str:
+        return ','.join(
+            name if child is None else F"{name}({render(child)})"
+            for name, child in node.items()
+        )
+    return F"{container}({render(tree)}),nextPageToken"
+
+class Projection(Generic[M]):
+    '''
+    A selection of attributes of `model`, from the `Field`s it supports.
+    Objects are built without calling `model.__init__`, so unselected
+    attributes keep their class default or are left unset.
+    '''
+    model: type[M]
+    fields: dict[str, Field]
+    # part names to request
+    parts: list[str]
+    # value for the `fields` request parameter
+    expression: str
+
+    def __init__(self, model: type[M], available: dict[str, Field], names: Iterable[str]):
+        self.model = model
+        self.fields = {}
+        for name in names:
+            if name == 'id':
+                continue
+            if name not in available:
+                raise ValueError(F"{model.__name__}.{name} cannot be projected. Choose from: {', '.join(available)}")
+            self.fields[name] = available[name]
+        self.parts = sorted({ field.part for field in self.fields.values() } or { 'id' })
+        self.expression = fields_expression(field.path for field in self.fields.values())
+
+    def build(self, source: dict[str, Any], yt: Any) -> M:
+        obj: Any = self.model.__new__(self.model)
+        obj._youtube = yt
+        obj.id = source['id']
+        for name, field in self.fields.items():
+            value: Any = source
+            for segment in field.path:
+                value = value.get(segment, _MISSING)
+                if value is _MISSING:
+                    break
+            if value is _MISSING or value is None:
+                continue
+            if field.convert is not None:
+                value = field.convert(value, yt) if field.with_youtube else field.convert(value)
+            setattr(obj, name, value)
+        return obj
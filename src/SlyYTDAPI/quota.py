@@ -0,0 +1,153 @@
+'''
+Quota-aware scheduling of YouTube Data API requests
+https://developers.google.com/youtube/v3/determine_quota_cost
+'''
+import asyncio
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Awaitable, Callable
+
+# units charged per request to each list endpoint
+ENDPOINT_COSTS: dict[str, int] = {
+    '/search':              100,
+    '/videos':              1,
+    '/channels':            1,
+    '/playlists':           1,
+    '/playlistItems':       1,
+    '/commentThreads':      1,
+    '/comments':            1,
+    '/members':             1,
+    '/membershipsLevels':   1,
+    '/liveChat/messages':   5,
+}
+
+def endpoint_cost(endpoint: str) -> int:
+    return ENDPOINT_COSTS.get(endpoint, 1)
+
+class Priority(Enum):
+    HIGH    = 0
+    NORMAL  = 1
+    LOW     = 2
+
+_priority: ContextVar[Priority] = ContextVar('_priority', default=Priority.NORMAL)
+
+class QuotaExhausted(Exception):
+    endpoint: str
+    priority: Priority
+    retry_after: float|None
+
+    def __init__(self, endpoint: str, priority: Priority, retry_after: float|None):
+        super().__init__(F"quota budget exhausted for {priority.name} request to {endpoint}")
+        self.endpoint = endpoint
+        self.priority = priority
+        self.retry_after = retry_after
+
+@dataclass
+class QuotaStats:
+    requests: int = 0
+    units: int = 0
+    delayed: int = 0
+    rejected: int = 0
+    units_by_endpoint: Counter[str] = field(default_factory=Counter)
+    units_by_priority: Counter[Priority] = field(default_factory=Counter)
+
+class QuotaScheduler:
+    '''
+    Tracks units spent in a rolling window and admits requests by priority.
+    Each priority may only spend up to its fraction of the budget in `limits`.
+    A request over its limit waits for units to expire from the window if
+    that takes no longer than `max_wait` seconds, otherwise it is rejected
+    with `QuotaExhausted`.
+    '''
+    budget: int
+    window: float
+    limits: dict[Priority, float]
+    max_wait: float
+    stats: QuotaStats
+
+    _spent: deque[tuple[float, int]]
+    _spent_units: int
+
+    def __init__(self,
+        budget: int = 10_000,
+        window: float = 24 * 60 * 60,
+        limits: dict[Priority, float]|None = None,
+        max_wait: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep):
+        self.budget = budget
+        self.window = window
+        self.limits = {
+            Priority.HIGH: 1.0, Priority.NORMAL: 0.95, Priority.LOW: 0.8
+        } | (limits or {})
+        self.max_wait = max_wait
+        self.stats = QuotaStats()
+        self._clock = clock
+        self._sleep = sleep
+        self._spent = deque()
+        self._spent_units = 0
+
+    @contextmanager
+    def priority(self, level: Priority):
+        '''Requests made in this context, including while iterating results, are scheduled at `level`.'''
+        token = _priority.set(level)
+        try:
+            yield
+        finally:
+            _priority.reset(token)
+
+    def _expire(self, now: float):
+        while self._spent and self._spent[0][0] <= now - self.window:
+            self._spent_units -= self._spent.popleft()[1]
+
+    def spent(self) -> int:
+        '''Units spent in the current window.'''
+        self._expire(self._clock())
+        return self._spent_units
+
+    def remaining(self) -> int:
+        return self.budget - self.spent()
+
+    def _wait_time(self, now: float, units: int, cap: float) -> float|None:
+        # seconds until enough units expire to fit under cap, None if never
+        if units > cap:
+            return None
+        over = self._spent_units + units - cap
+        if over <= 0:
+            return 0.0
+        for at, spent in self._spent:
+            over -= spent
+            if over <= 0:
+                return at + self.window - now
+        return None
+
+    async def acquire(self, endpoint: str) -> int:
+        '''Wait until the current priority may spend the endpoint's cost, then spend it.'''
+        units = endpoint_cost(endpoint)
+        level = _priority.get()
+        cap = self.budget * self.limits[level]
+        delayed = False
+        while True:
+            now = self._clock()
+            self._expire(now)
+            wait = self._wait_time(now, units, cap)
+            if wait == 0.0:
+                break
+            if wait is None or wait > self.max_wait:
+                self.stats.rejected += 1
+                raise QuotaExhausted(endpoint, level, wait)
+            if not delayed:
+                self.stats.delayed += 1
+                delayed = True
+            await self._sleep(wait)
+        self._spent.append((now, units))
+        self._spent_units += units
+        self.stats.requests += 1
+        self.stats.units += units
+        self.stats.units_by_endpoint[endpoint] += units
+        self.stats.units_by_priority[level] += units
+        return units
@@ -0,0 +1,133 @@
+'''
+Resolving many channel URLs, handles and usernames to channels at once
+https://developers.google.com/youtube/v3/docs/channels/list
+'''
+import asyncio
+import re
+from typing import Iterable
+from .ytdapi import YouTubeData, Channel, Part, ResourceNotFound, RE_CHANNEL_URL
+from .hydrate import Hydrator
+from .store import StateStore, MemoryStore
+
+RE_CHANNEL_ID = re.compile(r'^UC[a-zA-Z0-9\-_]{22}$')
+
+def classify(ref: str) -> tuple[str, str]|None:
+    '''
+    How `ref` names a channel, as `('id', ...)`, `('handle', ...)` or
+    `('username', ...)`: a channel URL, with or without the scheme, an
+    `@handle`, or a channel ID. None if it is none of these.
+    '''
+    ref = ref.strip()
+    if m := RE_CHANNEL_URL.match(ref) or RE_CHANNEL_URL.match(F"//{ref}"):
+        for kind in ('id', 'handle', 'username'):
+            if name := m.group(kind):
+                return kind, name
+    if len(ref) > 1 and ref.startswith('@'):
+        return 'handle', ref[1:]
+    if RE_CHANNEL_ID.match(ref):
+        return 'id', ref
+    return None
+
+class ChannelResolver:
+    '''
+    Resolves references to channels in bulk, such as a column of links from
+    a spreadsheet. Channel IDs are requested 50 per request, but handles
+    and usernames cannot be, so each is looked up with a request of its
+    own, up to `concurrency` at once. The ID found for each handle and
+    username, or that there is none, is saved in `store`, so later imports
+    of the same names need no lookups.
+    '''
+    yt: YouTubeData
+    store: StateStore
+    concurrency: int
+    # counters, across all imports
+    lookups: int
+    cached: int
+    # references of the last import which are not channels
+    unrecognized: list[str]
+
+    def __init__(self, yt: YouTubeData, store: StateStore|None = None, concurrency: int = 8):
+        self.yt = yt
+        self.store = MemoryStore() if store is None else store
+        self.concurrency = concurrency
+        self.lookups = 0
+        self.cached = 0
+        self.unrecognized = []
+
+    async def ids(self, refs: Iterable[str]) -> dict[str, str|None]:
+        '''
+        The channel ID of each distinct reference in `refs`, or None if it is
+        not recognized or no channel has the handle or username.
+        Channel IDs given directly are not checked.
+        '''
+        ids, _ = await self._resolve(refs, Part.ID)
+        return ids
+
+    async def channels(self, refs: Iterable[str], parts: Part|set[Part] = Part.SNIPPET) -> dict[str, Channel|None]:
+        '''The channel of each distinct reference in `refs`, or None if there is none.'''
+        ids, found = await self._resolve(refs, parts)
+        needed = [id for id in ids.values() if id is not None and id not in found]
+        async for id, channel in Hydrator(self.yt, self.concurrency).channels(needed, parts):
+            found[id] = channel
+        return { ref: None if id is None else found[id] for ref, id in ids.items() }
+
+    async def _resolve(self, refs: Iterable[str],
+        parts: Part|set[Part]) -> tuple[dict[str, str|None], dict[str, Channel|None]]:
+        '''The ID of each reference, and the channels requested to find them.'''
+        self.unrecognized = []
+        ids: dict[str, str|None] = {}
+        keys: dict[str, str] = {} # reference -> store key
+        known: dict[str, str|None] = {} # store key -> ID
+        names: dict[str, tuple[str, str]] = {} # store key -> name to look up
+        for ref in refs:
+            if ref in ids:
+                continue
+            ids[ref] = None
+            match classify(ref):
+                case None:
+                    self.unrecognized.append(ref)
+                case ('id', id):
+                    ids[ref] = id
+                case (kind, name):
+                    # handles and usernames are not case sensitive
+                    key = keys[ref] = F"{kind}:{name.lower()}"
+                    if key in known or key in names:
+                        continue
+                    cached = self.store.get(key)
+                    if cached is None:
+                        names[key] = (kind, name)
+                    else:
+                        self.cached += 1
+                        known[key] = cached or None
+
+        found: dict[str, Channel|None] = {}
+        pending = iter(names.items())
+        async def lookups():
+            for key, (kind, name) in pending:
+                self.lookups += 1
+                try:
+                    if kind == 'handle':
+                        channel = await self.yt.channel_by_handle(name, parts)
+                    else:
+                        channel = await self.yt.channel_by_username(name, parts)
+                except ResourceNotFound:
+                    channel = None
+                if channel is None:
+                    known[key] = None
+                    self.store.set(key, '')
+                else:
+                    known[key] = channel.id
+                    found[channel.id] = channel
+                    self.store.set(key, channel.id)
+
+        # workers share the iterator of names, so each is looked up once
+        workers = [asyncio.ensure_future(lookups()) for _ in range(min(self.concurrency, len(names)))]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+        for ref, key in keys.items():
+            ids[ref] = known[key]
+        return ids, found
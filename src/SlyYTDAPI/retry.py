@@ -0,0 +1,203 @@
+'''
+Retrying failed requests, limiting the request rate, and failing fast once the quota is exceeded
+https://developers.google.com/youtube/v3/docs/errors
+'''
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+from aiohttp import ClientError
+from SlyAPI.web import ApiError
+
+# the daily quota is spent: requests fail until it resets
+QUOTA_REASONS = {'quotaExceeded', 'dailyLimitExceeded'}
+# too many requests too quickly: requests succeed again after a pause
+RATE_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+
+def error_reason(error: ApiError) -> str|None:
+    '''The reason given in the body of an API error, such as `quotaExceeded`.'''
+    try:
+        body = json.loads(error.reason or '')
+        details = body['error']
+    except (ValueError, TypeError, KeyError):
+        return None
+    if not isinstance(details, dict):
+        return None
+    for item in details.get('errors') or []:
+        if isinstance(item, dict) and (reason := item.get('reason')):
+            return reason
+    return details.get('status')
+
+def _retry_after(error: ApiError) -> float|None:
+    header = error.response.headers.get('Retry-After') if error.response is not None else None
+    try:
+        return float(header) if header is not None else None
+    except ValueError: # an HTTP date
+        return None
+
+@dataclass
+class RetryPolicy:
+    '''
+    Which failed requests to send again, and how long to wait before each.
+    Server errors, 429, rate limits (403 `rateLimitExceeded`), timeouts and
+    connection errors are retried; other errors, including 403
+    `quotaExceeded`, are raised immediately.
+    Waits double from `base_delay` up to `max_delay`, half fixed and half
+    random, or as long as the server's Retry-After if that is longer.
+    '''
+    # tries in total, including the first
+    attempts: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    statuses: set[int] = field(default_factory=lambda: {429, 500, 502, 503, 504})
+    # retried with status 403 only for these
+    reasons: set[str] = field(default_factory=lambda: set(RATE_REASONS))
+    sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    jitter: Callable[[], float] = random.random
+
+    def retryable(self, error: BaseException) -> bool:
+        match error:
+            case ApiError(status=403):
+                return error_reason(error) in self.reasons
+            case ApiError():
+                return error.status in self.statuses
+            case ClientError() | asyncio.TimeoutError():
+                return True
+            case _:
+                return False
+
+    def delay(self, failures: int, error: BaseException|None = None) -> float:
+        '''Seconds to wait after `failures` failed attempts in a row.'''
+        delay = min(self.max_delay, self.base_delay * 2 ** (failures - 1))
+        delay = delay / 2 + delay / 2 * self.jitter()
+        if isinstance(error, ApiError) and (after := _retry_after(error)) is not None:
+            delay = max(delay, min(after, self.max_delay))
+        return delay
+
+class TokenBucket:
+    '''
+    Allows `rate` requests per second on average, and bursts of up to
+    `capacity`. Waiters are served in the order they arrive.
+    '''
+    rate: float
+    capacity: float
+    tokens: float
+
+    def __init__(self, rate: float, capacity: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+
+    async def acquire(self):
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        # reserve a token, going into debt if there are none, which later callers wait out
+        self.tokens -= 1
+        if self.tokens < 0:
+            await self._sleep(-self.tokens / self.rate)
+
+class RateLimiter:
+    '''
+    A `TokenBucket` per endpoint, for endpoints in `rates` (requests per
+    second), and for other endpoints if there is a `default` rate.
+    '''
+    rates: dict[str, float]
+    default: float|None
+    burst: float
+    buckets: dict[str, TokenBucket]
+
+    def __init__(self, rates: dict[str, float]|None = None, default: float|None = None,
+        burst: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep):
+        self.rates = rates or {}
+        self.default = default
+        self.burst = burst
+        self.buckets = {}
+        self._clock = clock
+        self._sleep = sleep
+
+    async def acquire(self, endpoint: str):
+        bucket = self.buckets.get(endpoint)
+        if bucket is None:
+            rate = self.rates.get(endpoint, self.default)
+            if rate is None:
+                return
+            bucket = self.buckets[endpoint] = TokenBucket(rate, self.burst, self._clock, self._sleep)
+        await bucket.acquire()
+
+class CircuitOpen(Exception):
+    '''Raised instead of sending a request while the quota is known to be exceeded.'''
+    endpoint: str
+    retry_after: float
+
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(F"quota exceeded, not requesting {endpoint} for {retry_after:.0f}s")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    '''
+    Stops requests once the API reports the quota is exceeded, since all
+    would fail until it resets (daily, at midnight Pacific time). For
+    `cooldown` seconds requests raise `CircuitOpen` without being sent,
+    then one is let through: if it succeeds, requests resume, and if it
+    fails with the same reason, the circuit opens again.
+    '''
+    cooldown: float
+    reasons: set[str]
+    opened_at: float|None
+    # counters
+    trips: int
+    rejected: int
+
+    def __init__(self, cooldown: float = 60 * 60, reasons: set[str]|None = None,
+        clock: Callable[[], float] = time.monotonic):
+        self.cooldown = cooldown
+        self.reasons = QUOTA_REASONS if reasons is None else reasons
+        self.opened_at = None
+        self.trips = 0
+        self.rejected = 0
+        self._clock = clock
+        self._trial = False
+
+    def check(self, endpoint: str) -> bool:
+        '''
+        Raise `CircuitOpen` if a request to `endpoint` should not be sent.
+        Returns whether it is the trial after the cooldown, in which case
+        `release` must be called once it is done, whatever the outcome.
+        '''
+        if self.opened_at is None:
+            return False
+        remaining = self.opened_at + self.cooldown - self._clock()
+        if remaining > 0 or self._trial:
+            self.rejected += 1
+            raise CircuitOpen(endpoint, max(remaining, 0.0))
+        self._trial = True
+        return True
+
+    def release(self):
+        '''
+        End the trial, if neither `success` nor `failure` did, such as when
+        it was cancelled, so that another request can be the trial.
+        '''
+        self._trial = False
+
+    def success(self):
+        self.opened_at = None
+        self._trial = False
+
+    def failure(self, error: BaseException):
+        if isinstance(error, ApiError) and error_reason(error) in self.reasons:
+            if self.opened_at is None or self._trial:
+                self.trips += 1
+            self.opened_at = self._clock()
+        self._trial = False
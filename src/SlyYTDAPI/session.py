@@ -0,0 +1,54 @@
+'''
+HTTP session settings: connection pooling, keep-alive, DNS caching and timeouts
+https://docs.aiohttp.org/en/stable/client_advanced.html#connectors
+'''
+from dataclasses import dataclass
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+@dataclass
+class SessionConfig:
+    '''
+    Settings for the HTTP session of a `YouTubeData` client, which all of its
+    requests share. aiohttp only speaks HTTP/1.1, so connections are reused
+    by keep-alive rather than multiplexed: allow at least as many connections
+    per host as requests in flight, to avoid waiting for a free connection.
+    Timeouts are in seconds and apply to each request; None for no limit.
+    '''
+    # open connections in total, and to any one host. 0 for no limit
+    limit: int = 100
+    limit_per_host: int = 0
+    # seconds an idle connection is kept open for reuse
+    keepalive_timeout: float = 60.0
+    # close every connection after one request
+    force_close: bool = False
+    # seconds host name lookups are cached, or None to look up every time
+    dns_cache_ttl: int|None = 300
+
+    # aiohttp's default
+    total_timeout: float|None = 300.0
+    connect_timeout: float|None = 10.0
+    # between reads of the response
+    read_timeout: float|None = 30.0
+
+    def timeout(self) -> ClientTimeout:
+        return ClientTimeout(
+            total=self.total_timeout,
+            connect=self.connect_timeout,
+            sock_read=self.read_timeout)
+
+    def connector(self) -> TCPConnector:
+        if self.force_close:
+            keepalive = {}
+        else:
+            keepalive = { 'keepalive_timeout': self.keepalive_timeout }
+        return TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            force_close=self.force_close,
+            use_dns_cache=self.dns_cache_ttl is not None,
+            ttl_dns_cache=self.dns_cache_ttl,
+            **keepalive)
+
+    def session(self) -> ClientSession:
+        '''Create a session with these settings. Requires a running event loop.'''
+        return ClientSession(connector=self.connector(), timeout=self.timeout())
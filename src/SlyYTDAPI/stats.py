@@ -0,0 +1,228 @@
+'''
+Statistics of many videos or channels over time, and what changed between polls
+https://developers.google.com/youtube/v3/docs/videos#statistics
+https://developers.google.com/youtube/v3/docs/channels#statistics
+'''
+import math
+import time
+from abc import ABC, abstractmethod
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, Callable, Iterable
+from .ytdapi import YouTubeData
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError: # without the arrow extra, columns are computed in Python, one value at a time
+    pa = pc = None
+
+VIDEO_METRICS = ['view_count', 'like_count', 'comment_count']
+CHANNEL_METRICS = ['view_count', 'subscriber_count', 'video_count']
+
+# a count which is hidden, or of an ID which was not found
+NULL = -1
+
+@dataclass
+class Snapshot:
+    '''Every tracked ID's values of each metric at one time, in the order of `StatsTracker.ids`.'''
+    at: float
+    values: dict[str, 'array[int]']
+
+@dataclass
+class StatsChange:
+    '''An ID with any metric different from the previous snapshot.'''
+    id: str
+    # None if hidden or not found
+    values: dict[str, int|None]
+    # since the previous snapshot, None if either value is
+    deltas: dict[str, int|None]
+    # deltas per hour
+    rates: dict[str, float|None]
+
+def _arrow(column: 'array[Any]') -> Any:
+    'A view of a typed array as an Arrow array, without copying.'
+    type = pa.int64() if column.typecode == 'q' else pa.float64()
+    return pa.Array.from_buffers(type, len(column), [None, pa.py_buffer(column)])
+
+def _from_arrow(typecode: str, values: Any) -> 'array[Any]':
+    column = array(typecode)
+    start = values.offset * column.itemsize
+    column.frombytes(memoryview(values.buffers()[1])[start:start + len(values) * column.itemsize])
+    return column
+
+def _unknown(latest: 'array[int]', earlier: 'array[int]') -> Any:
+    return pc.or_(pc.equal(_arrow(latest), NULL), pc.equal(_arrow(earlier), NULL))
+
+def _deltas(latest: 'array[int]', earlier: 'array[int]') -> 'array[int]':
+    if pc is None:
+        return array('q', [NULL if a == NULL or b == NULL else a - b for a, b in zip(latest, earlier)])
+    deltas = pc.subtract(_arrow(latest), _arrow(earlier))
+    return _from_arrow('q', pc.if_else(_unknown(latest, earlier), NULL, deltas))
+
+def _rates(latest: 'array[int]', earlier: 'array[int]', hours: float) -> 'array[float]':
+    if pc is None:
+        return array('d', [
+            math.nan if a == NULL or b == NULL else (a - b) / hours for a, b in zip(latest, earlier)
+        ])
+    deltas = pc.subtract(pc.cast(_arrow(latest), pa.float64()), pc.cast(_arrow(earlier), pa.float64()))
+    return _from_arrow('d', pc.if_else(_unknown(latest, earlier), math.nan, pc.divide(deltas, hours)))
+
+def _differ(pairs: Iterable[tuple['array[int]', 'array[int]']]) -> list[int]:
+    '''Indices where any pair of columns has different values.'''
+    if pc is None:
+        changed: set[int] = set()
+        for latest, earlier in pairs:
+            changed.update(i for i, (a, b) in enumerate(zip(latest, earlier)) if a != b)
+        return sorted(changed)
+    mask = None
+    for latest, earlier in pairs:
+        differs = pc.not_equal(_arrow(latest), _arrow(earlier))
+        mask = differs if mask is None else pc.or_(mask, differs)
+    return [] if mask is None else pc.indices_nonzero(mask).to_pylist()
+
+def _take(column: 'array[int]', keep: list[int]) -> 'array[int]':
+    if pc is None:
+        return array('q', [column[i] for i in keep])
+    return _from_arrow('q', pc.take(_arrow(column), pa.array(keep, pa.int64())))
+
+class StatsTracker(ABC):
+    '''
+    Polls the statistics of a set of videos or channels, keeping the last
+    `history` snapshots. Each snapshot holds one array of 64-bit integers per
+    metric, so memory is `history * metrics * 8` bytes per ID. Deltas and
+    rates are computed a whole column at a time.
+    Use `VideoStats` or `ChannelStats`.
+    '''
+    yt: YouTubeData
+    history: int
+    concurrency: int|None
+    ids: list[str]
+    snapshots: deque[Snapshot]
+    _index: dict[str, int]
+
+    def __init__(self, yt: YouTubeData, ids: Iterable[str] = (), history: int = 2,
+        concurrency: int|None = None, clock: Callable[[], float] = time.time):
+        if history < 2:
+            raise ValueError("At least 2 snapshots are needed for deltas")
+        self.yt = yt
+        self.history = history
+        self.concurrency = concurrency
+        self.ids = []
+        self.snapshots = deque(maxlen=history)
+        self._index = {}
+        self._clock = clock
+        self.track(ids)
+
+    @property
+    @abstractmethod
+    def metrics(self) -> list[str]:
+        '''Attributes of the items from `_fetch` to keep.'''
+
+    @abstractmethod
+    def _fetch(self, ids: list[str]) -> AsyncIterable[Any]:
+        '''Items with the metrics of `ids`, in any order.'''
+
+    def track(self, ids: Iterable[str]):
+        '''Add IDs, with no values in earlier snapshots.'''
+        new = [id for id in dict.fromkeys(ids) if id not in self._index]
+        for id in new:
+            self._index[id] = len(self.ids)
+            self.ids.append(id)
+        padding = array('q', [NULL]) * len(new)
+        for snapshot in self.snapshots:
+            for column in snapshot.values.values():
+                column.extend(padding)
+
+    def untrack(self, ids: Iterable[str]):
+        '''Remove IDs and their values.'''
+        removed = {self._index[id] for id in ids if id in self._index}
+        if not removed:
+            return
+        keep = [i for i in range(len(self.ids)) if i not in removed]
+        self.ids = [self.ids[i] for i in keep]
+        self._index = { id: i for i, id in enumerate(self.ids) }
+        for snapshot in self.snapshots:
+            for metric, column in snapshot.values.items():
+                snapshot.values[metric] = _take(column, keep)
+
+    async def poll(self) -> list[StatsChange]:
+        '''Take a snapshot of every tracked ID, and return those which changed.'''
+        snapshot = Snapshot(self._clock(), {
+            metric: array('q', [NULL]) * len(self.ids) for metric in self.metrics
+        })
+        # as each page arrives, so only the snapshot grows with the number of IDs
+        async for item in self._fetch(self.ids):
+            i = self._index.get(item.id)
+            if i is None:
+                continue
+            for metric, column in snapshot.values.items():
+                value = getattr(item, metric, None)
+                if value is not None:
+                    column[i] = value
+        self.snapshots.append(snapshot)
+        return self.changes()
+
+    def deltas(self, metric: str, back: int = 1) -> 'array[int]':
+        '''Change of `metric` for every ID from `back` snapshots ago to the latest, `NULL` if unknown.'''
+        return _deltas(self.snapshots[-1].values[metric], self.snapshots[-1 - back].values[metric])
+
+    def rates(self, metric: str, back: int = 1) -> 'array[float]':
+        '''`deltas` per hour, NaN if unknown.'''
+        hours = (self.snapshots[-1].at - self.snapshots[-1 - back].at) / 3600
+        latest, earlier = self.snapshots[-1].values[metric], self.snapshots[-1 - back].values[metric]
+        if hours <= 0:
+            return array('d', [math.nan]) * len(latest)
+        return _rates(latest, earlier, hours)
+
+    def changed(self) -> list[int]:
+        '''
+        Indices of IDs with any metric different in the latest snapshot than
+        the one before. In the first snapshot, those with any value.
+        '''
+        if not self.snapshots:
+            return []
+        latest = self.snapshots[-1].values
+        if len(self.snapshots) > 1:
+            earlier = self.snapshots[-2].values
+        else:
+            earlier = { metric: array('q', [NULL]) * len(self.ids) for metric in self.metrics }
+        return _differ((latest[metric], earlier[metric]) for metric in self.metrics)
+
+    def changes(self) -> list[StatsChange]:
+        '''IDs which changed in the latest snapshot, with their values, deltas and rates.'''
+        indices = self.changed()
+        if not indices:
+            return []
+        latest = self.snapshots[-1]
+        previous = self.snapshots[-2] if len(self.snapshots) > 1 else None
+        hours = (latest.at - previous.at) / 3600 if previous is not None else 0.0
+        changes: list[StatsChange] = []
+        for i in indices:
+            values: dict[str, int|None] = {}
+            deltas: dict[str, int|None] = {}
+            rates: dict[str, float|None] = {}
+            for metric in self.metrics:
+                value = latest.values[metric][i]
+                before = previous.values[metric][i] if previous is not None else NULL
+                values[metric] = None if value == NULL else value
+                if value == NULL or before == NULL:
+                    deltas[metric] = rates[metric] = None
+                else:
+                    deltas[metric] = value - before
+                    rates[metric] = (value - before) / hours if hours > 0 else None
+            changes.append(StatsChange(self.ids[i], values, deltas, rates))
+        return changes
+
+class VideoStats(StatsTracker):
+    metrics = VIDEO_METRICS
+
+    def _fetch(self, ids: list[str]) -> AsyncIterable[Any]:
+        return self.yt.videos(ids, concurrency=self.concurrency, fields=self.metrics)
+
+class ChannelStats(StatsTracker):
+    metrics = CHANNEL_METRICS
+
+    def _fetch(self, ids: list[str]) -> AsyncIterable[Any]:
+        return self.yt.iter_channels(ids, concurrency=self.concurrency, fields=self.metrics)
@@ -0,0 +1,106 @@
+'''
+Small persistent key-value stores, for sync state and checkpoints.
+Values are anything that can be serialized as JSON.
+'''
+import json
+import os
+import re
+import sqlite3
+from abc import ABC, abstractmethod
+from typing import Any
+
+class StateStore(ABC):
+    'Base class for key-value stores of JSON values.'
+
+    @abstractmethod
+    def get(self, key: str) -> Any|None: pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any): pass
+
+    @abstractmethod
+    def delete(self, key: str): pass
+
+class MemoryStore(StateStore):
+    'Not persisted. Useful for tests.'
+    _values: dict[str, str]
+
+    def __init__(self):
+        self._values = {}
+
+    def get(self, key: str) -> Any|None:
+        value = self._values.get(key)
+        return None if value is None else json.loads(value)
+
+    def set(self, key: str, value: Any):
+        self._values[key] = json.dumps(value)
+
+    def delete(self, key: str):
+        self._values.pop(key, None)
+
+class JsonFileStore(StateStore):
+    '''
+    Keeps all values in memory and rewrites a JSON file on every change.
+    Suitable for up to a few thousand small values.
+    '''
+    path: str
+    _values: dict[str, Any]
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.exists(path):
+            with open(path, encoding='utf8') as f:
+                self._values = json.load(f)
+        else:
+            self._values = {}
+
+    def _write(self):
+        # replace the file, so a crash mid-write leaves the previous state intact
+        temp = self.path + '.tmp'
+        with open(temp, 'w', encoding='utf8') as f:
+            json.dump(self._values, f)
+        os.replace(temp, self.path)
+
+    def get(self, key: str) -> Any|None:
+        return self._values.get(key)
+
+    def set(self, key: str, value: Any):
+        self._values[key] = json.loads(json.dumps(value))
+        self._write()
+
+    def delete(self, key: str):
+        if self._values.pop(key, None) is not None:
+            self._write()
+
+# table names are formatted into the SQL, so only identifiers are allowed
+RE_TABLE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+class SqliteStore(StateStore):
+    '''
+    Values stored in an SQLite database file, one row per key. While another
+    connection writes to the file, waits up to `timeout` seconds to write.
+    '''
+    _db: sqlite3.Connection
+
+    def __init__(self, path: str, table: str = 'state', timeout: float = 5.0):
+        if not RE_TABLE.fullmatch(table):
+            raise ValueError(F"Not a valid table name: {table!r}")
+        self._db = sqlite3.connect(path, timeout=timeout)
+        self._table = table
+        self._db.execute(F'CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT)')
+        self._db.commit()
+
+    def get(self, key: str) -> Any|None:
+        row = self._db.execute(F'SELECT value FROM {self._table} WHERE key = ?', (key,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def set(self, key: str, value: Any):
+        self._db.execute(F'INSERT OR REPLACE INTO {self._table} VALUES (?, ?)', (key, json.dumps(value)))
+        self._db.commit()
+
+    def delete(self, key: str):
+        self._db.execute(F'DELETE FROM {self._table} WHERE key = ?', (key,))
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
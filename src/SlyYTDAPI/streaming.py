@@ -0,0 +1,100 @@
+'''
+Incremental decoding of list responses, one item at a time as the body arrives
+'''
+import codecs
+import json
+from typing import Any, AsyncGenerator, AsyncIterable, AsyncIterator
+
+_decoder = json.JSONDecoder()
+WHITESPACE = ' \t\n\r'
+
+class _Buffer:
+    'Text of a JSON document received so far, and the position decoded up to.'
+    text: str
+    pos: int
+    eof: bool
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+        self._chunks = chunks
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+
+    async def more(self, min_size: int = 1):
+        '''Receive until at least `min_size` characters are undecoded, or the end.
+        Decoded text is dropped.'''
+        parts = [self.text[self.pos:]]
+        size = len(parts[0])
+        while size < min_size and not self.eof:
+            try:
+                part = self._utf8.decode(await anext(self._chunks))
+            except StopAsyncIteration:
+                part = self._utf8.decode(b'', final=True)
+                self.eof = True
+            parts.append(part)
+            size += len(part)
+        self.text = ''.join(parts)
+        self.pos = 0
+
+    async def peek(self) -> str:
+        '''Next character other than whitespace, or '' at the end.'''
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if self.eof:
+                return ''
+            await self.more()
+
+    async def expect(self, char: str):
+        if await self.peek() != char:
+            raise json.JSONDecodeError(F"Expecting '{char}'", self.text, self.pos)
+        self.pos += 1
+
+    async def value(self) -> Any:
+        await self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+                # a value ending the buffer, such as a number, may continue in the next chunk
+                if end < len(self.text) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # double what is buffered, so a large value is not decoded many times over
+            await self.more(2 * (len(self.text) - self.pos))
+
+async def stream_items(chunks: AsyncIterable[bytes], page: dict[str, Any],
+    container: str = 'items') -> AsyncGenerator[Any, None]:
+    '''
+    Decode a JSON object from `chunks` as they arrive, yielding each element
+    of its `container` list as soon as it is complete. Other keys, such as
+    `nextPageToken`, are stored in `page` as they are decoded.
+    '''
+    buffer = _Buffer(aiter(chunks))
+    await buffer.expect('{')
+    if await buffer.peek() == '}':
+        return
+    while True:
+        key = await buffer.value()
+        await buffer.expect(':')
+        if key == container and await buffer.peek() == '[':
+            buffer.pos += 1
+            if await buffer.peek() == ']':
+                buffer.pos += 1
+            else:
+                while True:
+                    yield await buffer.value()
+                    if await buffer.peek() == ']':
+                        buffer.pos += 1
+                        break
+                    await buffer.expect(',')
+        else:
+            page[key] = await buffer.value()
+        if await buffer.peek() == '}':
+            return
+        await buffer.expect(',')
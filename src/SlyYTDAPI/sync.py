@@ -0,0 +1,94 @@
+'''
+Incremental sync of channel uploads, using the uploads playlist
+instead of search (1 quota unit per page instead of 100)
+'''
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+from .ytdapi import YouTubeData, Channel, Video, Part
+from .store import StateStore
+
+def uploads_playlist_id(channel_id: str) -> str:
+    '''ID of a channel's uploads playlist, without requesting the channel.'''
+    if not channel_id.startswith('UC'):
+        raise ValueError(F"Not a channel ID: {channel_id}")
+    return 'UU' + channel_id[2:]
+
+@dataclass
+class Watermark:
+    'Newest upload seen by the last sync of a channel.'
+    video_id: str
+    # time added to the uploads playlist
+    published_at: datetime
+
+    def to_json(self) -> dict[str, str]:
+        return { 'video_id': self.video_id, 'published_at': self.published_at.isoformat() }
+
+    @staticmethod
+    def from_json(value: dict[str, str]) -> 'Watermark':
+        return Watermark(value['video_id'], datetime.fromisoformat(value['published_at']))
+
+class UploadsSync:
+    '''
+    Finds videos uploaded to channels since they were last synced.
+    The uploads playlist is walked newest first until reaching the
+    watermark saved in `store` by the previous sync, then only the new
+    videos are requested with `parts`.
+    The first sync of a channel takes at most `initial_limit` videos.
+    '''
+    yt: YouTubeData
+    store: StateStore
+    parts: set[Part]
+    initial_limit: int|None
+
+    def __init__(self, yt: YouTubeData, store: StateStore,
+        parts: Part|set[Part]={Part.SNIPPET, Part.DETAILS, Part.STATISTICS},
+        initial_limit: int|None=50):
+        self.yt = yt
+        self.store = store
+        self.parts = parts.intersection(Part.ALL_PUBLIC())
+        self.initial_limit = initial_limit
+
+    def watermark(self, channel_id: str) -> Watermark|None:
+        value = self.store.get(F"uploads:{channel_id}")
+        return None if value is None else Watermark.from_json(value)
+
+    async def sync(self, channel: Channel|str) -> list[Video]:
+        '''New uploads of a channel since its last sync, newest first.'''
+        if isinstance(channel, Channel):
+            channel_id = channel.id
+            playlist_id = channel.uploads_playlist.id \
+                if hasattr(channel, 'uploads_playlist') else uploads_playlist_id(channel.id)
+        else:
+            channel_id = channel
+            playlist_id = uploads_playlist_id(channel)
+
+        mark = self.watermark(channel_id)
+        limit = self.initial_limit if mark is None else None
+        newest: Watermark|None = None
+        new_ids: list[str] = []
+        async for item in self.yt.get_playlist_videos(
+            playlist_id, {Part.SNIPPET, Part.DETAILS}, limit, lazy=True):
+            if mark is not None and (
+                item.id == mark.video_id or item.published_at < mark.published_at):
+                break
+            if newest is None:
+                newest = Watermark(item.id, item.published_at)
+            new_ids.append(item.id)
+
+        videos = await self.yt.videos(new_ids, self.parts) if new_ids else []
+        if newest is not None:
+            self.store.set(F"uploads:{channel_id}", newest.to_json())
+        return videos
+
+    async def sync_many(self, channels: list[Channel|str], concurrency: int = 8) -> dict[str, list[Video]]:
+        '''Sync several channels, up to `concurrency` at once.'''
+        limit = asyncio.Semaphore(concurrency)
+        async def one(channel: Channel|str) -> list[Video]:
+            async with limit:
+                return await self.sync(channel)
+        results = await asyncio.gather(*(one(c) for c in channels))
+        return {
+            (c.id if isinstance(c, Channel) else c): videos
+            for c, videos in zip(channels, results)
+        }
@@ -1,18 +1,38 @@
-from dataclasses import dataclass, asdict
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from contextlib import asynccontextmanager
+from json import loads as json_loads
+from dataclasses import dataclass, asdict, replace
 import inspect
+import itertools
 import re
 from enum import Enum
+from functools import lru_cache
 from datetime import datetime, timezone
-from typing import TypeVar, Any
+from time import perf_counter
+from typing import AsyncGenerator, AsyncIterator, Awaitable, Callable, Iterable, TypeVar, Any
+from urllib.parse import urlencode
 from warnings import warn
+from aiohttp import ClientError, ClientResponse, ClientSession
 from SlyAPI import *
-from SlyAPI.web import ParamsDict
+from SlyAPI.asyncy import unmanage_async_context
+from SlyAPI.web import ApiError, JsonMap, Method, ParamsDict, Request
 from SlyAPI.webapi import is_dataclass_instance
 from SlySerialize import to_json
+from .quota import QuotaScheduler, endpoint_cost
+from .cache import ResponseCache
+from .coalesce import SingleFlight, MicroBatcher, request_key
+from .instrument import Instrument, PageEvent, CallEvent, _page, _call
+from .retry import RetryPolicy, RateLimiter, CircuitBreaker
+from .pool import CredentialPool
+from .projection import Field, Projection
+from .session import SessionConfig
+from .streaming import stream_items
 
 SCOPES_ROOT = 'https://www.googleapis.com/auth/youtube'
 
-RE_CHANNEL_URL = re.compile(r'^(?:https?:)?\/\/?(?:www\.|m\.)(?:youtube\.com)\/(?:c\/(?P<username>[a-zA-Z0-9\-_]+)|@(?P<handle>[a-zA-Z0-9\-_]+)|channel\/(?P<id>UC[a-zA-Z0-9\-_]+))')
+RE_CHANNEL_URL = re.compile(r'^(?:https?:)?\/\/?(?:www\.|m\.)?(?:youtube\.com)\/(?:(?:c|user)\/(?P<username>[a-zA-Z0-9\-_]+)|@(?P<handle>[a-zA-Z0-9\-_.]+)|channel\/(?P<id>UC[a-zA-Z0-9\-_]+))')
 
 class Scope:
     READONLY     = F"{SCOPES_ROOT}.readonly"
@@ -35,6 +55,9 @@ class Part(Enum):
     FILE_DETAILS            = 'fileDetails'
     PROCESSING_DETAILS      = 'processingDetails'
 
+    # live chat messages only
+    AUTHOR_DETAILS          = 'authorDetails'
+
     @staticmethod
     def ALL_PUBLIC():
         return {
@@ -80,15 +103,38 @@ class CommentOrder(Enum):
     TIME         = 'time'
 
 ISO8601_PERIOD = re.compile(r'P(?:(\d+)D)?(?:T(?:(\d{1,2})H)?(?:(\d{1,2})M)?(?:(\d{1,2})S)?)?')
+# the exact format of YouTube timestamps, e.g. 2023-07-30T12:34:56.789Z
+YT_TIMESTAMP = re.compile(r'\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d(?:\.\d{1,6})?Z', re.ASCII)
 
+# timestamps repeat often, such as every item in a playlist added at once,
+# and datetimes are immutable so may be shared
+@lru_cache(maxsize=4096)
 def yt_date(date: str) -> datetime:
     if date.endswith('Z'):
+        if YT_TIMESTAMP.fullmatch(date):
+            try: # much faster than strptime, gives the same result for this format
+                return datetime.fromisoformat(date[:-1])
+            except ValueError: # out of range, or fraction not 3 or 6 digits before 3.11
+                pass
         try:
             return datetime.strptime(date, '%Y-%m-%dT%H:%M:%S.%fZ')
         except ValueError:
             return datetime.strptime(date, '%Y-%m-%dT%H:%M:%SZ')
     else:
         return datetime.fromisoformat(date)
+
+@lru_cache(maxsize=4096)
+def yt_duration(duration: str) -> int:
+    '''Seconds in an ISO 8601 duration, as used for video lengths.'''
+    m = ISO8601_PERIOD.match(duration)
+    if not m:
+        raise ValueError(F"Unknown duration format: {duration}")
+    days, hours, minutes, seconds = m.groups()
+    return (
+        (int(days) * 24 * 60 * 60 if days else 0) +
+        (int(hours) * 60 * 60 if hours else 0) +
+        (int(minutes) * 60 if minutes else 0) +
+        (int(seconds) if seconds else 0) )
     
 def yt_date_or_none(date: str|None) -> datetime|None:
     if date is not None:
@@ -99,6 +145,85 @@ def yt_date_or_none(date: str|None) -> datetime|None:
 W = TypeVar('W')
 T = TypeVar('T')
 
+class ResourceNotFound(IndexError):
+    '''A resource requested by ID or name does not exist, or is private.'''
+    kind: str
+    id: str
+
+    def __init__(self, kind: str, id: str):
+        super().__init__(F"{kind} not found: {id}")
+        self.kind = kind
+        self.id = id
+
+def _first(items: list[T], kind: str, id: str) -> T:
+    if not items:
+        raise ResourceNotFound(kind, id)
+    return items[0]
+
+async def _fetch_chunks(
+    chunks: Iterable[W],
+    fetch: Callable[[W], AsyncLazy[T]],
+    concurrency: int,
+    ordered: bool = True) -> AsyncGenerator[T, None]:
+    '''
+    Run `fetch` over `chunks` with at most `concurrency` calls in flight.
+    Yields items in chunk order, or as each chunk completes if not `ordered`.
+    '''
+    if concurrency <= 1:
+        # items as they arrive, without collecting each chunk
+        for chunk in chunks:
+            async for item in fetch(chunk):
+                yield item
+        return
+    remaining = iter(chunks)
+    in_flight: deque[asyncio.Future[list[T]]] = deque()
+    try:
+        while True:
+            for chunk in itertools.islice(remaining, max(1, concurrency) - len(in_flight)):
+                in_flight.append(asyncio.ensure_future(_collect(fetch(chunk))))
+            if not in_flight:
+                return
+            if ordered:
+                items = await in_flight.popleft()
+            else:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                first = done.pop()
+                in_flight.remove(first)
+                items = first.result()
+            for item in items:
+                yield item
+    finally:
+        for task in in_flight:
+            task.cancel()
+
+async def _collect(items: AsyncLazy[T]) -> list[T]:
+    return await items
+
+async def _timed_chunks(chunks: AsyncIterator[bytes], page: PageEvent) -> AsyncGenerator[bytes, None]:
+    'Add the time waiting for each chunk to `page.latency`, and its size to `page.bytes`.'
+    while True:
+        start = perf_counter()
+        try:
+            chunk = await anext(chunks)
+        except StopAsyncIteration:
+            return
+        finally:
+            page.latency += perf_counter() - start
+        page.bytes += len(chunk)
+        yield chunk
+
+async def _timed_decode(items: AsyncGenerator[T, None], page: PageEvent) -> AsyncGenerator[T, None]:
+    'Add the time producing each item, except waiting for chunks, to `page.decode`.'
+    while True:
+        start, latency = perf_counter(), page.latency
+        try:
+            item = await anext(items)
+        except StopAsyncIteration:
+            return
+        finally:
+            page.decode += perf_counter() - start - (page.latency - latency)
+        yield item
+
 def get_dict_path(d: dict[str, Any], *keys: str) -> Any:
     for key in keys:
         if key not in d:
@@ -113,8 +238,12 @@ class Comment:
     author_channel_id: str
     body: str
     created_at: datetime
+    # only for replies
+    parent_id: str|None = None
+    # only for top-level comments
+    reply_count: int|None = None
     # part: replies
-    replies: list['Comment']|None
+    replies: list['Comment']|None = None
 
     @property
     def author_name(self):
@@ -126,6 +255,7 @@ class Comment:
         if tlc := source.get('snippet', {}).get('topLevelComment'):
             replies: list[Any] = source.get('replies', {}).get('comments', [])
             self.replies = [Comment(r) for r in replies]
+            self.reply_count = source['snippet'].get('totalReplyCount')
             source = tlc
             
         self.id = source['id']
@@ -134,6 +264,7 @@ class Comment:
             self.author_channel_id = snippet['authorChannelId']['value']
             self.body = snippet['textDisplay']
             self.created_at = yt_date(snippet['publishedAt'])
+            self.parent_id = snippet.get('parentId')
         
 @dataclass
 class EmbedInfo:
@@ -228,7 +359,110 @@ class VideoLocalization:
     title: str
     description: str
 
-class Video:
+def _video_id(source: dict[str, Any]) -> str:
+    if source.get('kind') == 'youtube#playlistItem':
+        return source.get('contentDetails', {}).get('videoId')
+    match source['id']:
+        case str():
+            return source['id']
+        case dict(): # case for video search result object
+            return source['id']['videoId']
+        case _:
+            raise ValueError("Video expects source id to be a string or dict")
+
+def _duration(contentDetails: dict[str, Any]) -> int | None:
+    if not contentDetails.get('duration'):
+        return None
+    return yt_duration(contentDetails['duration'])
+
+def _content_details(contentDetails: dict[str, Any], duration: int | None) -> ContentDetails:
+    return ContentDetails(
+        duration,
+        contentDetails.get('licensedContent'),
+        contentDetails.get("regionRestriction", {}).get("blocked", []),
+        contentDetails.get("regionRestriction", {}).get("allowed", []),
+        contentDetails.get("contentRating", {}),
+        contentDetails.get("dimension"),
+        contentDetails.get("definition"),
+        contentDetails.get("caption"),
+        contentDetails.get("projection")
+    )
+
+def _status_details(status: dict[str, Any]) -> StatusDetails:
+    return StatusDetails(
+        status.get('privacyStatus'),
+        status.get('uploadStatus'),
+        status.get('failureReason'),
+        status.get('rejectionReason'),
+        status.get('license'),
+        status.get('embeddable'),
+        status.get('publicStatsViewable'),
+        status.get('madeForKids'),
+        status.get('selfDeclaredMadeForKids')
+    )
+
+def _livestream_details(stream: dict[str, Any]) -> LivestreamDetails:
+    return LivestreamDetails(
+        stream.get('concurrentViewers'),
+        yt_date_or_none(stream.get('actualStartTime')),
+        yt_date_or_none(stream.get('actualEndTime')),
+        yt_date_or_none(stream.get('scheduledStartTime')),
+        yt_date_or_none(stream.get('scheduledEndTime')),
+        stream.get('activeLiveChatId')
+    )
+
+def _file_details(fileDetails: dict[str, Any]) -> FileDetails:
+    return FileDetails(
+        [FileDetails.VideoStream(
+            v.get('widthPixels'), v.get('heightPixels'), v.get('frameRateFps'),
+            v.get('aspectRatio'), v.get('codec'), v.get('bitrateBps'),
+            v.get('rotation'), v.get('vendor')
+            ) for v in fileDetails.get('videoStreams')],
+        [FileDetails.AudioStream(
+            a.get('channelCount'), a.get('codec'), a.get('bitrateBps'), a.get('vendor')
+            ) for a in fileDetails.get('audioStreams')],
+        fileDetails.get('fileName'),
+        fileDetails.get('fileSize'),
+        fileDetails.get('fileType'),
+        fileDetails.get('container'),
+        fileDetails.get('durationMs'),
+        fileDetails.get('bitrateBps'),
+        yt_date_or_none(fileDetails.get('creationTime')),
+    )
+
+def _processing_details(processingDetails: dict[str, Any]) -> ProcessingDetails:
+    return ProcessingDetails(
+        processingDetails.get('processingStatus'),
+        processingDetails.get('processingProgress', {}).get('partsTotal'),
+        processingDetails.get('processingProgress', {}).get('partsProcessed'),
+        processingDetails.get('processingProgress', {}).get('timeLeftMs'),
+        processingDetails.get('processingFailureReason'),
+    )
+
+def _localizations(localizations: dict[str, Any]) -> dict[str, VideoLocalization]:
+    return {
+        k: VideoLocalization(**v) for k, v in localizations.items()
+    }
+
+class _VideoMethods:
+    __slots__ = ()
+    _youtube: 'YouTubeData'
+    id: str
+    channel_id: str
+
+    def link(self, short: bool = False) -> str:
+        if not short:
+            return F"https://www.youtube.com/watch?v={self.id}"
+        else:
+            return F"https://youtu.be/{self.id}"
+
+    def comments(self, limit: int | None = 100) -> AsyncLazy[Comment]:
+        return self._youtube.comments(self.id, limit=limit)
+
+    async def channel(self) -> 'Channel':
+        return await self._youtube.channel(self.channel_id)
+
+class Video(_VideoMethods):
     _youtube: 'YouTubeData'
     id: str
 
@@ -293,13 +527,7 @@ class Video:
 
     def __init__(self, source: dict[str, Any], yt: 'YouTubeData'):
         self._youtube = yt
-        match source['id']:
-            case str():
-                self.id = source['id']
-            case dict(): # case for video search result object
-                self.id = source['id']['videoId']
-            case _:
-                raise ValueError("Video expects source id to be a string or dict")
+        self.id = _video_id(source)
         
         if snippet := source.get('snippet'):
             self.title = snippet.get('title')
@@ -315,43 +543,13 @@ class Video:
             self.localized_title = snippet.get("localized", {}).get("title")
             self.localized_description = snippet.get("localized", {}).get("description")
             
-        if source.get('kind') == 'youtube#playlistItem':
-            self.id = source.get('contentDetails', {}).get('videoId')
-        elif contentDetails := source.get('contentDetails'):
-            duration = None
-            if contentDetails.get('duration'):
-                m = ISO8601_PERIOD.match(contentDetails['duration'])
-                if m:
-                    days, hours, minutes, seconds = (int(g) if g else 0 for g in m.groups())
-                    duration = days * 24 * 60 * 60 + hours * 60 * 60 + minutes * 60 + seconds
-                else:
-                    raise ValueError(F"Unknown duration format: {contentDetails['duration']}")
-            self.duration = duration
-            self.content_details = ContentDetails(
-                duration,
-                contentDetails.get('licensedContent'),
-                contentDetails.get("regionRestriction", {}).get("blocked", []),
-                contentDetails.get("regionRestriction", {}).get("allowed", []),
-                contentDetails.get("contentRating", {}),
-                contentDetails.get("dimension"),
-                contentDetails.get("definition"),
-                contentDetails.get("caption"),
-                contentDetails.get("projection")
-            )
+        if source.get('kind') != 'youtube#playlistItem' and (contentDetails := source.get('contentDetails')):
+            self.duration = _duration(contentDetails)
+            self.content_details = _content_details(contentDetails, self.duration)
 
         if status := source.get('status'):
             self.privacy = status.get('privacyStatus')
-            self.status_details = StatusDetails(
-                status.get('privacyStatus'),
-                status.get('uploadStatus'),
-                status.get('failureReason'),
-                status.get('rejectionReason'),
-                status.get('license'),
-                status.get('embeddable'),
-                status.get('publicStatsViewable'),
-                status.get('madeForKids'),
-                status.get('selfDeclaredMadeForKids')
-            )
+            self.status_details = _status_details(status)
 
         if statistics := source.get('statistics'):
             self.view_count = int(statistics.get('viewCount'))
@@ -361,14 +559,7 @@ class Video:
                 self.comment_count = int(statistics.get('commentCount'))
 
         if stream := source.get('liveStreamingDetails'):
-            self.livestream_details = LivestreamDetails(
-                stream.get('concurrentViewers'),
-                yt_date_or_none(stream.get('actualStartTime')),
-                yt_date_or_none(stream.get('actualEndTime')),
-                yt_date_or_none(stream.get('scheduledStartTime')),
-                yt_date_or_none(stream.get('scheduledEndTime')),
-                stream.get('activeLiveChatId')
-            )
+            self.livestream_details = _livestream_details(stream)
 
         if topic_details := source.get('topicDetails'):
             self.topic_categories = topic_details.get('topicCategories', None)
@@ -377,49 +568,189 @@ class Video:
             self.recorded_at = yt_date_or_none(recording_details.get('recordingDate'))
 
         if fileDetails := source.get('fileDetails'):
-            self.file_details = FileDetails(
-                [FileDetails.VideoStream(
-                    v.get('widthPixels'), v.get('heightPixels'), v.get('frameRateFps'),
-                    v.get('aspectRatio'), v.get('codec'), v.get('bitrateBps'),
-                    v.get('rotation'), v.get('vendor')
-                    ) for v in fileDetails.get('videoStreams')],
-                [FileDetails.AudioStream(
-                    a.get('channelCount'), a.get('codec'), a.get('bitrateBps'), a.get('vendor')
-                    ) for a in fileDetails.get('audioStreams')],
-                fileDetails.get('fileName'),
-                fileDetails.get('fileSize'),
-                fileDetails.get('fileType'),
-                fileDetails.get('container'),
-                fileDetails.get('durationMs'),
-                fileDetails.get('bitrateBps'),
-                yt_date_or_none(fileDetails.get('creationTime')),
-            )
+            self.file_details = _file_details(fileDetails)
 
         if processingDetails := source.get('processingDetails'):
-            self.processing_details = ProcessingDetails(
-                processingDetails.get('processingStatus'),
-                processingDetails.get('processingProgress', {}).get('partsTotal'),
-                processingDetails.get('processingProgress', {}).get('partsProcessed'),
-                processingDetails.get('processingProgress', {}).get('timeLeftMs'),
-                processingDetails.get('processingFailureReason'),
-            )
+            self.processing_details = _processing_details(processingDetails)
             
         if localizations := source.get('localizations'):
-            self.localizations = {
-                k: VideoLocalization(**v) for k, v in localizations.items()
-            }
+            self.localizations = _localizations(localizations)
+
+# YouTube sends nextPageToken before items, so it can be found without decoding the page
+NEXT_PAGE_TOKEN = re.compile(r'"nextPageToken"\s*:\s*"([^"\\]*)"')
+
+def decode_videos(text: str) -> tuple[list[Video], str|None]:
+    '''
+    Decode a page of videos or playlist items, returning the videos and the
+    next page token. Made to run in an executor: the videos have no client
+    attached, and keep no source dictionaries, so they are small to send back.
+    '''
+    page = json_loads(text)
+    return [Video(item, None) for item in page.get('items', [])], page.get('nextPageToken') # type: ignore ## attached later
+
+_UNSET: Any = object()
+
+def _decoded(video: Video) -> Video:
+    return video
+
+class _Decoded:
+    '''Attribute of a `LazyVideo` decoded from its source on first access and kept in a slot.'''
+    slot: str
+
+    def __init__(self, decode: Callable[[dict[str, Any]], Any]):
+        self.decode = decode
+
+    def __set_name__(self, owner: type, name: str):
+        self.slot = '_' + name
+
+    def __get__(self, video: 'LazyVideo|None', owner: type|None = None) -> Any:
+        if video is None:
+            return self
+        value = getattr(video, self.slot, _UNSET)
+        if value is _UNSET:
+            value = self.decode(video._source)
+            setattr(video, self.slot, value)
+        return value
+
+class _Field:
+    '''Attribute of a `LazyVideo` read directly from one part of its source.'''
+    name: str
 
-    def link(self, short: bool = False) -> str:
-        if not short:
-            return F"https://www.youtube.com/watch?v={self.id}"
-        else:
-            return F"https://youtu.be/{self.id}"
+    def __init__(self, part: str, key: str, default: Any = None, required: bool = False):
+        self.part = part
+        self.key = key
+        self.default = default
+        self.required = required
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = name
+
+    def __get__(self, video: 'LazyVideo|None', owner: type|None = None) -> Any:
+        if video is None:
+            return self
+        part = video._source.get(self.part)
+        if not part:
+            if self.required: # as if never assigned on Video
+                raise AttributeError(self.name)
+            return None
+        return part.get(self.key, self.default)
+
+def _lazy_content_details(source: dict[str, Any]) -> dict[str, Any]|None:
+    if source.get('kind') != 'youtube#playlistItem':
+        return source.get('contentDetails') or None
+    return None
+
+def _lazy_published_at(source: dict[str, Any]) -> datetime:
+    if not (snippet := source.get('snippet')):
+        raise AttributeError('published_at')
+    return yt_date(snippet.get('publishedAt'))
+
+def _lazy_int(part: str, key: str) -> Callable[[dict[str, Any]], int|None]:
+    def decode(source: dict[str, Any]) -> int|None:
+        value = (source.get(part) or {}).get(key)
+        return int(value) if value else None
+    return decode
+
+class LazyVideo(_VideoMethods):
+    '''
+    Compact alternative to `Video`, with the same attributes.
+    Keeps the source resource and decodes each attribute when first read.
+    '''
+    __slots__ = (
+        '_youtube', '_source', 'id',
+        '_published_at', '_thumbnails', '_duration', '_content_details',
+        '_status_details', '_view_count', '_like_count', '_comment_count',
+        '_livestream_details', '_recorded_at', '_file_details',
+        '_processing_details', '_localizations',
+    )
+    _source: dict[str, Any]
 
-    def comments(self, limit: int | None = 100) -> AsyncLazy[Comment]:
-        return self._youtube.comments(self.id, limit=limit)
+    def __init__(self, source: dict[str, Any], yt: 'YouTubeData'):
+        self._youtube = yt
+        self._source = source
+        self.id = _video_id(source)
 
-    async def channel(self) -> 'Channel':
-        return await self._youtube.channel(self.channel_id)
+    # part: snippet
+    title = _Field('snippet', 'title', required=True)
+    description = _Field('snippet', 'description', required=True)
+    channel_id = _Field('snippet', 'channelId', required=True)
+    channel_name = _Field('snippet', 'channelTitle', required=True)
+    tags = _Field('snippet', 'tags', [], required=True)
+    default_audio_language = _Field('snippet', 'defaultAudioLanguage')
+
+    @property
+    def is_livestream(self) -> bool:
+        if not (snippet := self._source.get('snippet')):
+            raise AttributeError('is_livestream')
+        return snippet.get('liveBroadcastContent') == 'live'
+
+    published_at = _Decoded(_lazy_published_at)
+    thumbnails = _Decoded(lambda s:
+        [x.get("url") for x in s['snippet'].get("thumbnails", {}).values()] if s.get('snippet') else None)
+
+    @property
+    def localized_title(self) -> str|None:
+        return (self._source.get('snippet') or {}).get('localized', {}).get('title')
+
+    @property
+    def localized_description(self) -> str|None:
+        return (self._source.get('snippet') or {}).get('localized', {}).get('description')
+
+    # part: contentDetails
+    duration = _Decoded(lambda s: _duration(d) if (d := _lazy_content_details(s)) else None)
+    content_details = _Decoded(lambda s:
+        _content_details(d, _duration(d)) if (d := _lazy_content_details(s)) else None)
+
+    # part: status
+    @property
+    def privacy(self) -> PrivacyStatus|None:
+        return (self._source.get('status') or {}).get('privacyStatus')
+
+    status_details = _Decoded(lambda s: _status_details(d) if (d := s.get('status')) else None)
+
+    # part: statistics
+    view_count = _Decoded(_lazy_int('statistics', 'viewCount'))
+    like_count = _Decoded(_lazy_int('statistics', 'likeCount'))
+    comment_count = _Decoded(_lazy_int('statistics', 'commentCount'))
+
+    # part: liveStreamingDetails
+    livestream_details = _Decoded(lambda s:
+        _livestream_details(d) if (d := s.get('liveStreamingDetails')) else None)
+
+    # part: topicDetails
+    @property
+    def topic_categories(self) -> list[str]|None:
+        return (self._source.get('topicDetails') or {}).get('topicCategories')
+
+    # part: localizations
+    localizations = _Decoded(lambda s: _localizations(d) if (d := s.get('localizations')) else None)
+
+    # part: recordingDetails
+    recorded_at = _Decoded(lambda s:
+        yt_date_or_none((s.get('recordingDetails') or {}).get('recordingDate')))
+
+    # part: fileDetails
+    file_details = _Decoded(lambda s: _file_details(d) if (d := s.get('fileDetails')) else None)
+
+    # part: processingDetails
+    processing_details = _Decoded(lambda s:
+        _processing_details(d) if (d := s.get('processingDetails')) else None)
+
+    def to_dict(self) -> dict[str, Any]:
+        '''
+        Returns a dictionary representation of the Video object.
+        '''
+        public_obj: dict[str, Any] = {}
+        for name in _VIDEO_ATTRIBUTES:
+            try:
+                public_obj[name] = getattr(self, name)
+            except AttributeError:
+                pass
+        return to_json(public_obj)
+
+_VIDEO_ATTRIBUTES = [
+    name for name in Video.__annotations__ if not name.startswith('_')
+]
 
 class Playlist:
     _youtube: 'YouTubeData'
@@ -494,31 +825,412 @@ class Channel:
     def videos(self, limit: int|None=None, mine: bool|None=None) -> AsyncLazy[Video]:
         return self._youtube.search_videos(channel_id=self.id, limit=limit, mine=mine)
 
+# attributes of Video and Channel that can be requested by name, without the rest
+VIDEO_FIELDS: dict[str, Field] = {
+    'title':                    Field('snippet/title'),
+    'description':              Field('snippet/description'),
+    'published_at':             Field('snippet/publishedAt', yt_date),
+    'channel_id':               Field('snippet/channelId'),
+    'channel_name':             Field('snippet/channelTitle'),
+    'tags':                     Field('snippet/tags'),
+    'is_livestream':            Field('snippet/liveBroadcastContent', lambda v: v == 'live'),
+    'default_audio_language':   Field('snippet/defaultAudioLanguage'),
+    'thumbnails':               Field('snippet/thumbnails', lambda v: [x.get('url') for x in v.values()]),
+    'localized_title':          Field('snippet/localized/title'),
+    'localized_description':    Field('snippet/localized/description'),
+    'duration':                 Field('contentDetails/duration', yt_duration),
+    'content_details':          Field('contentDetails', lambda v: _content_details(v, _duration(v))),
+    'privacy':                  Field('status/privacyStatus'),
+    'status_details':           Field('status', _status_details),
+    'view_count':               Field('statistics/viewCount', int),
+    'like_count':               Field('statistics/likeCount', int),
+    'comment_count':            Field('statistics/commentCount', int),
+    'livestream_details':       Field('liveStreamingDetails', _livestream_details),
+    'topic_categories':         Field('topicDetails/topicCategories'),
+    'localizations':            Field('localizations', _localizations),
+    'recorded_at':              Field('recordingDetails/recordingDate', yt_date),
+    'file_details':             Field('fileDetails', _file_details),
+    'processing_details':       Field('processingDetails', _processing_details),
+}
+
+CHANNEL_FIELDS: dict[str, Field] = {
+    'display_name':         Field('snippet/title'),
+    'description':          Field('snippet/description'),
+    'created_at':           Field('snippet/publishedAt', yt_date),
+    'at_username':          Field('snippet/customUrl'),
+    'profile_image_url':    Field('snippet/thumbnails/default/url'),
+    'uploads_playlist':     Field('contentDetails/relatedPlaylists/uploads', Playlist, with_youtube=True),
+    'view_count':           Field('statistics/viewCount', int),
+    'subscriber_count':     Field('statistics/subscriberCount', int),
+    'video_count':          Field('statistics/videoCount', int),
+}
+
 class YouTubeData(WebAPI):
     base_url = 'https://www.googleapis.com/youtube/v3'
-
-    def __init__(self, app_or_api_key: str|OAuth2|UrlApiKey) -> None:
+    # default number of 50-ID requests in flight for videos() and channels()
+    concurrency: int = 1
+    # decode the items of each page as they arrive, instead of the whole page at once.
+    # such requests are not cached or coalesced.
+    stream_pages: bool
+    quota: QuotaScheduler|None
+    cache: ResponseCache|None
+    # seconds to collect concurrent video() and channel() calls into one request
+    batch_window: float|None
+    session_config: SessionConfig
+    instrument: Instrument|None
+    retry: RetryPolicy|None
+    rate_limit: RateLimiter|None
+    breaker: CircuitBreaker|None
+    # requests sent again after failing
+    retries: int
+    _flights: SingleFlight[Any, JsonMap]|None
+    _batchers: dict[tuple[str, frozenset[Part]], MicroBatcher[str, Any]]
+
+    def __init__(self, app_or_api_key: str|OAuth2|UrlApiKey|CredentialPool,
+        quota: QuotaScheduler|None=None,
+        cache: ResponseCache|None=None,
+        coalesce: bool=False,
+        batch_window: float|None=None,
+        session: SessionConfig|None=None,
+        instrument: Instrument|None=None,
+        retry: RetryPolicy|None=None,
+        rate_limit: RateLimiter|None=None,
+        breaker: CircuitBreaker|None=None,
+        stream_pages: bool=False) -> None:
+        '''
+        If `coalesce`, concurrent identical GET requests share one response.
+        If `batch_window` is set, concurrent `video` and `channel` calls
+        within that many seconds are requested together, 50 IDs at a time.
+        `session` configures the connection pool shared by all requests.
+        Use the client as an async context manager to close the pool on exit.
+        `instrument` receives timings and sizes of each page and list call,
+        such as a `HistogramRecorder`.
+        Failed requests are sent again according to `retry`, including
+        pages in the middle of paginated results, which continue from the
+        failed page. `rate_limit` spaces requests to each endpoint, and
+        `breaker` stops requests once the quota is exceeded.
+        If `stream_pages`, list responses are decoded one item at a time as
+        they arrive, instead of a whole page at once.
+        '''
         match app_or_api_key:
             case str():
                 auth = UrlApiKey('key', app_or_api_key)
             case _:
                 auth = app_or_api_key
         super().__init__(auth)
+        self.quota = quota
+        self.cache = cache
+        self.batch_window = batch_window
+        self.session_config = session or SessionConfig()
+        self.instrument = instrument
+        self.retry = retry
+        self.rate_limit = rate_limit
+        self.breaker = breaker
+        self.stream_pages = stream_pages
+        self.retries = 0
+        self._flights = SingleFlight() if coalesce else None
+        self._batchers = {}
+
+    @property
+    def _client(self) -> ClientSession:
+        if self._maybe_client is None:
+            self._maybe_client = self.session_config.session()
+            # closed when this client is, if not closed explicitly
+            (_, self._client_close_context) = unmanage_async_context(self._maybe_client)
+        return self._maybe_client
+
+    async def __aenter__(self) -> 'YouTubeData':
+        self._client # open the session in this event loop
+        return self
+
+    async def __aexit__(self, *_: Any):
+        await self.close()
+
+    async def close(self):
+        '''Close the HTTP session and its connections. Later requests open a new one.'''
+        if self._maybe_client is not None:
+            session, self._maybe_client = self._maybe_client, None
+            self._client_close_context.set()
+            del self._client_close_context
+            await session.close()
+
+    @asynccontextmanager
+    async def _send(self, request: Request, page: PageEvent|None=None) -> AsyncIterator[ClientResponse]:
+        if page is None and self.instrument is not None:
+            page = _page.get()
+        async with await self._attempts(request, page) as resp:
+            yield resp
+
+    async def _attempts(self, request: Request, page: PageEvent|None) -> ClientResponse:
+        '''Send a request, retrying by `retry`, until it succeeds or fails for good.'''
+        endpoint = request.url
+        failures = 0
+        while True:
+            trial = self.breaker.check(endpoint) if self.breaker is not None else False
+            try:
+                if page is not None:
+                    page.requests += 1
+                    page.units += endpoint_cost(endpoint)
+                    page.params_size += len(urlencode(request.query_params))
+                if self.quota is not None or self.rate_limit is not None:
+                    start = perf_counter()
+                    if self.rate_limit is not None:
+                        await self.rate_limit.acquire(endpoint)
+                    if self.quota is not None:
+                        await self.quota.acquire(endpoint)
+                    if page is not None:
+                        page.queued += perf_counter() - start
+                # signed as a copy, since each attempt may use a different credential
+                signed = await self.auth.sign(self._client, replace(request,
+                    url=self.get_full_url(endpoint),
+                    query_params=dict(request.query_params),
+                    headers=dict(request.headers)))
+                try:
+                    resp = await signed.send(self._client)
+                    if resp.status >= 400:
+                        async with resp:
+                            raise await ApiError.from_resposnse(resp)
+                except (ApiError, ClientError, asyncio.TimeoutError) as e:
+                    if isinstance(self.auth, CredentialPool) and self.auth.failover(e):
+                        continue
+                    if self.breaker is not None:
+                        self.breaker.failure(e)
+                    failures += 1
+                    if self.retry is None or failures >= self.retry.attempts or not self.retry.retryable(e):
+                        raise
+                    self.retries += 1
+                    await self.retry.sleep(self.retry.delay(failures, e))
+                    continue
+                if self.breaker is not None:
+                    self.breaker.success()
+                return resp
+            finally:
+                # a trial which neither succeeded nor failed, such as when cancelled
+                if trial:
+                    self.breaker.release() # type: ignore ## trial implies a breaker
+
+    async def _base_request(self, request: Request) -> str|None:
+        page = _page.get() if self.instrument is not None else None
+        if page is not None:
+            start, queued = perf_counter(), page.queued
+        async with self._send(request) as resp:
+            if resp.status in (204, 304): # no content or not modified
+                text = None
+            else:
+                text = await resp.text()
+            if page is not None:
+                page.bytes += len(await resp.read()) # read by text() already
+                page.latency += perf_counter() - start - (page.queued - queued)
+        return text
+
+    async def _json_request(self, req: Request) -> JsonMap:
+        return self._decode(await self._text_request(req))
+
+    def _decode(self, text: str) -> Any:
+        page = _page.get() if self.instrument is not None else None
+        if page is None:
+            return json_loads(text)
+        start = perf_counter()
+        body = json_loads(text)
+        page.decode += perf_counter() - start
+        return body
+
+    def paginated(self, path: str, params: ParamsDict, limit: int|None) -> AsyncLazy[JsonMap]:
+        if self.stream_pages:
+            return AsyncLazy(self._streamed_pages(path, params, limit))
+        return super().paginated(path, params, limit)
+
+    async def _streamed_pages(self, path: str, params: ParamsDict, limit: int|None
+        ) -> AsyncGenerator[JsonMap, None]:
+        params = dict(params)
+        count = 0
+        instrument = self.instrument
+        while True:
+            page: dict[str, Any] = {}
+            page_start = count
+            event = PageEvent(path) if instrument is not None else None
+            try:
+                start = perf_counter()
+                async with self._send(self._create_request(Method.GET, path, params, None, None), event) as resp:
+                    chunks = resp.content.iter_chunked(64 * 1024)
+                    if event is None:
+                        items = stream_items(chunks, page)
+                    else:
+                        # until the headers, then while waiting for each chunk
+                        event.latency += perf_counter() - start - event.queued
+                        items = _timed_decode(stream_items(_timed_chunks(chunks, event), page), event)
+                    async for item in items:
+                        count += 1
+                        yield item
+                        if limit is not None and count >= limit:
+                            return
+            finally:
+                if instrument is not None and event is not None:
+                    event.items = count - page_start
+                    self._report(instrument, event)
+            page_token = page.get('nextPageToken')
+            if count == page_start or not page_token:
+                return
+            params['pageToken'] = page_token
+
+    async def get_json(self, path: str, params: ParamsDict|None=None,
+        json: JsonMap|None=None, headers: dict[str, str]|None=None
+        ) -> JsonMap:
+        if self.instrument is not None:
+            return await self._instrumented_get_json(self.instrument, path, params, json, headers)
+        return await self._get_json(path, params, json, headers)
+
+    async def get_json_if_modified(self, path: str, params: ParamsDict|None=None,
+        etag: str|None=None) -> JsonMap|None:
+        '''
+        GET with `If-None-Match: etag`, or None if the server answers 304
+        Not Modified. For callers which keep the previous response
+        themselves: it is not cached, or shared with concurrent requests.
+        '''
+        request = self._create_request(Method.GET, path, params, None,
+            { 'If-None-Match': etag } if etag else None)
+        if self.instrument is None:
+            text = await self._base_request(request)
+            return None if text is None else self._decode(text)
+        page = PageEvent(path)
+        token = _page.set(page)
+        try:
+            text = await self._base_request(request)
+            body = None if text is None else self._decode(text)
+        finally:
+            _page.reset(token)
+        items = body.get('items') if body is not None else None
+        page.items = len(items) if isinstance(items, list) else 0
+        self._report(self.instrument, page)
+        return body
+
+    async def _instrumented_get_json(self, instrument: Instrument, path: str, params: ParamsDict|None,
+        json: JsonMap|None, headers: dict[str, str]|None) -> JsonMap:
+        page = PageEvent(path)
+        token = _page.set(page)
+        try:
+            body = await self._get_json(path, params, json, headers)
+        finally:
+            _page.reset(token)
+        items = body.get('items')
+        page.items = len(items) if isinstance(items, list) else 0
+        self._report(instrument, page)
+        return body
+
+    def _report(self, instrument: Instrument, page: PageEvent):
+        instrument.page(page)
+        if (call := _call.get()) is not None:
+            call.add(page)
+
+    async def _get_json(self, path: str, params: ParamsDict|None=None,
+        json: JsonMap|None=None, headers: dict[str, str]|None=None
+        ) -> JsonMap:
+        if self._flights is not None and json is None and headers is None:
+            key = request_key(path, self._convert_parameters(params or {}))
+            return await self._flights.do(key, lambda: self._cached_get_json(path, params))
+        return await self._cached_get_json(path, params, json, headers)
+
+    async def _cached_get_json(self, path: str, params: ParamsDict|None=None,
+        json: JsonMap|None=None, headers: dict[str, str]|None=None
+        ) -> JsonMap:
+        cache = self.cache
+        key = cache.key(path, self._convert_parameters(params or {})) if cache else None
+        if cache is None or key is None or json is not None:
+            return await super().get_json(path, params, json, headers)
+        entry = cache.get(key)
+        if entry is not None and cache.is_fresh(path, entry):
+            cache.stats.hits += 1
+            return entry.body
+        if entry is not None and entry.etag is not None:
+            text = await self._base_request(self._create_request(
+                Method.GET, path, params, None,
+                (headers or {}) | { 'If-None-Match': entry.etag }
+            ))
+            if text is None:
+                cache.stats.revalidated += 1
+                cache.touch(key)
+                return entry.body
+            body = self._decode(text)
+        else:
+            body = await super().get_json(path, params, None, headers)
+        cache.stats.misses += 1
+        cache.store(key, body)
+        return body
+
+    def _traced(self, name: str, path: str, sources: AsyncLazy[Any], make: Callable[[Any], T]) -> AsyncLazy[T]:
+        '''Items of a list call, built by `make`. If instrumented, reported as a `CallEvent`.'''
+        if self.instrument is None:
+            return sources.map(make)
+        return AsyncLazy(self._traced_items(self.instrument, CallEvent(name, path), sources, make))
+
+    async def _traced_items(self, instrument: Instrument, call: CallEvent,
+        sources: AsyncLazy[Any], make: Callable[[Any], T]) -> AsyncGenerator[T, None]:
+        sources_iter = aiter(sources)
+        start = perf_counter()
+        try:
+            while True:
+                # only while requesting and decoding: pages requested meanwhile belong to the caller
+                token = _call.set(call)
+                try:
+                    source = await anext(sources_iter)
+                except StopAsyncIteration:
+                    return
+                finally:
+                    _call.reset(token)
+                parse_start = perf_counter()
+                item = make(source)
+                call.parse += perf_counter() - parse_start
+                call.items += 1
+                yield item
+        finally:
+            token = _call.set(call)
+            try:
+                await sources_iter.aclose()
+            finally:
+                _call.reset(token)
+            call.seconds = perf_counter() - start
+            instrument.call(call)
+
+    def make_video(self, source: JsonMap, lazy: bool=False) -> Video:
+        '''A `Video`, or `LazyVideo` if `lazy`, from a resource returned by the API.'''
+        if lazy:
+            return LazyVideo(source, self) # type: ignore ## same attributes as Video
+        return Video(source, self)
 
     async def my_channel(self, parts: Part=Part.SNIPPET) -> Channel:
-        return (await self._channels_list(mine=True, parts=parts, limit=1))[0]
+        return _first(await self._channels_list(mine=True, parts=parts, limit=1), 'Channel', 'mine')
+
+    async def channels(self, channel_ids: list[str], parts: Part, concurrency: int|None=None,
+        fields: Iterable[str]|None=None) -> list[Channel]:
+        '''Get channels by ID, 50 per request. Repeated IDs are requested once.
+        If `fields` names attributes of `Channel` (see `CHANNEL_FIELDS`),
+        only those are requested and set, and `parts` is ignored.
+        '''
+        return await self.iter_channels(channel_ids, parts, concurrency, fields=fields)
 
-    async def channels(self, channel_ids: list[str], parts: Part) -> list[Channel]:
-        return await self._channels_list(channel_ids=channel_ids, parts=parts)
+    def iter_channels(self,
+        channel_ids: list[str],
+        parts: Part|set[Part]=Part.SNIPPET,
+        concurrency: int|None=None,
+        ordered: bool=True,
+        fields: Iterable[str]|None=None) -> AsyncLazy[Channel]:
+        '''Like `channels`, but yields each channel as its page arrives,
+        in the order of `channel_ids`, or as each request completes if not
+        `ordered`.
+        '''
+        return self._channels_list(channel_ids=channel_ids, parts=parts, concurrency=concurrency,
+            ordered=ordered, fields=fields)
 
     async def channel(self, channel_id: str, parts: Part=Part.SNIPPET) -> Channel:
-        return (await self._channels_list(channel_ids=[channel_id], parts=parts))[0]
+        if self.batch_window is not None:
+            return await self._batched('/channels', channel_id, parts)
+        return _first(await self._channels_list(channel_ids=[channel_id], parts=parts), 'Channel', channel_id)
     
     async def channel_by_handle(self, handle: str, parts: Part=Part.SNIPPET) -> Channel:
-        return (await self._channels_list(handle=handle, parts=parts))[0]
+        return _first(await self._channels_list(handle=handle, parts=parts), 'Channel', F"@{handle}")
     
     async def channel_by_username(self, username: str, parts: Part=Part.SNIPPET) -> Channel:
-        return (await self._channels_list(username=username, parts=parts))[0]
+        return _first(await self._channels_list(username=username, parts=parts), 'Channel', username)
     
     async def channel_by_url(self, url: str, parts: Part=Part.SNIPPET) -> Channel:
         m = RE_CHANNEL_URL.match(url)
@@ -538,7 +1250,10 @@ class YouTubeData(WebAPI):
         mine: bool=False,
         my_managed: bool=False,
         parts: Part|set[Part]=Part.SNIPPET,
-        limit: int|None=None) -> AsyncLazy[Channel]:
+        limit: int|None=None,
+        concurrency: int|None=None,
+        ordered: bool=True,
+        fields: Iterable[str]|None=None) -> AsyncLazy[Channel]:
         maxResults = min(50, limit) if limit else None # per-page limit
         allowed = {
             # TODO: auditDetails, brandingSettings, contentOwnerDetails
@@ -551,17 +1266,21 @@ class YouTubeData(WebAPI):
             Part.TOPIC_CATEGORIES
         }
         params: ParamsDict = { 'part': parts.intersection(allowed), 'maxResults': maxResults }
-        if channel_ids:
-            channel_ids = list(set(channel_ids or [])) # deduplicate IDs
+        make: Callable[[JsonMap], Channel] = lambda r: Channel(r, self)
+        if fields is not None:
+            projection = Projection(Channel, CHANNEL_FIELDS, fields)
+            params |= { 'part': projection.parts, 'fields': projection.expression }
+            make = lambda r: projection.build(r, self)
+        if channel_ids is not None:
+            channel_ids = list(dict.fromkeys(channel_ids)) # deduplicate IDs, keeping order
             channels_chunks50 = [
                 channel_ids[i: i + 50] for i in range(0, len(channel_ids), 50)
             ]
-            async def page_chunks():
-                for ids in channels_chunks50:
-                    p = params | { 'id': ','.join(ids) }
-                    async for c in self.paginated('/channels', p, limit):
-                        yield c
-            return AsyncLazy(page_chunks()).map(lambda r: Channel(r, self))
+            def fetch(ids: list[str]) -> AsyncLazy[JsonMap]:
+                return self.paginated('/channels', params | { 'id': ','.join(ids) }, limit)
+            return self._traced('channels', '/channels', AsyncLazy(_fetch_chunks(
+                channels_chunks50, fetch, concurrency or self.concurrency, ordered
+                )), make)
         else:
             if mine:
                 filter = { 'mine': True }
@@ -571,63 +1290,183 @@ class YouTubeData(WebAPI):
                 filter = { 'forHandle': handle, 'forUsername': username }
             else:
                 raise ValueError("One of `mine`, `my_managed`, `handle`, or `username` must be specified")
-            return self.paginated(
+            return self._traced('channels', '/channels', self.paginated(
                 '/channels', params | filter, limit
-                ).map(lambda r: Channel(r, self))
+                ), make)
 
     def videos(self,
         video_ids: list[str],
-        parts: Part|set[Part]={Part.ID,Part.SNIPPET}) -> AsyncLazy[Video]:
-        parts = parts.intersection(Part.ALL_PUBLIC())
-        async def x():
-            current = 0
-            while current < len(video_ids):
-                params: ParamsDict = {
-                    'part': parts,
-                    'id': ','.join(video_ids[current:current+50]),
-                    'maxResults': 50
-                }
-                async for v in self.paginated(
-                    '/videos', params, None
-                    ).map(lambda r: Video(r, self)):
-                    yield v
-                current += 50
-        return AsyncLazy(x())
+        parts: Part|set[Part]={Part.ID,Part.SNIPPET},
+        concurrency: int|None=None,
+        ordered: bool=True,
+        lazy: bool=False,
+        fields: Iterable[str]|None=None,
+        executor: Executor|None=None) -> AsyncLazy[Video]:
+        '''Get videos by ID, 50 per request. Repeated IDs are requested once.
+        Up to `concurrency` requests are in flight at once, defaulting to
+        `YouTubeData.concurrency`. Videos are yielded in the order of
+        `video_ids`, or as each request completes if not `ordered`.
+        If `lazy`, yields `LazyVideo` instead, which decodes attributes on use.
+        If `fields` names attributes of `Video` (see `VIDEO_FIELDS`), only
+        those are requested and set, and `parts` is ignored. It cannot be
+        combined with `lazy`.
+        If `executor` is given, such as a `ProcessPoolExecutor`, pages are
+        decoded there instead of on the event loop, always in order.
+        It cannot be combined with `lazy` or `fields`, and its requests are
+        not cached or coalesced.
+        '''
+        if lazy and fields is not None:
+            raise ValueError("fields cannot be used with lazy")
+        video_ids = list(dict.fromkeys(video_ids)) # deduplicate IDs, keeping order
+        params: ParamsDict = { 'part': parts.intersection(Part.ALL_PUBLIC()), 'maxResults': 50 }
+        if executor is not None:
+            if lazy or fields is not None:
+                raise ValueError("An executor cannot be used with lazy or fields")
+            chunks = (
+                params | { 'id': ','.join(video_ids[i: i + 50]) } for i in range(0, len(video_ids), 50)
+            )
+            return self._traced('videos', '/videos', AsyncLazy(self._pooled_videos(
+                '/videos', chunks, False, executor, concurrency or self.concurrency, None)), _decoded)
+        make: Callable[[JsonMap], Video] = lambda r: self.make_video(r, lazy)
+        if fields is not None:
+            projection = Projection(Video, VIDEO_FIELDS, fields)
+            params |= { 'part': projection.parts, 'fields': projection.expression }
+            make = lambda r: projection.build(r, self)
+        def fetch(ids: list[str]) -> AsyncLazy[JsonMap]:
+            return self.paginated('/videos', params | { 'id': ','.join(ids) }, None)
+        chunks50 = (video_ids[i: i + 50] for i in range(0, len(video_ids), 50))
+        return self._traced('videos', '/videos', AsyncLazy(_fetch_chunks(
+            chunks50, fetch, concurrency or self.concurrency, ordered
+            )), make)
 
     async def video(self, id: str, parts: Part|set[Part]={Part.ID,Part.SNIPPET}) -> Video:
-        return (await self.videos([id], parts))[0]
+        if self.batch_window is not None:
+            return await self._batched('/videos', id, parts)
+        return _first(await self.videos([id], parts), 'Video', id)
+
+    async def _batched(self, endpoint: str, id: str, parts: Part|set[Part]) -> Any:
+        # one batcher per endpoint and parts, since only those can share a request
+        parts = frozenset(parts.intersection(set(Part)))
+        batcher = self._batchers.get((endpoint, parts))
+        if batcher is None:
+            async def fetch(ids: list[str]) -> dict[str, Any]:
+                if endpoint == '/videos':
+                    found = await self.videos(ids, set(parts))
+                else:
+                    found = await self._channels_list(channel_ids=ids, parts=set(parts))
+                return { item.id: item for item in found }
+            batcher = MicroBatcher(fetch, self.batch_window or 0.0)
+            self._batchers[(endpoint, parts)] = batcher
+        item = await batcher.get(id)
+        if item is None:
+            raise ResourceNotFound(endpoint[1:-1].capitalize(), id)
+        return item
 
     def get_playlist_videos(self,
         playlist_id: str, 
         parts: Part|set[Part]={Part.SNIPPET, Part.DETAILS},
-        limit: int|None=None) -> AsyncLazy[Video]:
+        limit: int|None=None,
+        lazy: bool=False,
+        executor: Executor|None=None) -> AsyncLazy[Video]:
+        '''Get the videos in a playlist, in order.
+        If `executor` is given, such as a `ProcessPoolExecutor`, pages are
+        decoded there instead of on the event loop, while the next page is
+        requested. It cannot be combined with `lazy`, and its requests are
+        not cached or coalesced.
+        '''
         params: ParamsDict = {
             'part': parts.intersection(
                 {Part.ID, Part.SNIPPET, Part.STATUS, Part.DETAILS}),
             'playlistId': playlist_id,
             'maxResults': min(50, limit) if limit else None,
         }
-        return self.paginated(
+        if executor is not None:
+            if lazy:
+                raise ValueError("An executor cannot be used with lazy")
+            return self._traced('get_playlist_videos', '/playlistItems', AsyncLazy(
+                self._pooled_videos('/playlistItems', [params], True, executor, 1, limit)), _decoded)
+        return self._traced('get_playlist_videos', '/playlistItems', self.paginated(
             '/playlistItems', params, limit
-            ).map(lambda r: Video(r, self))
-
-    def search_videos(self,
+            ), lambda r: self.make_video(r, lazy))
+
+    async def _pooled_videos(self,
+        path: str,
+        pages: Iterable[ParamsDict],
+        follow: bool,
+        executor: Executor,
+        prefetch: int,
+        limit: int|None) -> AsyncGenerator[Video, None]:
+        '''
+        Request `pages`, following next page tokens if `follow`, and decode
+        them with `decode_videos` in `executor`. Up to `prefetch` pages are
+        requested ahead of the one being decoded; when following, the next
+        page is requested as soon as its token is found in the text.
+        The text is needed undecoded, so the requests bypass `cache` and
+        `coalesce`, which hold decoded responses; quota, rate limits, retries
+        and the circuit breaker still apply.
+        '''
+        loop = asyncio.get_running_loop()
+        instrument = self.instrument
+        async def fetch(params: ParamsDict) -> tuple[ParamsDict, str, PageEvent|None]:
+            event = None
+            if instrument is not None:
+                event = PageEvent(path)
+                _page.set(event) # in this task only
+            text = await self._base_request(self._create_request(Method.GET, path, params))
+            return params, text or '{}', event
+        def request(params: ParamsDict) -> 'asyncio.Future[tuple[ParamsDict, str, PageEvent|None]]':
+            return asyncio.ensure_future(fetch(params))
+
+        remaining = iter(pages)
+        in_flight: deque[asyncio.Future[tuple[ParamsDict, str, PageEvent|None]]] = deque(
+            request(params) for params in itertools.islice(remaining, max(1, prefetch)))
+        count = 0
+        try:
+            while in_flight:
+                params, text, event = await in_flight.popleft()
+                peeked = None
+                if follow:
+                    if m := NEXT_PAGE_TOKEN.search(text):
+                        peeked = m.group(1)
+                        in_flight.append(request(params | { 'pageToken': peeked }))
+                elif (more := next(remaining, None)) is not None:
+                    in_flight.append(request(more))
+                start = perf_counter()
+                videos, page_token = await loop.run_in_executor(executor, decode_videos, text)
+                if instrument is not None and event is not None:
+                    event.decode = perf_counter() - start
+                    event.items = len(videos)
+                    self._report(instrument, event)
+                for video in videos:
+                    video._youtube = self
+                    yield video
+                    count += 1
+                    if limit is not None and count >= limit:
+                        return
+                if follow and not videos:
+                    return
+                if follow and page_token != peeked:
+                    # the token was not where expected, so the wrong page or none was requested
+                    for task in in_flight:
+                        task.cancel()
+                    in_flight.clear()
+                    if page_token:
+                        in_flight.append(request(params | { 'pageToken': page_token }))
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    def search_params(self,
         query: str|None=None,
         channel_id: str|None=None,
         after: datetime|None=None,
         before: datetime|None=None,
-        mine: bool|None=None, # authorized user's channel (via OAuth2)
+        mine: bool|None=None,
         order: Order=Order.RELEVANCE,
         safeSearch: SafeSearch=SafeSearch.MODERATE,
-        limit: int|None=50) -> AsyncLazy[Video]:
-        '''Search for videos matching the search parameters.
-        Defaults to 50 most relevant results.
-        The `after` parameter is inclusive, so include a small offset for only
-        videos published strictly after.
-        The `mine` parameter can be used instead of `channel_id` if authorized
-        by the channel owner via OAuth2.
-        '''
-        params: ParamsDict = {
+        limit: int|None=50) -> ParamsDict:
+        '''Parameters of a `/search` request for videos, as sent by `search_videos`.'''
+        return {
             'part': Part.SNIPPET,
             'safeSearch': safeSearch,
             'order': order,
@@ -640,9 +1479,27 @@ class YouTubeData(WebAPI):
             'maxResults': min(50, limit) if limit else None,
         }
 
-        return self.paginated(
+    def search_videos(self,
+        query: str|None=None,
+        channel_id: str|None=None,
+        after: datetime|None=None,
+        before: datetime|None=None,
+        mine: bool|None=None, # authorized user's channel (via OAuth2)
+        order: Order=Order.RELEVANCE,
+        safeSearch: SafeSearch=SafeSearch.MODERATE,
+        limit: int|None=50,
+        lazy: bool=False) -> AsyncLazy[Video]:
+        '''Search for videos matching the search parameters.
+        Defaults to 50 most relevant results.
+        The `after` parameter is inclusive, so include a small offset for only
+        videos published strictly after.
+        The `mine` parameter can be used instead of `channel_id` if authorized
+        by the channel owner via OAuth2.
+        '''
+        params = self.search_params(query, channel_id, after, before, mine, order, safeSearch, limit)
+        return self._traced('search_videos', '/search', self.paginated(
             '/search', params, limit
-            ).map(lambda r: Video(r, self))
+            ), lambda r: self.make_video(r, lazy))
 
     def comments(self,
         video_id: str,
@@ -657,7 +1514,7 @@ class YouTubeData(WebAPI):
             'videoId': video_id,
             'maxResults': min(100, limit) if limit else None,
         }
-        return self.paginated(
+        return self._traced('comments', '/commentThreads', self.paginated(
             '/commentThreads', params, limit
-            ) .map(Comment)
+            ), Comment)
     
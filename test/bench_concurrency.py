@@ -0,0 +1,30 @@
+'''
+Benchmark: videos() with sequential vs concurrent 50-ID chunk requests,
+against a local mock server with simulated network latency.
+
+    python test/bench_concurrency.py
+'''
+import asyncio, time
+from mock_youtube import MockYouTube
+
+LATENCY = 0.05
+ID_COUNTS = [500, 2_000, 5_000, 20_000]
+CONCURRENCY = [1, 4, 16]
+
+async def main():
+    async with MockYouTube(latency=LATENCY) as server:
+        yt = server.client()
+        print(F"latency per request: {LATENCY*1000:.0f}ms")
+        print(F"{'IDs':>8}" + ''.join(F"{F'c={c}':>12}" for c in CONCURRENCY) + F"{'speedup':>10}")
+        for count in ID_COUNTS:
+            ids = [F"vid{i}" for i in range(count)]
+            times: list[float] = []
+            for c in CONCURRENCY:
+                start = time.perf_counter()
+                videos = await yt.videos(ids, concurrency=c)
+                times.append(time.perf_counter() - start)
+                assert len(videos) == count
+            print(F"{count:>8}" + ''.join(F"{t:>11.2f}s" for t in times) + F"{times[0]/times[-1]:>9.1f}x")
+
+if __name__ == '__main__':
+    asyncio.run(main())
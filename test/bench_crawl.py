@@ -0,0 +1,47 @@
+'''
+Benchmark: Crawler throughput by number of worker processes, from channels
+to uploads, videos and comments, against a local mock server with
+simulated network latency. Each worker has a fixed number of requests in
+flight, so throughput grows with workers until the CPU is saturated.
+
+    python test/bench_crawl.py
+'''
+import asyncio, functools, multiprocessing, os, tempfile, time
+from SlyYTDAPI import YouTubeData, UrlApiKey
+from SlyYTDAPI.crawl import Crawler, TaskKind
+from mock_youtube import MockYouTube
+
+LATENCY = 0.1
+CHANNELS = 16
+UPLOADS = 25
+WORKERS = [1, 2, 4, 8]
+# leave interpreter start-up out of the measurement where possible
+START = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+
+def client(url: str) -> YouTubeData:
+    yt = YouTubeData(UrlApiKey('key', 'mock-api-key'))
+    yt.base_url = url
+    return yt
+
+async def main():
+    async with MockYouTube(latency=LATENCY, playlist_total=UPLOADS, comment_total=5) as server:
+        print(F"latency per request: {LATENCY*1000:.0f}ms, {CHANNELS} channels of {UPLOADS} uploads")
+        print(F"{'workers':>8}{'tasks':>8}{'requests':>10}{'time':>8}{'tasks/s':>10}{'speedup':>9}")
+        base: float|None = None
+        for workers in WORKERS:
+            with tempfile.TemporaryDirectory() as dir:
+                crawler = Crawler(os.path.join(dir, 'crawl.db'), functools.partial(client, server.url),
+                    workers=workers, start_method=START)
+                crawler.add(TaskKind.RESOLVE_CHANNEL, (F"@creator{i}" for i in range(CHANNELS)))
+                server.hits.clear()
+                start = time.perf_counter()
+                await crawler.run()
+                elapsed = time.perf_counter() - start
+                tasks = sum(crawler.counts().values())
+                crawler.close()
+            rate = tasks / elapsed
+            base = base or rate
+            print(F"{workers:>8}{tasks:>8}{sum(server.hits.values()):>10}{elapsed:>7.2f}s{rate:>10.0f}{rate/base:>8.1f}x")
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+'''
+Benchmark: videos() decoding on the event loop vs in a thread or process
+pool, for throughput and event loop responsiveness (the longest delay of a
+1ms timer running alongside). The server runs in another process and
+replays one prebuilt page, so that it is not the bottleneck.
+
+    python test/bench_executor.py
+'''
+import asyncio, json, multiprocessing, os, time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.connection import Connection
+from SlyYTDAPI import *
+from aiohttp import web # after *, which includes SlyAPI.web
+from mock_youtube import video_resource
+
+COUNT = 20_000
+PARTS = {Part.SNIPPET, Part.DETAILS, Part.STATISTICS, Part.STATUS, Part.LOCALIZATIONS}
+
+def serve(conn: Connection):
+    page = json.dumps({
+        'kind': 'youtube#videoListResponse',
+        'items': [video_resource(F"vid{i}", 2_000) for i in range(50)],
+    }).encode()
+    async def videos(_: web.Request) -> web.Response:
+        return web.Response(body=page, content_type='application/json')
+    async def run():
+        app = web.Application()
+        app.router.add_get('/videos', videos)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        conn.send(F"http://127.0.0.1:{runner.addresses[0][1]}")
+        await asyncio.get_running_loop().run_in_executor(None, conn.recv)
+    asyncio.run(run())
+
+async def measure(url: str, executor: Executor|None) -> tuple[float, float]:
+    lag = 0.0
+    running = True
+    async def ticker():
+        nonlocal lag
+        while running:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lag = max(lag, time.perf_counter() - start - 0.001)
+    async with YouTubeData(UrlApiKey('key', 'mock-api-key')) as yt:
+        yt.base_url = url
+        ids = [F"vid{i}" for i in range(COUNT)]
+        await yt.videos(ids[:50], PARTS, executor=executor) # warm up workers
+        tick = asyncio.ensure_future(ticker())
+        start = time.perf_counter()
+        count = 0
+        async for _ in yt.videos(ids, PARTS, executor=executor, concurrency=4):
+            count += 1
+        elapsed = time.perf_counter() - start
+        running = False
+        await tick
+        assert count == COUNT
+        return elapsed, lag
+
+async def main():
+    conn, child = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=serve, args=(child,), daemon=True)
+    server.start()
+    url = conn.recv()
+    cores = os.cpu_count() or 1
+    print(F"{COUNT} videos, {cores} cores")
+    print(F"{'decoding':<16}{'seconds':>9}{'videos/s':>10}{'max lag ms':>12}")
+    elapsed, lag = await measure(url, None)
+    print(F"{'event loop':<16}{elapsed:>9.2f}{COUNT/elapsed:>10.0f}{lag*1000:>12.1f}")
+    with ThreadPoolExecutor(4) as executor:
+        elapsed, lag = await measure(url, executor)
+        print(F"{'4 threads':<16}{elapsed:>9.2f}{COUNT/elapsed:>10.0f}{lag*1000:>12.1f}")
+    for workers in sorted({1, 2, 4, cores}):
+        with ProcessPoolExecutor(workers) as executor:
+            elapsed, lag = await measure(url, executor)
+            print(F"{F'{workers} processes':<16}{elapsed:>9.2f}{COUNT/elapsed:>10.0f}{lag*1000:>12.1f}")
+    conn.send('stop')
+    server.join()
+
+if __name__ == '__main__':
+    asyncio.run(main())
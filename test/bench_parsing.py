@@ -0,0 +1,42 @@
+'''
+Micro-benchmark: yt_date and yt_duration against the previous strptime and
+regex parsers, for unique values and for values repeated across a playlist.
+
+    python test/bench_parsing.py
+'''
+import timeit
+from SlyYTDAPI import yt_date, yt_duration
+from test_parsing import reference_date, reference_duration
+
+COUNT = 100_000
+
+def unique_dates() -> list[str]:
+    return [
+        F"20{10 + i % 14}-{i % 12 + 1:02}-{i % 28 + 1:02}T{i % 24:02}:{i % 60:02}:{i % 59:02}" + ('Z' if i % 2 else F".{i % 1000:03}Z")
+        for i in range(COUNT)
+    ]
+
+def unique_durations() -> list[str]:
+    return [F"PT{i // 3600 % 24}H{i // 60 % 60}M{i % 60}S" for i in range(COUNT)]
+
+def run(name: str, parse: object, values: list[str]):
+    seconds = timeit.timeit(lambda: [parse(v) for v in values], number=1) # type: ignore
+    print(F"{name:<40}{seconds / len(values) * 1e9:>8.0f} ns/value")
+
+def main():
+    dates, durations = unique_dates(), unique_durations()
+    repeated_dates = [dates[i % 50] for i in range(COUNT)]
+    repeated_durations = [durations[i % 50] for i in range(COUNT)]
+    for parse in (yt_date, yt_duration):
+        parse.cache_clear()
+    run('strptime, unique', reference_date, dates)
+    run('yt_date, unique', yt_date, dates)
+    run('strptime, repeated', reference_date, repeated_dates)
+    run('yt_date, repeated', yt_date, repeated_dates)
+    run('duration regex, unique', reference_duration, durations)
+    run('yt_duration, unique', yt_duration, durations)
+    run('duration regex, repeated', reference_duration, repeated_durations)
+    run('yt_duration, repeated', yt_duration, repeated_durations)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+'''
+Benchmark: peak memory and time of videos() with whole-page vs streamed
+decoding, for 50-video pages with localizations and long descriptions.
+The mock server runs in another process, so only the client is traced.
+
+    python test/bench_streaming.py
+'''
+import asyncio, multiprocessing, time, tracemalloc
+from multiprocessing.connection import Connection
+from SlyYTDAPI import *
+from mock_youtube import MockYouTube
+
+COUNT = 1_000
+DESCRIPTION_SIZES = [1_000, 5_000, 20_000]
+PARTS = {Part.SNIPPET, Part.DETAILS, Part.STATISTICS, Part.STATUS, Part.LOCALIZATIONS}
+
+def serve(conn: Connection, description_size: int):
+    async def run():
+        async with MockYouTube(description_size=description_size) as server:
+            conn.send(server.url)
+            await asyncio.get_running_loop().run_in_executor(None, conn.recv)
+    asyncio.run(run())
+
+async def measure(url: str, stream: bool) -> tuple[float, float]:
+    async with YouTubeData(UrlApiKey('key', 'mock-api-key'), stream_pages=stream) as yt:
+        yt.base_url = url
+        ids = [F"vid{i}" for i in range(COUNT)]
+        async for _ in yt.videos(ids[:50], PARTS): pass # warm up
+        tracemalloc.start()
+        start = time.perf_counter()
+        # a consumer which keeps only a count, as when writing to a database
+        count = 0
+        async for _ in yt.videos(ids, PARTS):
+            count += 1
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert count == COUNT
+        return elapsed, peak
+
+async def main():
+    print(F"{COUNT} videos, 50 per page")
+    print(F"{'description':>12}{'whole MiB':>11}{'streamed MiB':>14}{'whole s':>9}{'streamed s':>12}")
+    for size in DESCRIPTION_SIZES:
+        conn, child = multiprocessing.Pipe()
+        server = multiprocessing.Process(target=serve, args=(child, size), daemon=True)
+        server.start()
+        url = conn.recv()
+        whole_time, whole_peak = await measure(url, False)
+        stream_time, stream_peak = await measure(url, True)
+        conn.send('stop')
+        server.join()
+        print(F"{size:>12}{whole_peak/2**20:>11.1f}{stream_peak/2**20:>14.1f}"
+            + F"{whole_time:>9.2f}{stream_time:>12.2f}")
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,59 @@
+'''
+Benchmark: requests/s, objects parsed/s, response bytes and peak memory for each YouTubeData
+list method, against a local mock server. Pass a latency in milliseconds to
+simulate the network (default 0). The server runs in the same process, so
+times include serving the responses.
+
+    python test/bench_suite.py [latency_ms]
+'''
+import asyncio, sys, time, tracemalloc
+from typing import Any, Awaitable, Callable
+from SlyYTDAPI import *
+from mock_youtube import MockYouTube
+
+COUNT = 2_000
+VIDEO_PARTS = {Part.SNIPPET, Part.DETAILS, Part.STATISTICS, Part.STATUS}
+
+def cases(yt: YouTubeData_WithMembers) -> dict[str, Callable[[], Awaitable[list[Any]]]]:
+    ids = [F"vid{i}" for i in range(COUNT)]
+    channel_ids = [F"UC{i}" for i in range(COUNT)]
+    return {
+        'videos':               lambda: yt.videos(ids, VIDEO_PARTS),
+        'videos (lazy)':        lambda: yt.videos(ids, VIDEO_PARTS, lazy=True),
+        'videos (c=8)':         lambda: yt.videos(ids, VIDEO_PARTS, concurrency=8),
+        'videos (fields)':      lambda: yt.videos(ids, fields=['view_count', 'like_count', 'comment_count']),
+        'channels':             lambda: yt.channels(channel_ids, {Part.SNIPPET, Part.STATISTICS}), # type: ignore
+        'get_playlist_videos':  lambda: yt.get_playlist_videos('PLbench', limit=COUNT),
+        'search_videos':        lambda: yt.search_videos('bench', limit=COUNT),
+        'comments':             lambda: yt.comments('vidbench', limit=COUNT),
+        'get_my_members':       lambda: yt.get_my_members(limit=COUNT),
+    }
+
+async def main():
+    latency = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.0
+    async with MockYouTube(latency=latency, search_total=COUNT, playlist_total=COUNT,
+        comment_total=COUNT, member_total=COUNT) as server:
+        yt = server.client(YouTubeData_WithMembers)
+        print(F"{COUNT} objects per method, latency per request: {latency*1000:.0f}ms")
+        print(F"{'method':<22}{'requests':>9}{'seconds':>9}{'req/s':>9}{'objects/s':>11}{'bytes/obj':>11}{'peak MiB':>10}")
+        for name, run in cases(yt).items():
+            await run() # warm up caches and connections
+            hits = sum(server.hits.values())
+            sent = sum(server.bytes_sent.values())
+            start = time.perf_counter()
+            objects = await run()
+            elapsed = time.perf_counter() - start
+            requests = sum(server.hits.values()) - hits
+            size = (sum(server.bytes_sent.values()) - sent) / len(objects)
+
+            # separately, since tracing slows everything down
+            tracemalloc.start()
+            await run()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(F"{name:<22}{requests:>9}{elapsed:>9.3f}{requests/elapsed:>9.0f}"
+                + F"{len(objects)/elapsed:>11.0f}{size:>11.0f}{peak/2**20:>10.1f}")
+
+if __name__ == '__main__':
+    asyncio.run(main())
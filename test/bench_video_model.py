@@ -0,0 +1,52 @@
+'''
+Benchmark: construction time and retained memory of Video vs LazyVideo,
+for fully populated video resources.
+
+    python test/bench_video_model.py
+'''
+import time, tracemalloc
+from typing import Any
+from SlyYTDAPI import Video, LazyVideo
+from mock_youtube import video_resource
+
+COUNT = 10_000
+
+def make_sources() -> list[dict[str, Any]]:
+    return [
+        video_resource(F"vid{i}") | {
+            'localizations': { lang: { 'title': F"title {lang}", 'description': F"description {lang}" } for lang in ('de', 'fr', 'ja') },
+            'liveStreamingDetails': { 'actualStartTime': '2023-01-01T00:00:00Z', 'actualEndTime': '2023-01-01T02:00:00.5Z', 'activeLiveChatId': 'chat' },
+        }
+        for i in range(COUNT)
+    ]
+
+def measure(model: Any, sources: list[dict[str, Any]], read: Any) -> tuple[float, float, int]:
+    start = time.perf_counter()
+    objects = [model(s, None) for s in sources]
+    built = time.perf_counter() - start
+    start = time.perf_counter()
+    for o in objects:
+        read(o)
+    used = time.perf_counter() - start
+    tracemalloc.start()
+    objects = [model(s, None) for s in sources]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return built, used, retained
+
+def main():
+    sources = make_sources()
+    reads = {
+        'id, title': lambda v: (v.id, v.title),
+        'all attributes': lambda v: v.to_dict(),
+    }
+    print(F"{COUNT} videos, sources allocated beforehand (not counted)")
+    print(F"{'model':<10}{'read':<16}{'construct':>11}{'read':>10}{'retained':>12}")
+    for name, read in reads.items():
+        for model in (Video, LazyVideo):
+            built, used, retained = measure(model, sources, read)
+            print(F"{model.__name__:<10}{name:<16}{built:>10.3f}s{used:>9.3f}s{retained/COUNT:>8.0f} B/obj")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,492 @@
+'''
+Local stand-in for the YouTube Data API, for offline tests and benchmarks.
+Resources are synthesized deterministically from the requested IDs.
+'''
+import asyncio
+import hashlib
+import json
+import os
+from collections import Counter
+from typing import Any, Callable, TypeVar
+from aiohttp import web
+from SlyYTDAPI import YouTubeData, UrlApiKey
+
+Y = TypeVar('Y', bound=YouTubeData)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+def load_fixture(name: str) -> Any:
+    'A recorded response or list of pages from `test/fixtures`.'
+    with open(os.path.join(FIXTURES, name), encoding='utf8') as f:
+        return json.load(f)
+
+def video_resource(video_id: str, description_size: int = 0) -> dict[str, Any]:
+    n = sum(map(ord, video_id))
+    description = F"Description of video {video_id}".ljust(description_size, '.')
+    return {
+        'kind': 'youtube#video',
+        'etag': F"etag-{video_id}",
+        'id': video_id,
+        'snippet': {
+            'publishedAt': F"2023-{n % 12 + 1:02}-{n % 28 + 1:02}T{n % 24:02}:{n % 60:02}:00Z",
+            'channelId': F"UC{video_id}",
+            'title': F"Video {video_id}",
+            'description': description,
+            'thumbnails': { 'default': { 'url': F"https://i.ytimg.com/vi/{video_id}/default.jpg" } },
+            'channelTitle': F"Channel {video_id}",
+            'tags': ['mock'],
+            'liveBroadcastContent': 'none',
+            'localized': { 'title': F"Video {video_id}", 'description': description },
+        },
+        'contentDetails': {
+            'duration': F"PT{n % 60}M{n % 59}S",
+            'dimension': '2d',
+            'definition': 'hd',
+            'caption': 'false',
+            'licensedContent': True,
+            'contentRating': {},
+            'projection': 'rectangular',
+        },
+        'status': {
+            'uploadStatus': 'processed',
+            'privacyStatus': 'public',
+            'license': 'youtube',
+            'embeddable': True,
+            'publicStatsViewable': True,
+            'madeForKids': False,
+        },
+        'statistics': {
+            'viewCount': str(n * 1000),
+            'likeCount': str(n * 10),
+            'commentCount': str(n),
+        },
+        'localizations': {
+            language: { 'title': F"Video {video_id} ({language})", 'description': F"({language}) {description}" }
+            for language in ('de', 'es', 'fr', 'ja')
+        },
+    }
+
+def channel_resource(channel_id: str) -> dict[str, Any]:
+    n = sum(map(ord, channel_id))
+    return {
+        'kind': 'youtube#channel',
+        'etag': F"etag-{channel_id}",
+        'id': channel_id,
+        'snippet': {
+            'title': F"Channel {channel_id}",
+            'description': F"Description of channel {channel_id}",
+            'customUrl': F"@channel{n}",
+            'publishedAt': '2015-06-01T12:00:00.5Z',
+            'thumbnails': { 'default': { 'url': F"https://yt3.ggpht.com/{channel_id}" } },
+        },
+        'contentDetails': { 'relatedPlaylists': { 'uploads': 'UU' + channel_id[2:] } },
+        'statistics': {
+            'viewCount': str(n * 1000),
+            'subscriberCount': str(n * 10),
+            'videoCount': str(n),
+            'hiddenSubscriberCount': False,
+        },
+    }
+
+def search_result(video_id: str) -> dict[str, Any]:
+    video = video_resource(video_id)
+    return {
+        'kind': 'youtube#searchResult',
+        'etag': video['etag'],
+        'id': { 'kind': 'youtube#video', 'videoId': video_id },
+        'snippet': video['snippet'],
+    }
+
+def playlist_item(playlist_id: str, index: int, video_id: str|None = None, added_at: str|None = None) -> dict[str, Any]:
+    video = video_resource(video_id or F"{playlist_id}-{index}")
+    if added_at is not None:
+        video['snippet']['publishedAt'] = added_at
+    return {
+        'kind': 'youtube#playlistItem',
+        'etag': F"etag-{playlist_id}-{index}",
+        'id': F"item-{playlist_id}-{index}",
+        'snippet': video['snippet'] | { 'playlistId': playlist_id, 'position': index },
+        'contentDetails': {
+            'videoId': video['id'],
+            'videoPublishedAt': video['snippet']['publishedAt'],
+        },
+    }
+
+def membership_resource(channel_id: str) -> dict[str, Any]:
+    return {
+        'kind': 'youtube#member',
+        'etag': F"etag-member-{channel_id}",
+        'snippet': {
+            'creatorChannelId': 'UCcreator',
+            'memberDetails': {
+                'channelId': channel_id,
+                'displayName': F"Member {channel_id}",
+                'profileImageUrl': F"https://yt3.ggpht.com/{channel_id}",
+            },
+            'membershipsDetails': {
+                'highestAccessibleLevel': 'level1',
+                'highestAccessibleLevelDisplayName': 'Level 1',
+                'accessibleLevels': ['level1'],
+            },
+            'membershipsDuration': { 'memberSince': '2023-01-01T00:00:00Z', 'memberTotalDurationMonths': 1 },
+            'membershipsDurationAtLevel': { 'memberSince': '2023-01-01T00:00:00Z', 'memberTotalDurationMonths': 1 },
+        },
+    }
+
+def comment_resource(comment_id: str, video_id: str, parent_id: str|None = None) -> dict[str, Any]:
+    n = sum(map(ord, comment_id))
+    snippet: dict[str, Any] = {
+        'channelId': F"UC{video_id}",
+        'videoId': video_id,
+        'textDisplay': F"Comment {comment_id}",
+        'textOriginal': F"Comment {comment_id}",
+        'authorDisplayName': F"@user{n % 1000}",
+        'authorProfileImageUrl': F"https://yt3.ggpht.com/user{n % 1000}",
+        'authorChannelUrl': F"http://www.youtube.com/@user{n % 1000}",
+        'authorChannelId': { 'value': F"UCuser{n % 1000}" },
+        'canRate': True,
+        'viewerRating': 'none',
+        'likeCount': n % 100,
+        'publishedAt': F"2023-{n % 12 + 1:02}-{n % 28 + 1:02}T{n % 24:02}:{n % 60:02}:00Z",
+        'updatedAt': F"2023-{n % 12 + 1:02}-{n % 28 + 1:02}T{n % 24:02}:{n % 60:02}:00Z",
+    }
+    if parent_id is not None:
+        snippet['parentId'] = parent_id
+    return { 'kind': 'youtube#comment', 'etag': F"etag-{comment_id}", 'id': comment_id, 'snippet': snippet }
+
+def comment_thread(video_id: str, index: int, reply_count: int) -> dict[str, Any]:
+    thread_id = F"{video_id}.c{index}"
+    return {
+        'kind': 'youtube#commentThread',
+        'etag': F"etag-{thread_id}",
+        'id': thread_id,
+        'snippet': {
+            'channelId': F"UC{video_id}",
+            'videoId': video_id,
+            'topLevelComment': comment_resource(thread_id, video_id),
+            'canReply': True,
+            'totalReplyCount': reply_count,
+            'isPublic': True,
+        },
+        # like the API, only some replies are included in the thread
+        'replies': { 'comments': [
+            comment_resource(F"{thread_id}.r{i}", video_id, thread_id)
+            for i in range(min(5, reply_count))
+        ] },
+    }
+
+def select_parts(resource: dict[str, Any], part: str) -> dict[str, Any]:
+    parts = set(part.split(','))
+    return {
+        k: v for k, v in resource.items()
+        if k in ('kind', 'etag', 'id') or k in parts
+    }
+
+def parse_fields(expression: str, start: int = 0) -> tuple[dict[str, Any], int]:
+    'A `fields` filter as a tree of names, with None for whole values.'
+    tree: dict[str, Any] = {}
+    i = start
+    while i < len(expression):
+        end = i
+        while end < len(expression) and expression[end] not in ',()':
+            end += 1
+        *parents, name = expression[i:end].split('/')
+        node = tree
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        i = end
+        if i < len(expression) and expression[i] == '(':
+            node[name], i = parse_fields(expression, i + 1)
+            i += 1 # closing parenthesis
+        else:
+            node[name] = None
+        if i < len(expression) and expression[i] == ')':
+            break
+        i += 1 # comma
+    return tree, i
+
+def select_fields(value: Any, tree: dict[str, Any]|None) -> Any:
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [select_fields(v, tree) for v in value]
+    return { k: select_fields(value[k], sub) for k, sub in tree.items() if k in value }
+
+class FakeClock:
+    '''A `clock` which stands still at `now` until it is set, or moved by a `FakeSleep`.'''
+    now: float
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+class FakeSleep:
+    '''
+    A `sleep` which returns at once, keeping the delays asked for in
+    `delays`. Each delay moves `clock` forward, if given, and then
+    `on_sleep` is called with the number of sleeps so far.
+    '''
+    delays: list[float]
+    clock: FakeClock|None
+    on_sleep: Callable[[int], None]|None
+
+    def __init__(self, clock: FakeClock|None = None, on_sleep: Callable[[int], None]|None = None):
+        self.delays = []
+        self.clock = clock
+        self.on_sleep = on_sleep
+
+    async def __call__(self, delay: float):
+        self.delays.append(delay)
+        if self.clock is not None:
+            self.clock.now += delay
+        if self.on_sleep is not None:
+            self.on_sleep(len(self.delays))
+
+class MockYouTube:
+    '''
+    Serves `/videos`, `/channels`, `/search`, `/playlistItems`,
+    `/commentThreads`, `/comments` and `/members` on a random local port.
+    IDs starting with "missing" are treated as private or deleted.
+    Searches match `search_total` videos and playlists have `playlist_total`
+    items, paged by `maxResults`, unless the playlist ID is a key of
+    `playlists`: then its items are those video IDs, added an hour apart
+    with the last one oldest.
+    Videos have `comment_total` comment threads of `reply_total` replies.
+    Pages have `page_size` items unless requested with `maxResults`.
+    Video descriptions are padded to `description_size` characters.
+    `/members` lists `member_total` members, or in updates mode returns the
+    pages of channel IDs appended to `member_pages` since the page token.
+    Paths in `recordings` replay those responses instead, such as from
+    `load_fixture`, with the page token as the index.
+    Every response is delayed by `latency` seconds, and carries an etag
+    which is answered with 304 Not Modified when sent as If-None-Match.
+    Responses are filtered by the `fields` parameter, and their sizes are
+    counted in `bytes_sent`. The address of each client connection is kept
+    in `peers`, and the most requests handled at once in `max_in_flight`.
+    Statuses queued in `faults` for a path are returned first, as errors,
+    with reason `backendError` or as given in a `(status, reason)` pair.
+    Counts in `views` are added to the view counts of those IDs.
+    Requests are counted by API key in `keys`, and those with a key in
+    `exhausted_keys` fail with `quotaExceeded`.
+    Channels looked up by `forHandle` or `forUsername` have the ID "UC"
+    followed by the name in lower case, and names starting with "invalid"
+    fail with 400.
+    '''
+    url: str
+    latency: float
+    page_size: int
+    description_size: int
+    search_total: int
+    playlist_total: int
+    comment_total: int
+    reply_total: int
+    member_total: int
+    playlists: dict[str, list[str]]
+    member_pages: list[list[str]]
+    recordings: dict[str, list[dict[str, Any]]]
+    faults: dict[str, list[int|tuple[int, str]]]
+    views: Counter[str]
+    keys: Counter[str]
+    exhausted_keys: set[str]
+    hits: Counter[str]
+    not_modified: Counter[str]
+    bytes_sent: Counter[str]
+    peers: set[Any]
+    in_flight: int
+    max_in_flight: int
+
+    def __init__(self, latency: float = 0.0, search_total: int = 20, playlist_total: int = 20,
+        comment_total: int = 20, reply_total: int = 0, member_total: int = 20, page_size: int = 5,
+        description_size: int = 0):
+        self.latency = latency
+        self.page_size = page_size
+        self.description_size = description_size
+        self.search_total = search_total
+        self.playlist_total = playlist_total
+        self.comment_total = comment_total
+        self.reply_total = reply_total
+        self.member_total = member_total
+        self.playlists = {}
+        self.member_pages = []
+        self.recordings = {}
+        self.faults = {}
+        self.views = Counter()
+        self.keys = Counter()
+        self.exhausted_keys = set()
+        self.hits = Counter()
+        self.not_modified = Counter()
+        self.bytes_sent = Counter()
+        self.peers = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._app = web.Application(middlewares=[self._replay])
+        self._app.router.add_get('/videos', self._by_id(lambda id: video_resource(id, self.description_size)))
+        self._app.router.add_get('/channels', self._by_id(channel_resource))
+        self._app.router.add_get('/search', self._search)
+        self._app.router.add_get('/playlistItems', self._playlist_items)
+        self._app.router.add_get('/commentThreads', self._comment_threads)
+        self._app.router.add_get('/comments', self._comments)
+        self._app.router.add_get('/members', self._members)
+
+    async def _respond(self, request: web.Request, body: dict[str, Any],
+        fault: tuple[int, str]|None = None) -> web.Response:
+        self.hits[request.path] += 1
+        if request.transport is not None:
+            self.peers.add(request.transport.get_extra_info('peername'))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        key = request.query.get('key', '')
+        self.keys[key] += 1
+        if key in self.exhausted_keys:
+            faults = [(403, 'quotaExceeded')]
+        elif fault is not None:
+            faults = [fault]
+        else:
+            faults = self.faults.get(request.path)
+        if faults:
+            fault = faults.pop(0)
+            status, reason = fault if isinstance(fault, tuple) else (fault, 'backendError')
+            return web.json_response({ 'error': {
+                'code': status, 'message': 'injected fault', 'errors': [{ 'reason': reason }]
+            } }, status=status)
+        etag = hashlib.md5(json.dumps(body, sort_keys=True).encode()).hexdigest()
+        if request.headers.get('If-None-Match') == etag:
+            self.not_modified[request.path] += 1
+            return web.Response(status=304)
+        body = { 'etag': etag } | body
+        if fields := request.query.get('fields'):
+            body = select_fields(body, parse_fields(fields)[0])
+        text = json.dumps(body)
+        self.bytes_sent[request.path] += len(text)
+        return web.Response(text=text, content_type='application/json')
+
+    async def _paged(self, request: web.Request, kind: str, total: int, make: Any) -> web.Response:
+        page_size = int(request.query.get('maxResults', self.page_size))
+        start = int(request.query.get('pageToken', 0))
+        end = min(start + page_size, total)
+        body: dict[str, Any] = {
+            'kind': kind,
+            'pageInfo': { 'totalResults': total, 'resultsPerPage': page_size },
+            'items': [make(i) for i in range(start, end)],
+        }
+        if end < total:
+            body['nextPageToken'] = str(end)
+        return await self._respond(request, body)
+
+    async def _search(self, request: web.Request) -> web.Response:
+        prefix = request.query.get('channelId') or request.query.get('q', '')
+        if request.query.get('order') != 'date' and 'publishedAfter' not in request.query \
+            and 'publishedBefore' not in request.query:
+            return await self._paged(request, 'youtube#searchListResponse',
+                self.search_total, lambda i: search_result(F"{prefix}-{i}"))
+        # timestamps in this format sort as strings
+        after = request.query.get('publishedAfter', '')
+        before = request.query.get('publishedBefore', '~')
+        results = [search_result(F"{prefix}-{i}") for i in range(self.search_total)]
+        results = [r for r in results if after <= r['snippet']['publishedAt'] < before]
+        if request.query.get('order') == 'date':
+            results.sort(key=lambda r: r['snippet']['publishedAt'], reverse=True)
+        return await self._paged(request, 'youtube#searchListResponse',
+            len(results), lambda i: results[i])
+
+    async def _playlist_items(self, request: web.Request) -> web.Response:
+        playlist_id = request.query['playlistId']
+        part = request.query.get('part', '')
+        if (video_ids := self.playlists.get(playlist_id)) is not None:
+            def make(i: int):
+                hours = len(video_ids) - i
+                added_at = F"2023-01-{1 + hours // 24:02}T{hours % 24:02}:00:00Z"
+                return select_parts(playlist_item(playlist_id, i, video_ids[i], added_at), part)
+            return await self._paged(request, 'youtube#playlistItemListResponse', len(video_ids), make)
+        return await self._paged(request, 'youtube#playlistItemListResponse',
+            self.playlist_total, lambda i: select_parts(playlist_item(playlist_id, i), part))
+
+    async def _comment_threads(self, request: web.Request) -> web.Response:
+        video_id = request.query['videoId']
+        part = request.query.get('part', '')
+        return await self._paged(request, 'youtube#commentThreadListResponse', self.comment_total,
+            lambda i: select_parts(comment_thread(video_id, i, self.reply_total), part))
+
+    async def _comments(self, request: web.Request) -> web.Response:
+        parent_id = request.query['parentId']
+        video_id = parent_id.rsplit('.c', 1)[0]
+        return await self._paged(request, 'youtube#commentListResponse', self.reply_total,
+            lambda i: comment_resource(F"{parent_id}.r{i}", video_id, parent_id))
+
+    async def _members(self, request: web.Request) -> web.Response:
+        if request.query.get('mode') != 'updates':
+            return await self._paged(request, 'youtube#memberListResponse', self.member_total,
+                lambda i: membership_resource(F"UCmember{i}"))
+        # page tokens are the index of the next page in member_pages
+        token = request.query.get('pageToken')
+        start = len(self.member_pages) if token is None else int(token)
+        items = [
+            membership_resource(channel_id)
+            for page in self.member_pages[start:] for channel_id in page
+        ]
+        return await self._respond(request, {
+            'kind': 'youtube#memberListResponse',
+            'nextPageToken': str(len(self.member_pages)),
+            'pageInfo': { 'totalResults': len(items), 'resultsPerPage': len(items) },
+            'items': items,
+        })
+
+    @web.middleware
+    async def _replay(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        if (pages := self.recordings.get(request.path)) is None:
+            return await handler(request)
+        index = int(request.query.get('pageToken', 0))
+        body = dict(pages[index])
+        if index + 1 < len(pages):
+            body['nextPageToken'] = str(index + 1)
+        return await self._respond(request, body)
+
+    def _viewed(self, resource: dict[str, Any]) -> dict[str, Any]:
+        if views := self.views.get(resource['id']):
+            statistics = resource['statistics']
+            statistics['viewCount'] = str(int(statistics['viewCount']) + views)
+        return resource
+
+    def _by_id(self, make: Any):
+        async def handler(request: web.Request) -> web.Response:
+            ids = request.query.get('id', '').split(',')
+            fault = None
+            if (name := request.query.get('forHandle') or request.query.get('forUsername')) is not None:
+                name = name.removeprefix('@').lower()
+                ids = [] if name.startswith('missing') else [ 'UC' + name ]
+                if name.startswith('invalid'):
+                    fault = (400, 'invalidParameter')
+            items = [
+                select_parts(self._viewed(make(id)), request.query.get('part', ''))
+                for id in ids if id and not id.startswith('missing')
+            ]
+            return await self._respond(request, {
+                'kind': 'youtube#listResponse',
+                'pageInfo': { 'totalResults': len(items), 'resultsPerPage': len(items) },
+                'items': items,
+            }, fault)
+        return handler
+
+    async def __aenter__(self) -> 'MockYouTube':
+        self._runner = web.AppRunner(self._app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = F"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *_: Any):
+        await self._runner.cleanup()
+
+    def client(self, cls: type[Y] = YouTubeData, **kwargs: Any) -> Y:
+        yt = cls(UrlApiKey('key', 'mock-api-key'), **kwargs) # type: ignore ## auth type
+        yt.base_url = self.url
+        return yt
@@ -0,0 +1,40 @@
+import os
+from SlyYTDAPI import *
+from SlyYTDAPI.cache import MemoryCache, SqliteCache
+from mock_youtube import MockYouTube, FakeClock
+
+async def test_memory_cache():
+    clock = FakeClock()
+    cache = MemoryCache(ttl={'/videos': 60}, clock=clock)
+    async with MockYouTube() as server:
+        yt = server.client(cache=cache)
+
+        first = await yt.video('abc')
+        again = await yt.video('abc')
+        assert first.title == again.title
+        assert server.hits['/videos'] == 1
+
+        clock.now = 120 # stale, revalidated by etag
+        await yt.video('abc')
+        assert server.hits['/videos'] == 2
+        assert server.not_modified['/videos'] == 1
+
+        await yt.video('abc')
+        await yt.video('xyz')
+        await yt.search_videos('not cached', limit=5)
+        await yt.search_videos('not cached', limit=5)
+        assert server.hits['/search'] == 2
+
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.revalidated) == (2, 2, 1)
+
+async def test_sqlite_cache(tmp_path: str):
+    path = os.path.join(tmp_path, 'cache.db')
+    async with MockYouTube() as server:
+        yt = server.client(cache=SqliteCache(path))
+        videos = await yt.get_playlist_videos('PL1')
+
+        cache = SqliteCache(path)
+        yt = server.client(cache=cache)
+        assert [v.id for v in await yt.get_playlist_videos('PL1')] == [v.id for v in videos]
+        assert server.hits['/playlistItems'] == 4
+        assert cache.stats.hits == 4
@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+from SlyYTDAPI import *
+from SlyYTDAPI.coalesce import MicroBatcher
+from mock_youtube import MockYouTube
+
+async def test_single_flight():
+    async with MockYouTube(latency=0.05) as server:
+        yt = server.client(coalesce=True)
+        channels = await asyncio.gather(*(yt.channel('UC1') for _ in range(10)))
+        assert {c.id for c in channels} == {'UC1'}
+        assert server.hits['/channels'] == 1
+        assert yt._flights is not None and yt._flights.shared == 9
+
+        # only identical requests are shared
+        await asyncio.gather(yt.channel('UC1'), yt.channel('UC2'), yt.channel('UC1', Part.STATISTICS))
+        assert server.hits['/channels'] == 4
+
+        # a cancelled caller does not cancel the others
+        first = asyncio.ensure_future(yt.video('vid1'))
+        second = asyncio.ensure_future(yt.video('vid1'))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert (await second).id == 'vid1'
+        assert server.hits['/videos'] == 1
+
+async def test_micro_batching():
+    async with MockYouTube(latency=0.01) as server:
+        yt = server.client(batch_window=0.01)
+        ids = [F"vid{i}" for i in range(120)]
+        videos = await asyncio.gather(*(yt.video(id) for id in ids + ids[:10]))
+        assert [v.id for v in videos] == ids + ids[:10]
+        assert server.hits['/videos'] == 3 # 50 + 50 + 20
+
+        # different parts cannot share a request
+        a, b = await asyncio.gather(yt.channel('UC1'), yt.channel('UC2', Part.STATISTICS))
+        assert (a.id, b.id) == ('UC1', 'UC2')
+        assert server.hits['/channels'] == 2
+
+        await asyncio.gather(yt.video('vid1'), yt.video('vid2'))
+        with pytest.raises(IndexError):
+            await asyncio.gather(yt.video('vid3'), yt.video('missing1'))
+        assert server.hits['/videos'] == 5
+
+async def test_micro_batch_errors():
+    error: BaseException = KeyError('down')
+    async def fetch(keys: list[str]) -> dict[str, str]:
+        await asyncio.sleep(0.01)
+        raise error
+    batcher = MicroBatcher(fetch, window=0.001)
+    a = asyncio.ensure_future(batcher.get('a'))
+    b = asyncio.ensure_future(batcher.get('b'))
+    await asyncio.sleep(0.005)
+    a.cancel()
+    with pytest.raises(KeyError):
+        await b
+    assert a.cancelled()
+
+    # a cancelled fetch cancels the callers still waiting
+    error = asyncio.CancelledError()
+    with pytest.raises(asyncio.CancelledError):
+        await batcher.get('c')
+    assert batcher.batches == 2
@@ -0,0 +1,21 @@
+from SlyYTDAPI import *
+from mock_youtube import MockYouTube, load_fixture
+
+async def test_comments():
+    async with MockYouTube(comment_total=30, reply_total=3, page_size=20) as server:
+        yt = server.client()
+        comments = await yt.comments('vid1', limit=None)
+        assert len(comments) == 30
+        assert server.hits['/commentThreads'] == 2 # API default page size
+        assert comments[0].id == 'vid1.c0'
+        assert [r.id for r in comments[0].replies or []] == ['vid1.c0.r0', 'vid1.c0.r1', 'vid1.c0.r2']
+
+async def test_recorded_comments():
+    async with MockYouTube() as server:
+        server.recordings['/commentThreads'] = load_fixture('comment_threads.json')
+        yt = server.client()
+        comments = await yt.comments('dQw4w9WgXcQ', limit=None)
+        assert [c.body for c in comments][:2] == ['First!', 'Great video, thanks for sharing.']
+        assert len(comments) == 6
+        assert server.hits['/commentThreads'] == 2
+        assert len(comments[2].replies or []) == 5 # of 7, as embedded by the API
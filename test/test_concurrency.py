@@ -0,0 +1,24 @@
+from SlyYTDAPI import *
+from mock_youtube import MockYouTube
+
+async def test_concurrent_videos():
+    async with MockYouTube(latency=0.01) as server:
+        yt = server.client()
+        ids = [F"vid{i}" for i in range(260)]
+
+        videos = await yt.videos(ids, concurrency=4)
+        assert [v.id for v in videos] == ids
+        assert server.hits['/videos'] == 6
+
+        unordered = await yt.videos(ids, concurrency=4, ordered=False)
+        assert sorted(v.id for v in unordered) == sorted(ids)
+
+async def test_concurrent_channels():
+    async with MockYouTube(latency=0.05) as server:
+        yt = server.client()
+        ids = [F"UC{i}" for i in range(120)]
+
+        channels = await yt.channels(ids, Part.STATISTICS, concurrency=3)
+        assert [c.id for c in channels] == ids
+        assert server.hits['/channels'] == 3
+        assert server.max_in_flight >= 2
@@ -0,0 +1,136 @@
+import asyncio
+import functools
+import sqlite3
+from collections import Counter
+from SlyYTDAPI import *
+from SlyYTDAPI.crawl import Crawler, Frontier, HashRing, Task, TaskKind, TaskState
+from mock_youtube import MockYouTube
+
+def mock_client(url: str) -> YouTubeData:
+    yt = YouTubeData(UrlApiKey('key', 'mock-api-key'))
+    yt.base_url = url
+    return yt
+
+def test_hash_ring():
+    keys = [F"UC{i}" for i in range(10_000)]
+    four, five = HashRing(4), HashRing(5)
+    shares = Counter(four.shard(key) for key in keys)
+    assert set(shares) == {0, 1, 2, 3}
+    assert all(1_500 < n < 3_500 for n in shares.values())
+    # adding a shard only moves keys to it
+    moved = [key for key in keys if four.shard(key) != five.shard(key)]
+    assert all(five.shard(key) == 4 for key in moved)
+    assert len(moved) < 3_000
+
+def test_frontier_recover(tmp_path):
+    path = str(tmp_path / 'crawl.db')
+    frontier = Frontier(path, HashRing(1))
+    assert frontier.add(Task(TaskKind.HYDRATE_VIDEO, F"vid{i}") for i in range(120)) == 120
+    assert frontier.add([Task(TaskKind.HYDRATE_VIDEO, 'vid0')]) == 0
+    assert frontier.lease(0, TaskKind.HYDRATE_VIDEO, 50, minimum=200) == []
+    first = frontier.lease(0, TaskKind.HYDRATE_VIDEO, 50)
+    second = frontier.lease(0, TaskKind.HYDRATE_VIDEO, 50)
+    assert len(first) == len(second) == 50 and not set(first) & set(second)
+    frontier.complete({ task: None for task in first }, [Task(TaskKind.HARVEST_COMMENTS, 'vid0')])
+    # the worker stops before completing the second lease
+    frontier.close()
+
+    frontier = Frontier(path, HashRing(1))
+    assert frontier.recover(0, max_attempts=2) == 50
+    assert frontier.outstanding() == 70 + 1
+    leased = frontier.lease(0, TaskKind.HYDRATE_VIDEO, 100)
+    assert len(leased) == 70
+    # leased twice now
+    assert frontier.recover(0, max_attempts=2) == 20
+    counts = frontier.counts()
+    assert counts[TaskKind.HYDRATE_VIDEO, TaskState.FAILED] == 50
+    assert counts[TaskKind.HYDRATE_VIDEO, TaskState.DONE] == 50
+
+def test_frontier_retry(tmp_path):
+    frontier = Frontier(str(tmp_path / 'crawl.db'), HashRing(1))
+    frontier.add(Task(TaskKind.HYDRATE_VIDEO, F"vid{i}") for i in range(3))
+    leased = frontier.lease(0, TaskKind.HYDRATE_VIDEO, 3)
+    frontier.retry(leased[:1], '500 backendError', backoff=60, max_attempts=2)
+    frontier.release(leased[1:])
+    # the released tasks are leased again at once, the retried one after its backoff
+    again = frontier.lease(0, TaskKind.HYDRATE_VIDEO, 3)
+    assert again == leased[1:]
+    frontier.retry(again, '500 backendError', backoff=0, max_attempts=2)
+    assert set(frontier.lease(0, TaskKind.HYDRATE_VIDEO, 3)) == set(again)
+    # attempts are not counted for released tasks, so both can be tried once more
+    frontier.retry(again, '500 backendError', backoff=0, max_attempts=2)
+    counts = frontier.counts()
+    assert counts[TaskKind.HYDRATE_VIDEO, TaskState.FAILED] == 2
+    assert counts[TaskKind.HYDRATE_VIDEO, TaskState.PENDING] == 1
+    frontier.close()
+
+async def test_crawl(tmp_path):
+    path = str(tmp_path / 'crawl.db')
+    async with MockYouTube(playlist_total=30, comment_total=3) as server:
+        crawler = Crawler(path, functools.partial(mock_client, server.url), workers=3, backoff=0.01)
+        channels = [F"https://www.youtube.com/@creator{i}" for i in range(6)] + ['@missing', '@invalid', 'UC1']
+        assert crawler.add(TaskKind.RESOLVE_CHANNEL, channels) == 9
+        # fails one request for videos, which is tried again later
+        server.faults['/videos'] = [500]
+        await crawler.run()
+        assert crawler.crashes == 0 and not crawler.quota_exceeded
+
+        resolved = dict(crawler.results(TaskKind.RESOLVE_CHANNEL))
+        assert resolved['@missing'] is None and resolved['UC1'] is None
+        assert resolved[channels[0]] == 'UCcreator0'
+        # only the handle which cannot be looked up fails, not the others leased with it
+        assert '@invalid' not in resolved and len(resolved) == 8
+        assert crawler.counts()[TaskKind.RESOLVE_CHANNEL, TaskState.FAILED] == 1
+        uploads = dict(crawler.results(TaskKind.LIST_UPLOADS))
+        assert uploads == { F"UCcreator{i}": 30 for i in range(6) }
+        videos = dict(crawler.results(TaskKind.HYDRATE_VIDEO))
+        assert len(videos) == 180 and videos['UUcreator2-7']['id'] == 'UUcreator2-7'
+        comments = dict(crawler.results(TaskKind.HARVEST_COMMENTS))
+        assert len(comments) == 180 and all(len(c) == 3 for c in comments.values())
+        assert crawler.counts()[TaskKind.HYDRATE_VIDEO, TaskState.DONE] == 180
+        # at least 50 IDs per request, except for the last of each worker
+        assert server.hits['/videos'] <= 180 // 50 + 3 + 1
+
+        # already done: nothing is requested again
+        hits = sum(server.hits.values())
+        crawler.add(TaskKind.RESOLVE_CHANNEL, channels)
+        await crawler.run()
+        assert sum(server.hits.values()) == hits
+        crawler.close()
+
+async def test_crawl_quota(tmp_path):
+    path = str(tmp_path / 'crawl.db')
+    async with MockYouTube(playlist_total=10, comment_total=1) as server:
+        crawler = Crawler(path, functools.partial(mock_client, server.url), workers=2)
+        crawler.add(TaskKind.RESOLVE_CHANNEL, [F"@creator{i}" for i in range(4)])
+        server.exhausted_keys.add('mock-api-key')
+        await crawler.run()
+        # the workers stop without crashing, and the tasks are left to try later
+        assert crawler.quota_exceeded and crawler.crashes == 0
+        assert crawler.counts() == { (TaskKind.RESOLVE_CHANNEL, TaskState.PENDING): 4 }
+
+        server.exhausted_keys.clear()
+        await crawler.run()
+        assert not crawler.quota_exceeded
+        assert crawler.counts()[TaskKind.HYDRATE_VIDEO, TaskState.DONE] == 40
+        crawler.close()
+
+async def test_crawl_waits_for_lock(tmp_path):
+    path = str(tmp_path / 'crawl.db')
+    async with MockYouTube(latency=0.5, playlist_total=1, comment_total=1) as server:
+        crawler = Crawler(path, functools.partial(mock_client, server.url), workers=1)
+        crawler.add(TaskKind.RESOLVE_CHANNEL, ['@creator0'])
+        run = asyncio.ensure_future(crawler.run())
+        while not server.in_flight:
+            await asyncio.sleep(0.01)
+        # another connection writes for longer than SQLite's default busy timeout of 5 seconds,
+        # while the handle looked up is about to be saved
+        blocker = sqlite3.connect(path, isolation_level=None)
+        blocker.execute('BEGIN IMMEDIATE')
+        await asyncio.sleep(6)
+        blocker.execute('COMMIT')
+        blocker.close()
+        await run
+        assert crawler.crashes == 0
+        assert dict(crawler.results(TaskKind.RESOLVE_CHANNEL)) == { '@creator0': 'UCcreator0' }
+        crawler.close()
@@ -0,0 +1,25 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import pytest
+from SlyYTDAPI import *
+from mock_youtube import MockYouTube
+
+PARTS = {Part.SNIPPET, Part.DETAILS, Part.STATISTICS, Part.STATUS, Part.LOCALIZATIONS}
+
+@pytest.mark.parametrize('make_executor', [ThreadPoolExecutor, lambda: ProcessPoolExecutor(2)])
+async def test_pooled_decoding(make_executor):
+    async with MockYouTube(playlist_total=120) as server:
+        yt = server.client()
+        ids = [F"vid{i}" for i in range(130)] + ['missing1']
+        expected = [v.to_dict() for v in await yt.videos(ids, PARTS)]
+        playlist = [v.to_dict() for v in await yt.get_playlist_videos('PL1', limit=110)]
+        with make_executor() as executor:
+            videos = await yt.videos(ids, PARTS, executor=executor, concurrency=3)
+            assert [v.to_dict() for v in videos] == expected
+            assert all(v._youtube is yt for v in videos)
+            pooled = await yt.get_playlist_videos('PL1', limit=110, executor=executor)
+            assert [v.to_dict() for v in pooled] == playlist
+        # the limit stops requests, as without an executor
+        assert server.hits['/playlistItems'] == 2 * 3
+
+        with pytest.raises(ValueError):
+            yt.videos(ids, executor=executor, lazy=True)
@@ -0,0 +1,32 @@
+import os, pytest
+from SlyYTDAPI import *
+from SlyYTDAPI.export import video_batches, video_row, write_parquet
+from mock_youtube import MockYouTube
+
+async def test_video_batches():
+    async with MockYouTube(playlist_total=20) as server:
+        yt = server.client()
+        videos = await yt.videos(['a', 'b'], parts={Part.SNIPPET, Part.DETAILS, Part.STATISTICS})
+        row = video_row(videos[0])
+        assert row['id'] == 'a' and row['view_count'] == videos[0].view_count
+
+        batches = [b async for b in video_batches(yt.get_playlist_videos('PL1'), batch_size=7)]
+        assert [len(b) for b in batches] == [7, 7, 6]
+        ids = batches[0].columns['id'].values
+        assert ids[0] == 'PL1-0'
+        # playlist items have no statistics
+        assert batches[0].columns['view_count'].valid == bytearray(7)
+        assert batches[0].columns['published_at'].valid == bytearray([1] * 7)
+
+async def test_write_parquet(tmp_path: str):
+    pq = pytest.importorskip('pyarrow.parquet')
+    path = os.path.join(tmp_path, 'videos.parquet')
+    async with MockYouTube() as server:
+        yt = server.client()
+        ids = [F"v{i}" for i in range(120)]
+        written = await write_parquet(
+            yt.videos(ids, parts={Part.SNIPPET, Part.DETAILS, Part.STATISTICS}), path, batch_size=50)
+    assert written == 120
+    table = pq.read_table(path)
+    assert table.column('id').to_pylist() == ids
+    assert table.column('like_count').null_count == 0
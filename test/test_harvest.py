@@ -0,0 +1,33 @@
+import asyncio
+from collections import Counter
+from SlyYTDAPI.harvest import CommentHarvester
+from mock_youtube import MockYouTube
+
+async def test_harvest_expands_replies():
+    async with MockYouTube(comment_total=250, reply_total=120) as server:
+        harvester = CommentHarvester(server.client(), concurrency=4)
+        comments = await harvester.harvest('vid1')
+        assert len(comments) == 250 + 250 * 120
+        assert len({c.id for c in comments}) == len(comments)
+        replies = Counter(c.parent_id for c in comments if c.parent_id is not None)
+        assert len(replies) == 250 and set(replies.values()) == {120}
+        assert server.hits['/commentThreads'] == 3
+        assert server.hits['/comments'] == 250 * 2 # 100 per page
+        assert (harvester.threads, harvester.expanded, harvester.comments) == (250, 250, len(comments))
+
+async def test_harvest_embedded_replies():
+    async with MockYouTube(comment_total=30, reply_total=3) as server:
+        comments = await CommentHarvester(server.client()).harvest('vid1')
+        assert len(comments) == 30 * 4
+        assert server.hits['/comments'] == 0
+        assert comments[0].reply_count == 3 and comments[1].parent_id == comments[0].id
+
+async def test_harvest_backpressure():
+    async with MockYouTube(comment_total=250, reply_total=120) as server:
+        stream = CommentHarvester(server.client(), concurrency=2, buffer=10).harvest('vid1')
+        async for _ in stream:
+            await asyncio.sleep(0.05) # a slow consumer
+            break
+        # paging paused once the buffer and all reply slots were full
+        assert server.hits['/commentThreads'] == 1
+        assert server.hits['/comments'] <= 2
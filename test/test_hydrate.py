@@ -0,0 +1,53 @@
+import pytest
+from SlyYTDAPI import *
+from SlyYTDAPI.hydrate import Hydrator
+from mock_youtube import MockYouTube
+
+async def test_hydrate_videos():
+    ids = [F"vid{i % 70}" for i in range(200)] + ['missing1', 'vid3', 'missing2', 'missing1']
+    async with MockYouTube() as server:
+        yt = server.client()
+        hydrator = Hydrator(yt, concurrency=2)
+        found = await hydrator.videos(ids)
+    expected = list(dict.fromkeys(ids))
+    assert [id for id, _ in found] == expected
+    assert all(video is None or video.id == id for id, video in found)
+    assert hydrator.missing == {'missing1', 'missing2'}
+    assert dict(found)['missing1'] is None
+    assert (hydrator.ids, hydrator.duplicates, hydrator.requests) == (204, 132, 2)
+    assert server.hits['/videos'] == 2
+
+async def test_hydrate_async_source():
+    produced = 0
+    async def ids():
+        nonlocal produced
+        for i in range(10_000):
+            produced += 1
+            yield F"UC{i % 5_000}"
+    async with MockYouTube() as server:
+        yt = server.client()
+        hydrator = Hydrator(yt, concurrency=2, dedupe_window=100)
+        count = 0
+        async for id, channel in hydrator.channels(ids()):
+            assert channel is not None and channel.id == id
+            count += 1
+            if count == 120:
+                break
+        # only read ahead by the requests in flight
+        assert produced <= 50 * 5
+        assert server.hits['/channels'] <= 4
+
+async def test_not_found():
+    async with MockYouTube() as server:
+        yt = server.client()
+        with pytest.raises(ResourceNotFound) as error:
+            await yt.video('missing1')
+        assert (error.value.kind, error.value.id) == ('Video', 'missing1')
+        with pytest.raises(IndexError):
+            await yt.channel('missing2')
+
+        # repeated IDs are requested once, in order
+        videos = await yt.videos(['vid2', 'vid1', 'vid2', 'vid3', 'vid1'])
+        assert [v.id for v in videos] == ['vid2', 'vid1', 'vid3']
+        channels = await yt.channels(['UC2', 'UC1', 'UC2'], Part.SNIPPET)
+        assert [c.id for c in channels] == ['UC2', 'UC1']
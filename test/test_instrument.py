@@ -0,0 +1,82 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from SlyYTDAPI import *
+from SlyYTDAPI.instrument import Histogram, PageEvent, CallEvent
+from mock_youtube import MockYouTube
+
+class Recorder(Instrument):
+    def __init__(self):
+        self.pages: list[PageEvent] = []
+        self.calls: list[CallEvent] = []
+    def page(self, event: PageEvent):
+        self.pages.append(event)
+    def call(self, event: CallEvent):
+        self.calls.append(event)
+
+@pytest.mark.parametrize('mode', ['pages', 'stream', 'executor'])
+async def test_playlist_pages(mode: str):
+    recorder = Recorder()
+    async with MockYouTube(playlist_total=23) as server:
+        yt = server.client(instrument=recorder, stream_pages=mode == 'stream')
+        with ThreadPoolExecutor(2) as executor:
+            videos = await yt.get_playlist_videos('PL1', executor=executor if mode == 'executor' else None)
+    assert len(videos) == 23
+
+    assert [p.items for p in recorder.pages] == [5, 5, 5, 5, 3]
+    for page in recorder.pages:
+        assert page.endpoint == '/playlistItems'
+        assert page.requests == page.units == 1
+        assert page.params_size > 0 and page.latency > 0 and page.decode > 0
+    assert sum(p.bytes for p in recorder.pages) == server.bytes_sent['/playlistItems']
+
+    [call] = recorder.calls
+    assert (call.name, call.pages, call.items, call.units) == ('get_playlist_videos', 5, 23, 5)
+    assert call.bytes == server.bytes_sent['/playlistItems']
+    assert call.seconds >= call.latency
+    if mode != 'executor': # built in the worker
+        assert call.parse > 0
+
+async def test_calls_and_cache():
+    recorder = HistogramRecorder()
+    async with MockYouTube() as server:
+        yt = server.client(instrument=recorder, cache=MemoryCache(), quota=QuotaScheduler())
+        await yt.videos([F"vid{i}" for i in range(120)], concurrency=2)
+        await yt.video('vid1')
+        await yt.video('vid1') # cached
+        await yt.search_videos('query', limit=10)
+        await yt.comments('vid1', limit=3)
+        # pages requested directly, outside of any call
+        await yt.get_json('/videos', { 'id': 'vid2', 'part': 'id' })
+
+    videos = recorder.pages['/videos']
+    assert videos['requests'].count == 6 and videos['requests'].total == 5
+    assert videos['items'].total == 120 + 1 + 1 + 1
+    assert recorder.pages['/search']['units'].total == 100
+
+    calls = recorder.calls['videos']
+    assert calls['items'].count == 3
+    assert calls['pages'].total == 3 + 1 + 1 and calls['units'].total == 4
+    assert recorder.calls['search_videos']['items'].total == 10
+    assert recorder.calls['comments']['items'].total == 3
+
+    report = recorder.report()
+    assert '/search' in report and 'videos()' in report
+
+async def test_early_close():
+    recorder = Recorder()
+    async with MockYouTube(search_total=50) as server:
+        yt = server.client(instrument=recorder)
+        async for _ in yt.search_videos('query', limit=None):
+            break
+    [call] = recorder.calls
+    assert (call.pages, call.items) == (1, 1)
+
+def test_histogram():
+    h = Histogram()
+    for i in range(1, 1001):
+        h.add(i / 1000)
+    h.add(0.0)
+    assert h.count == 1001 and h.min == 0.0 and h.max == 1.0
+    assert 0.5 <= h.percentile(50) <= 0.5 * 1.19
+    assert 0.99 <= h.percentile(99) <= 1.0
+    assert h.percentile(0) == 0.0
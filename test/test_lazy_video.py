@@ -0,0 +1,24 @@
+from SlyYTDAPI import *
+from mock_youtube import MockYouTube, video_resource, playlist_item, search_result
+
+def test_lazy_video_matches_video():
+    full = video_resource('abc') | {
+        'liveStreamingDetails': { 'actualStartTime': '2023-01-01T00:00:00Z', 'activeLiveChatId': 'chat' },
+        'localizations': { 'fr': { 'title': 'Vidéo', 'description': 'Une vidéo' } },
+        'recordingDetails': { 'recordingDate': '2022-12-31T00:00:00Z' },
+    }
+    for source in [full, playlist_item('PL1', 0), search_result('xyz'), { 'id': 'bare' }]:
+        assert LazyVideo(source, None).to_dict() == Video(source, None).to_dict() # type: ignore
+
+    lazy = LazyVideo(full, None) # type: ignore
+    assert not hasattr(lazy, '__dict__')
+    assert lazy.duration == Video(full, None).duration # type: ignore
+    assert lazy.content_details is lazy.content_details # decoded once
+
+async def test_lazy_videos():
+    async with MockYouTube() as server:
+        yt = server.client()
+        videos = await yt.videos(['a', 'b'], parts={Part.SNIPPET, Part.STATISTICS}, lazy=True)
+        assert all(isinstance(v, LazyVideo) for v in videos)
+        assert [v.title for v in videos] == ['Video a', 'Video b']
+        assert videos[0].view_count == 97000
@@ -0,0 +1,58 @@
+from SlyYTDAPI.livechat import *
+from mock_youtube import MockYouTube, FakeSleep, load_fixture
+
+async def test_live_chat_replay():
+    async with MockYouTube() as server:
+        server.recordings['/liveChat/messages'] = load_fixture('live_chat.json')
+        yt = server.client(YouTubeDataWithLiveChat)
+        sleep = FakeSleep()
+        events = await yt.live_chat('chat1', sleep=sleep)
+
+        # unknown types are skipped, repeats are dropped, nothing after the chat ends
+        assert [type(e) for e in events] == [
+            TextChat, SuperChat,
+            NewSponsor, ChatMessageDeleted, SuperSticker, UserBanned,
+            MembershipGifting, MembershipGiftReceived,
+            SponsorOnlyStart, Tombstone, ChatEnd,
+        ]
+        assert server.hits['/liveChat/messages'] == 3
+        # waits out the interval of each page, less the time taken by the request
+        assert len(sleep.delays) == 2
+        assert 1.5 < sleep.delays[0] <= 2.0 and 0.5 < sleep.delays[1] <= 1.0
+
+        text, superchat, sponsor, deleted, sticker, banned, gifting, received = events[:8]
+        assert (text.id, text.author_name, text.author_channel_id, text.body) == ('m1', 'Alice', 'UCa', 'hello')
+        assert text.created_at.minute == 1
+        assert (superchat.amount_micros, superchat.currency, superchat.body, superchat.tier) == (5_000_000, 'USD', 'thanks', 2)
+        assert (sponsor.name, sponsor.channel_id, sponsor.level_name, sponsor.is_upgrade) == ('Carol', 'UCc', 'Level 1', False)
+        assert deleted.deleted_message_id == 'm1'
+        assert (sticker.sticker_id, sticker.amount_display) == ('sticker1', '$2.00')
+        assert (banned.channel_id, banned.ban_type, banned.ban_duration_seconds) == ('UCe', 'temporary', 300)
+        assert (gifting.count, gifting.author_name) == (5, 'Frank')
+        assert (received.gifter_channel_id, received.gifting_message_id) == ('UCf', 'm8')
+
+async def test_live_chat_resume():
+    async with MockYouTube() as server:
+        server.recordings['/liveChat/messages'] = load_fixture('live_chat.json')
+        yt = server.client(YouTubeDataWithLiveChat)
+        cursor = ChatCursor()
+        async for event in yt.live_chat('chat1', sleep=FakeSleep(), cursor=cursor):
+            if isinstance(event, TextChat):
+                break
+        # the first page was not read to the end
+        assert cursor.page_token is None and list(cursor.seen) == ['m1']
+
+        # the super chat after the break on the same page is not lost, and not repeated on the next
+        events = await yt.live_chat('chat1', sleep=FakeSleep(), cursor=cursor)
+        assert [e.id for e in events] == ['m2', 'm4', 'm5', 'm6', 'm7', 'm8', 'm9', 'm10', 'm11', 'm12']
+
+        # a stream on the same client has its own position
+        other = ChatCursor()
+        async for event in yt.live_chat('chat1', sleep=FakeSleep(), cursor=other):
+            if event.id == 'm4':
+                break
+        assert other.page_token == '1' and cursor.page_token == '2'
+
+        # a page token resumes from the start of that page, so the repeated super chat is new here
+        events = await yt.live_chat('chat1', page_token='1', sleep=FakeSleep())
+        assert [e.id for e in events] == ['m2', 'm4', 'm5', 'm6', 'm7', 'm8', 'm9', 'm10', 'm11', 'm12']
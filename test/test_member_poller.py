@@ -0,0 +1,42 @@
+from SlyYTDAPI import *
+from SlyYTDAPI.members import MemberPoller
+from SlyYTDAPI.store import MemoryStore
+from mock_youtube import MockYouTube, FakeSleep
+
+async def test_member_poller():
+    store = MemoryStore()
+    async with MockYouTube() as server:
+        yt = server.client(YouTubeData_WithMembers)
+        server.member_pages.append(['UCold']) # joined before polling began
+
+        def first_run(sleeps: int):
+            if sleeps == 2:
+                server.member_pages.append(['UC1', 'UC2'])
+        sleep = FakeSleep(on_sleep=first_run)
+        poller = MemberPoller(yt, store, min_interval=10, max_interval=60,
+            sleep=sleep, jitter=lambda: 0.5)
+        seen: list[str] = []
+        async for member in poller:
+            seen.append(member.channel_id)
+            if len(seen) == 2:
+                break
+        assert seen == ['UC1', 'UC2']
+        assert sleep.delays == [15, 22.5] # no members yet, slowed down
+        # the page with UC1 and UC2 was not finished, so it is not saved
+        assert store.get('members:next_page') == '1'
+
+        # resumes from the stored token, backs off on errors, speeds up with new members
+        server.faults['/members'] = [503, 503]
+        def second_run(sleeps: int):
+            if sleeps == 5:
+                poller.stop()
+        sleep = FakeSleep(on_sleep=second_run)
+        poller = MemberPoller(yt, store, min_interval=10, max_interval=60,
+            sleep=sleep, jitter=lambda: 0.5)
+        poller.interval = 40
+        async for member in poller:
+            seen.append(member.channel_id)
+        assert seen == ['UC1', 'UC2', 'UC1', 'UC2']
+        assert sleep.delays == [7.5, 15, 20, 30, 45]
+        assert (poller.polls, poller.members, poller.errors) == (3, 2, 2)
+        assert store.get('members:next_page') == '2'
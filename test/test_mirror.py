@@ -0,0 +1,83 @@
+import pytest
+from typing import Any
+from SlyAPI.web import ApiError
+from SlyYTDAPI import HistogramRecorder
+from SlyYTDAPI.mirror import PlaylistMirror
+from SlyYTDAPI.store import MemoryStore
+from mock_youtube import MockYouTube
+
+class FailingStore(MemoryStore):
+    'Injects a server error after a number of pages are saved.'
+    def __init__(self, server: MockYouTube, after: int):
+        super().__init__()
+        self.server = server
+        self.after = after
+    def set(self, key: str, value: Any):
+        super().set(key, value)
+        if key.count(':') == 2:
+            self.after -= 1
+            if self.after == 0:
+                self.server.faults['/playlistItems'] = [503]
+
+async def test_resume():
+    async with MockYouTube() as server:
+        server.playlists['PL1'] = [F"vid{i}" for i in range(230)]
+        yt = server.client()
+        store = FailingStore(server, after=2)
+        mirror = PlaylistMirror(yt, store)
+
+        with pytest.raises(ApiError):
+            await mirror.sync('PL1')
+        assert len(mirror.videos('PL1')) == 100
+        assert server.hits['/playlistItems'] == 3
+
+        assert await mirror.sync('PL1')
+        assert mirror.resumed == 1
+        videos = mirror.videos('PL1')
+        assert [v.id for v in videos] == server.playlists['PL1']
+        # continued from the third page
+        assert server.hits['/playlistItems'] == 3 + 3
+
+async def test_revalidate():
+    async with MockYouTube() as server:
+        server.playlists['PL1'] = [F"vid{i}" for i in range(120)]
+        yt = server.client()
+        store = MemoryStore()
+        mirror = PlaylistMirror(yt, store)
+        assert await mirror.sync('PL1')
+        assert server.hits['/playlistItems'] == 3
+        assert store.get('playlist:PL1')['total'] == 120
+
+        # unchanged: only the first page is requested
+        assert not await mirror.sync('PL1')
+        assert server.hits['/playlistItems'] == 4 and mirror.not_modified == 1
+
+        # a video replaced on the second page is only found by a full sync,
+        # which downloads only that page
+        server.playlists['PL1'][60] = 'other'
+        assert not await mirror.sync('PL1')
+        assert await mirror.sync('PL1', full=True)
+        assert server.hits['/playlistItems'] == 5 + 3 and mirror.not_modified == 4
+        assert [v.id for v in mirror.videos('PL1')] == server.playlists['PL1']
+        assert not await mirror.sync('PL1', full=True)
+        assert mirror.not_modified == 7
+        # kept, though no page carried it
+        assert store.get('playlist:PL1')['total'] == 120
+
+        # shrinks by a page
+        del server.playlists['PL1'][100:]
+        assert await mirror.sync('PL1')
+        assert len(mirror.videos('PL1')) == 100
+        assert store.get('playlist:PL1:2') is None
+
+async def test_instrumented():
+    recorder = HistogramRecorder()
+    async with MockYouTube() as server:
+        server.playlists['PL1'] = [F"vid{i}" for i in range(60)]
+        yt = server.client(instrument=recorder)
+        mirror = PlaylistMirror(yt, MemoryStore())
+        assert await mirror.sync('PL1')
+        assert not await mirror.sync('PL1')
+    pages = recorder.pages['/playlistItems']
+    assert pages['requests'].count == 3
+    assert pages['items'].total == 60 and pages['decode'].count == 3
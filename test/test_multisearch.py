@@ -0,0 +1,41 @@
+from collections import Counter
+from datetime import datetime
+from SlyYTDAPI.multisearch import MultiChannelSearch
+from mock_youtube import MockYouTube
+
+async def test_merged_search():
+    async with MockYouTube(search_total=20) as server:
+        search = MultiChannelSearch(server.client(), concurrency=4)
+        channels = [F"UC{i}" for i in range(30)]
+        videos = await search.search(channels, per_channel_limit=10, limit=100)
+        assert len(videos) == 100
+        dates = [v.published_at for v in videos]
+        assert dates == sorted(dates, reverse=True)
+        assert max(Counter(v.id.split('-')[0] for v in videos).values()) <= 10
+        assert server.hits['/search'] == 30 == search.requests
+        assert search.units == 3000
+
+        # the window is shared by all channels
+        after, before = datetime(2023, 3, 1), datetime(2023, 6, 1)
+        videos = await search.search(channels, after=after, before=before, per_channel_limit=None)
+        assert videos and all(after <= v.published_at < before for v in videos)
+
+async def test_early_termination():
+    async with MockYouTube(search_total=200) as server:
+        search = MultiChannelSearch(server.client())
+        videos = await search.search(['UCa', 'UCb', 'UCc'], per_channel_limit=None, limit=60)
+        assert len(videos) == 60
+        # 3 first pages, and fewer than 60 more videos needed than the 150 they hold
+        assert server.hits['/search'] == 3
+
+        everything = await search.search(['UCa', 'UCb', 'UCc'], per_channel_limit=None)
+        assert len(everything) == 600
+        assert [v.id for v in videos] == [v.id for v in everything[:60]]
+
+async def test_quota_budget():
+    async with MockYouTube(search_total=20) as server:
+        search = MultiChannelSearch(server.client(), quota_budget=1500)
+        channels = [F"UC{i}" for i in range(20)]
+        videos = await search.search(channels, per_channel_limit=5)
+        assert server.hits['/search'] == 15 and search.units == 1500
+        assert len(videos) == 75 and len(search.truncated) == 5
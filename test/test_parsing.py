@@ -0,0 +1,48 @@
+import itertools
+from datetime import datetime
+from typing import Any, Callable
+from SlyYTDAPI import yt_date, yt_duration, ISO8601_PERIOD
+
+# the parsers as they were before the fast paths
+def reference_date(date: str) -> datetime:
+    if date.endswith('Z'):
+        try:
+            return datetime.strptime(date, '%Y-%m-%dT%H:%M:%S.%fZ')
+        except ValueError:
+            return datetime.strptime(date, '%Y-%m-%dT%H:%M:%SZ')
+    else:
+        return datetime.fromisoformat(date)
+
+def reference_duration(duration: str) -> int:
+    m = ISO8601_PERIOD.match(duration)
+    if m:
+        days, hours, minutes, seconds = (int(g) if g else 0 for g in m.groups())
+        return days * 24 * 60 * 60 + hours * 60 * 60 + minutes * 60 + seconds
+    else:
+        raise ValueError(F"Unknown duration format: {duration}")
+
+def outcome(parse: Callable[[str], Any], text: str) -> Any:
+    try:
+        return parse(text)
+    except Exception as e:
+        return type(e)
+
+def test_yt_date_matches_strptime():
+    dates = [
+        F"{y}-{mo}-{d}T{h}:{mi}:{s}{f}Z"
+        for y, mo, d, h, mi, s, f in itertools.product(
+            ['2023', '1999', '0001'], ['01', '12', '13', '1', '00'], ['01', '29', '31', '32'],
+            ['00', '23', '24'], ['00', '59', '60'], ['00', '59', '60', '61'],
+            ['', '.', '.5', '.12', '.123', '.1234', '.123456', '.1234567'])
+    ] + [
+        '2023-07-30T12:34:56+00:00', '2023-07-30T12:34:56', '2023-07-30 12:34:56Z',
+        '20230730T123456Z', '2023-07-30T12:34:56.123+00:00', '２０２３-07-30T12:34:56Z',
+    ]
+    for date in dates:
+        assert outcome(yt_date, date) == outcome(reference_date, date), date
+
+def test_yt_duration_matches_regex():
+    durations = ['P', 'PT', 'P1D', 'PT1S', 'PT59M59S', 'P2DT3H4M5S', 'PT100M', 'P1W', 'PT1H1H',
+        'PT12H', 'PT1H2S', 'P0D', 'PT1M2', 'X', '', 'pt1s', 'P10DT1S']
+    for duration in durations:
+        assert outcome(yt_duration, duration) == outcome(reference_duration, duration), duration
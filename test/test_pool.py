@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+from SlyAPI.web import ApiError
+from SlyYTDAPI import *
+from mock_youtube import MockYouTube, FakeClock
+
+def pooled(server: MockYouTube, pool: CredentialPool) -> YouTubeData:
+    yt = YouTubeData(pool)
+    yt.base_url = server.url
+    return yt
+
+async def test_most_remaining():
+    pool = CredentialPool(['key1', 'key2', 'key3'])
+    async with MockYouTube() as server:
+        yt = pooled(server, pool)
+        await asyncio.gather(*(yt.video(F"vid{i}") for i in range(30)))
+        await yt.search_videos('query', limit=5) # 100 units on one key
+        await asyncio.gather(*(yt.video(F"vid{i}") for i in range(30)))
+    assert server.keys['key1'] + server.keys['key2'] + server.keys['key3'] == 61
+    # the key which paid for the search was used for no more videos
+    units = sorted(c.quota.spent() for c in pool.credentials)
+    assert units == [25, 25, 110]
+    assert pool.spread() < 0.3
+
+async def test_round_robin_failover():
+    clock = FakeClock()
+    pool = CredentialPool(['key1', 'key2', 'key3'], balance=Balance.ROUND_ROBIN, cooldown=600, clock=clock)
+    async with MockYouTube() as server:
+        yt = pooled(server, pool)
+        for i in range(6):
+            await yt.video(F"vid{i}")
+        assert server.keys == { 'key1': 2, 'key2': 2, 'key3': 2 }
+        assert pool.spread() == 1.0
+
+        server.exhausted_keys = {'key1', 'key2'}
+        for i in range(3):
+            assert (await yt.video(F"vid{i}")).id == F"vid{i}"
+        # key1 and key2 each failed once, then were skipped
+        assert (server.keys['key1'], server.keys['key2'], server.keys['key3']) == (3, 3, 5)
+        assert pool.failovers == 2
+        assert [c.quota_errors for c in pool.credentials] == [1, 1, 0]
+
+        # the last key's error is raised, then requests are not sent
+        server.exhausted_keys.add('key3')
+        with pytest.raises(ApiError):
+            await yt.video('vid1')
+        assert server.keys['key3'] == 6
+        with pytest.raises(CircuitOpen) as error:
+            await yt.video('vid1')
+        assert error.value.retry_after == 600
+        assert server.keys['key3'] == 6
+
+        # back after the cooldown
+        server.exhausted_keys.clear()
+        clock.now = 600
+        await yt.video('vid1')
+
+async def test_budget():
+    pool = CredentialPool(['key1', 'key2'], budget=150)
+    async with MockYouTube() as server:
+        yt = pooled(server, pool)
+        await yt.search_videos('a', limit=5)
+        await yt.search_videos('b', limit=5)
+        assert server.keys == { 'key1': 1, 'key2': 1 }
+        # neither key has 100 units left
+        with pytest.raises(CircuitOpen):
+            await yt.search_videos('c', limit=5)
+        await yt.video('vid1')
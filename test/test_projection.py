@@ -0,0 +1,43 @@
+import pytest
+from SlyYTDAPI import *
+from SlyYTDAPI.projection import fields_expression
+from mock_youtube import MockYouTube
+
+def test_fields_expression():
+    assert fields_expression([('statistics', 'viewCount'), ('statistics', 'likeCount')]) \
+        == 'items(id,statistics(viewCount,likeCount)),nextPageToken'
+    # a whole part includes its fields
+    assert fields_expression([('snippet', 'title'), ('snippet',), ('snippet', 'tags')]) \
+        == 'items(id,snippet),nextPageToken'
+
+async def test_video_projection():
+    async with MockYouTube() as server:
+        yt = server.client()
+        ids = [F"vid{i}" for i in range(60)]
+        full = await yt.videos(ids, {Part.SNIPPET, Part.STATISTICS})
+        full_bytes = server.bytes_sent['/videos']
+
+        stats = await yt.videos(ids, fields=['view_count', 'like_count', 'published_at'])
+        assert server.bytes_sent['/videos'] - full_bytes < full_bytes / 3
+        for f, v in zip(full, stats):
+            assert (v.id, v.view_count, v.like_count, v.published_at) \
+                == (f.id, f.view_count, f.like_count, f.published_at)
+            assert v.comment_count is None # class default
+            assert not hasattr(v, 'title')
+            assert v.link() == f.link()
+
+        with pytest.raises(ValueError):
+            yt.videos(ids, fields=['view_count', 'nonsense'])
+        # a projected video is not lazy
+        with pytest.raises(ValueError):
+            yt.videos(ids, lazy=True, fields=['view_count'])
+
+async def test_channel_projection():
+    async with MockYouTube() as server:
+        yt = server.client()
+        full, = await yt.channels(['UC1'], {Part.SNIPPET, Part.DETAILS, Part.STATISTICS}) # type: ignore
+        slim, = await yt.channels(['UC1'], Part.ID, fields=['subscriber_count', 'uploads_playlist', 'profile_image_url'])
+        assert slim.subscriber_count == full.subscriber_count
+        assert slim.uploads_playlist.id == full.uploads_playlist.id
+        assert slim.profile_image_url == full.profile_image_url
+        assert not hasattr(slim, 'display_name')
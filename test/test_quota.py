@@ -0,0 +1,34 @@
+import pytest
+from SlyYTDAPI import *
+from mock_youtube import MockYouTube, FakeClock, FakeSleep
+
+async def test_quota_priorities():
+    clock = FakeClock()
+    quota = QuotaScheduler(budget=300, window=100, max_wait=60, clock=clock, sleep=FakeSleep(clock))
+    async with MockYouTube() as server:
+        yt = server.client(quota=quota)
+
+        assert len(await yt.search_videos('cats', limit=5)) == 5
+        with quota.priority(Priority.LOW):
+            await yt.search_videos('dogs', limit=5)
+            # 300 units would pass the low priority limit of 240,
+            # and the oldest units only expire in 100s
+            with pytest.raises(QuotaExhausted):
+                await yt.search_videos('birds', limit=5)
+        with quota.priority(Priority.HIGH):
+            await yt.video('abc')
+
+        assert quota.spent() == 201
+        assert server.hits['/search'] == 2
+
+        clock.now = 50
+        with quota.priority(Priority.LOW):
+            await yt.search_videos('birds', limit=5)
+        assert clock.now == 100 # waited for the window to roll over
+
+    assert quota.stats.requests == 4
+    assert quota.stats.units == 301
+    assert quota.stats.delayed == 1
+    assert quota.stats.rejected == 1
+    assert quota.stats.units_by_endpoint['/search'] == 300
+    assert quota.stats.units_by_priority[Priority.LOW] == 200
@@ -0,0 +1,57 @@
+from SlyYTDAPI import *
+from SlyYTDAPI.resolve import ChannelResolver, classify
+from SlyYTDAPI.store import MemoryStore
+from mock_youtube import MockYouTube
+
+ID = 'UCy0tKL1T7wFoYcxCe0xjN6Q'
+
+def test_classify():
+    assert classify(F"https://www.youtube.com/channel/{ID}/videos") == ('id', ID)
+    assert classify(F" {ID} ") == ('id', ID)
+    assert classify('https://youtube.com/@Some.Handle') == ('handle', 'Some.Handle')
+    assert classify('m.youtube.com/@handle') == ('handle', 'handle')
+    assert classify('@handle') == ('handle', 'handle')
+    assert classify('https://www.youtube.com/c/name') == ('username', 'name')
+    assert classify('https://www.youtube.com/user/name') == ('username', 'name')
+    assert classify('https://example.com/@handle') is None
+    assert classify('UC1') is None
+    assert classify('') is None
+
+async def test_resolve_mixed():
+    ids = [F"UC{i:022}" for i in range(120)]
+    refs = [F"https://www.youtube.com/channel/{id}" for id in ids] \
+        + [F"@handle{i}" for i in range(30)] \
+        + ['https://www.youtube.com/@Handle3', 'https://www.youtube.com/c/someone',
+           '@missing', 'not a channel', ids[0]]
+    async with MockYouTube() as server:
+        yt = server.client()
+        resolver = ChannelResolver(yt, MemoryStore(), concurrency=4)
+        channels = await resolver.channels(refs)
+        # IDs in 3 requests, each handle and username in its own
+        assert server.hits['/channels'] == 3 + 30 + 1 + 1
+        assert resolver.lookups == 32 and resolver.unrecognized == ['not a channel']
+        await resolver.ids(['@handle1', 'also not a channel'])
+        assert resolver.unrecognized == ['also not a channel']
+    assert list(channels) == refs
+    assert channels['@missing'] is None and channels['not a channel'] is None
+    assert channels['https://www.youtube.com/@Handle3'] is channels['@handle3']
+    assert channels[ids[0]].id == ids[0] # type: ignore
+    assert channels['@handle7'].display_name == 'Channel UChandle7' # type: ignore
+
+async def test_cached():
+    store = MemoryStore()
+    refs = ['@one', '@two', '@missing', 'https://www.youtube.com/c/three']
+    async with MockYouTube() as server:
+        yt = server.client()
+        first = await ChannelResolver(yt, store).ids(refs)
+        assert server.hits['/channels'] == 4
+        resolver = ChannelResolver(yt, store)
+        again = await resolver.ids(refs + ['@ONE'])
+        # found in the store, including that there is no channel
+        assert server.hits['/channels'] == 4 and resolver.cached == 4
+        channels = await resolver.channels(refs)
+        assert server.hits['/channels'] == 5
+    assert first == { '@one': 'UCone', '@two': 'UCtwo', '@missing': None,
+        'https://www.youtube.com/c/three': 'UCthree' }
+    assert again == first | { '@ONE': 'UCone' }
+    assert channels['@two'].id == 'UCtwo' and channels['@missing'] is None # type: ignore
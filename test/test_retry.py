@@ -0,0 +1,115 @@
+import asyncio
+import pytest
+from SlyAPI.web import ApiError
+from SlyYTDAPI import *
+from SlyYTDAPI.retry import TokenBucket, error_reason
+from mock_youtube import MockYouTube, FakeClock, FakeSleep
+
+async def test_retry_mid_pagination():
+    sleep = FakeSleep()
+    policy = RetryPolicy(sleep=sleep, jitter=lambda: 0.0)
+    async with MockYouTube(playlist_total=23) as server:
+        yt = server.client(retry=policy)
+        ids: list[str] = []
+        async for video in yt.get_playlist_videos('PL1'):
+            ids.append(video.id)
+            if len(ids) == 7:
+                server.faults['/playlistItems'] = [503, (403, 'rateLimitExceeded'), 429]
+        # the failed page was requested again, without starting over
+        assert ids == [F"PL1-{i}" for i in range(23)]
+        assert server.hits['/playlistItems'] == 5 + 3
+        assert yt.retries == 3 and sleep.delays == [0.25, 0.5, 1.0]
+
+        # not retried
+        server.faults['/videos'] = [404]
+        with pytest.raises(ApiError):
+            await yt.video('vid1')
+        server.faults['/videos'] = [(403, 'quotaExceeded')]
+        with pytest.raises(ApiError):
+            await yt.video('vid1')
+        # retried until out of attempts
+        server.faults['/videos'] = [500] * 5
+        with pytest.raises(ApiError) as error:
+            await yt.video('vid1')
+        assert error.value.status == 500 and yt.retries == 3 + 4
+
+async def test_circuit_breaker():
+    clock = FakeClock()
+    breaker = CircuitBreaker(cooldown=600, clock=clock)
+    async with MockYouTube() as server:
+        yt = server.client(breaker=breaker, retry=RetryPolicy(sleep=FakeSleep()))
+        server.faults['/videos'] = [(403, 'quotaExceeded')]
+        with pytest.raises(ApiError):
+            await yt.video('vid1')
+        assert breaker.trips == 1
+
+        # fails fast for any endpoint, without requests
+        with pytest.raises(CircuitOpen) as error:
+            await yt.channel('UC1')
+        assert error.value.retry_after == 600
+        clock.now = 300
+        with pytest.raises(CircuitOpen):
+            await yt.search_videos('query')
+        assert server.hits['/videos'] == 1 and server.hits['/channels'] == 0 and breaker.rejected == 2
+
+        # one trial after the cooldown, which opens the circuit again
+        clock.now = 700
+        server.faults['/videos'] = [(403, 'quotaExceeded')]
+        with pytest.raises(ApiError):
+            await yt.video('vid1')
+        assert breaker.trips == 2
+        with pytest.raises(CircuitOpen):
+            await yt.video('vid1')
+
+        clock.now = 1400
+        assert (await yt.video('vid1')).id == 'vid1'
+        assert (await yt.video('vid2')).id == 'vid2'
+        assert breaker.opened_at is None
+
+async def test_rate_limit():
+    clock = FakeClock()
+    sleep = FakeSleep(clock)
+    limiter = RateLimiter({ '/search': 0.5 }, burst=2, clock=clock, sleep=sleep)
+    async with MockYouTube() as server:
+        yt = server.client(rate_limit=limiter)
+        for _ in range(4):
+            await yt.search_videos('query', limit=5)
+            await yt.video('vid1') # not limited
+        assert sleep.delays == [2.0, 2.0]
+
+async def test_token_bucket():
+    clock = FakeClock()
+    sleep = FakeSleep()
+    bucket = TokenBucket(rate=2.0, capacity=1, clock=clock, sleep=sleep)
+    for _ in range(4):
+        await bucket.acquire() # at the same time: each waits behind the last
+    assert sleep.delays == [0.5, 1.0, 1.5]
+    clock.now = 10.0
+    await bucket.acquire()
+    assert len(sleep.delays) == 3
+
+def test_error_reason():
+    body = '{"error": {"code": 403, "errors": [{"domain": "youtube.quota", "reason": "quotaExceeded"}]}}'
+    assert error_reason(ApiError(403, body, None)) == 'quotaExceeded'
+    assert error_reason(ApiError(404, '{"error": {"status": "NOT_FOUND"}}', None)) == 'NOT_FOUND'
+    assert error_reason(ApiError(502, '<html>Bad Gateway</html>', None)) is None
+    assert error_reason(ApiError(500, None, None)) is None
+
+async def test_circuit_breaker_cancelled_trial():
+    clock = FakeClock()
+    breaker = CircuitBreaker(cooldown=600, clock=clock)
+    async with MockYouTube() as server:
+        yt = server.client(breaker=breaker)
+        server.faults['/videos'] = [(403, 'quotaExceeded')]
+        with pytest.raises(ApiError):
+            await yt.video('vid1')
+
+        # the trial after the cooldown is cancelled before a response
+        clock.now = 700
+        server.latency = 1.0
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(yt.video('vid1'), 0.05)
+        # so the next request is the trial instead
+        server.latency = 0.0
+        assert (await yt.video('vid1')).id == 'vid1'
+        assert breaker.opened_at is None and breaker.rejected == 0
@@ -0,0 +1,33 @@
+import pytest
+from SlyYTDAPI import *
+from mock_youtube import MockYouTube
+
+async def test_shared_pool():
+    async with MockYouTube(latency=0.01) as server:
+        async with server.client(session=SessionConfig(limit_per_host=2)) as yt:
+            session = yt._client
+            await yt.videos([F"vid{i}" for i in range(400)], concurrency=8)
+            await yt.search_videos('query', limit=20)
+            await yt.comments('vid1', limit=20)
+            assert yt._client is session
+        assert session.closed and yt._maybe_client is None
+        # every request reused one of two connections
+        assert len(server.peers) <= 2 < sum(server.hits.values())
+
+        # reopens after closing
+        await yt.video('vid1')
+        assert yt._client is not session
+        await yt.close()
+
+async def test_no_keepalive():
+    async with MockYouTube() as server:
+        async with server.client(session=SessionConfig(force_close=True)) as yt:
+            for _ in range(3):
+                await yt.video('vid1')
+        assert len(server.peers) == 3
+
+async def test_timeout():
+    async with MockYouTube(latency=0.5) as server:
+        async with server.client(session=SessionConfig(total_timeout=0.05)) as yt:
+            with pytest.raises(TimeoutError):
+                await yt.video('vid1')
@@ -0,0 +1,67 @@
+import math
+import pytest
+from SlyYTDAPI import stats as stats_module
+from SlyYTDAPI.stats import StatsTracker, VideoStats, ChannelStats, NULL
+from mock_youtube import MockYouTube, FakeClock
+
+@pytest.fixture(autouse=True, params=['arrow', 'python'])
+def columns(request, monkeypatch):
+    'Run each test with pyarrow.compute and with the plain Python fallback.'
+    if request.param == 'python':
+        monkeypatch.setattr(stats_module, 'pc', None)
+
+async def test_video_stats():
+    clock = FakeClock()
+    ids = [F"vid{i}" for i in range(120)] + ['missing1']
+    async with MockYouTube() as server:
+        yt = server.client()
+        stats = VideoStats(yt, ids, history=3, concurrency=2, clock=clock)
+
+        first = await stats.poll()
+        assert len(first) == 120 # all but the missing ID
+        assert first[0].id == 'vid0' and first[0].deltas['view_count'] is None
+
+        clock.now = 1800
+        assert await stats.poll() == []
+
+        clock.now = 3600
+        server.views.update({ 'vid5': 100, 'vid99': 7 })
+        changes = await stats.poll()
+        assert [c.id for c in changes] == ['vid5', 'vid99']
+        assert changes[0].deltas == { 'view_count': 100, 'like_count': 0, 'comment_count': 0 }
+        assert changes[0].rates['view_count'] == 200.0 # per hour, over half an hour
+
+        deltas = stats.deltas('view_count', back=2)
+        assert deltas[5] == 100 and deltas[6] == 0 and deltas[120] == NULL
+        rates = stats.rates('view_count', back=2)
+        assert rates[99] == 7.0 and math.isnan(rates[120])
+        assert len(stats.snapshots) == 3
+
+        # only the requested fields are sent
+        assert server.bytes_sent['/videos'] < 120 * 3 * 200
+
+async def test_track_and_untrack():
+    async with MockYouTube() as server:
+        yt = server.client()
+        stats = ChannelStats(yt, ['UC1', 'UC2'])
+        await stats.poll()
+        stats.track(['UC2', 'UC3'])
+        assert stats.ids == ['UC1', 'UC2', 'UC3']
+        assert stats.snapshots[-1].values['subscriber_count'][2] == NULL
+
+        changes = await stats.poll()
+        assert [c.id for c in changes] == ['UC3']
+        assert changes[0].values['video_count'] is not None and changes[0].deltas['video_count'] is None
+
+        stats.untrack(['UC1'])
+        assert stats.ids == ['UC2', 'UC3']
+        assert all(len(column) == 2 for s in stats.snapshots for column in s.values.values())
+        server.views['UC3'] += 5
+        assert [c.id for c in await stats.poll()] == ['UC3']
+
+async def test_abstract():
+    async with MockYouTube() as server:
+        with pytest.raises(TypeError):
+            StatsTracker(server.client()) # type: ignore
+        stats = ChannelStats(server.client())
+        assert await stats.poll() == [] and server.hits['/channels'] == 0
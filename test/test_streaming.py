@@ -0,0 +1,53 @@
+import json
+import pytest
+from SlyYTDAPI import *
+from SlyYTDAPI.streaming import stream_items
+from mock_youtube import MockYouTube
+
+async def chunked(text: str, size: int):
+    data = text.encode()
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+PAGE = {
+    'kind': 'youtube#videoListResponse',
+    'etag': 'abc',
+    'items': [
+        { 'id': 'a', 'n': 12345, 'text': 'café ☃ "quoted" \\\\ \U0001F600', 'nested': { 'list': [1, 2.5, None, True] } },
+        { 'id': 'b', 'n': -7e3, 'text': '' },
+        { 'id': 'c', 'empty': {}, 'also': [] },
+    ],
+    'nextPageToken': 'NEXT',
+    'pageInfo': { 'totalResults': 3, 'resultsPerPage': 50 },
+}
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64, 100_000])
+async def test_stream_items(size: int):
+    for indent in (None, 2):
+        page: dict = {}
+        items = [item async for item in stream_items(chunked(json.dumps(PAGE, indent=indent, ensure_ascii=False), size), page)]
+        assert items == PAGE['items']
+        assert page == { k: v for k, v in PAGE.items() if k != 'items' }
+
+async def test_stream_items_edge_cases():
+    page: dict = {}
+    assert [x async for x in stream_items(chunked('{}', 1), page)] == [] and page == {}
+    assert [x async for x in stream_items(chunked('{"items": [], "n": 10}', 1), page)] == [] and page == { 'n': 10 }
+    with pytest.raises(json.JSONDecodeError):
+        [x async for x in stream_items(chunked('{"items": [{"id": 1}, {"id": ', 3), {})]
+
+async def test_streamed_pages():
+    async with MockYouTube(comment_total=30, reply_total=2) as server:
+        yt = server.client()
+        ids = [F"vid{i}" for i in range(120)] + ['missing1']
+        parts = {Part.SNIPPET, Part.DETAILS, Part.STATISTICS, Part.STATUS}
+        expected = [v.to_dict() for v in await yt.videos(ids, parts)]
+        search = [v.id for v in await yt.search_videos('q', limit=12)]
+        comments = [c.id for c in await yt.comments('vid1', limit=None)]
+        hits = sum(server.hits.values())
+
+        yt = server.client(stream_pages=True)
+        assert [v.to_dict() for v in await yt.videos(ids, parts)] == expected
+        assert [v.id for v in await yt.search_videos('q', limit=12)] == search
+        assert [c.id for c in await yt.comments('vid1', limit=None)] == comments
+        assert sum(server.hits.values()) == 2 * hits
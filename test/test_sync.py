@@ -0,0 +1,42 @@
+import os
+import pytest
+from SlyYTDAPI import *
+from SlyYTDAPI.store import JsonFileStore, SqliteStore
+from SlyYTDAPI.sync import UploadsSync
+from mock_youtube import MockYouTube
+
+async def test_uploads_sync(tmp_path: str):
+    async with MockYouTube() as server:
+        yt = server.client()
+        server.playlists['UUabc'] = [F"v{i}" for i in range(12, 0, -1)]
+        syncer = UploadsSync(yt, JsonFileStore(os.path.join(tmp_path, 'sync.json')), initial_limit=10)
+
+        first = await syncer.sync('UCabc')
+        assert [v.id for v in first] == [F"v{i}" for i in range(12, 2, -1)]
+        assert first[0].view_count is not None
+
+        assert await syncer.sync('UCabc') == []
+
+        server.playlists['UUabc'] = ['v14', 'v13'] + server.playlists['UUabc']
+        videos_before = server.hits['/videos']
+        # state survives a restart
+        syncer = UploadsSync(yt, JsonFileStore(os.path.join(tmp_path, 'sync.json')))
+        assert [v.id for v in await syncer.sync('UCabc')] == ['v14', 'v13']
+        assert server.hits['/videos'] == videos_before + 1
+
+async def test_sync_many(tmp_path: str):
+    async with MockYouTube() as server:
+        yt = server.client()
+        server.playlists['UUa'] = ['a2', 'a1']
+        server.playlists['UUb'] = ['b1']
+        syncer = UploadsSync(yt, SqliteStore(os.path.join(tmp_path, 'sync.db')))
+        synced = await syncer.sync_many(['UCa', 'UCb'])
+        assert { k: [v.id for v in vs] for k, vs in synced.items() } == { 'UCa': ['a2', 'a1'], 'UCb': ['b1'] }
+        assert syncer.watermark('UCa').video_id == 'a2' # type: ignore
+
+def test_sqlite_table_name(tmp_path: str):
+    path = os.path.join(tmp_path, 'state.db')
+    SqliteStore(path, 'uploads_2').close()
+    for table in ['state; DROP TABLE x', '2state', 'state\n', '']:
+        with pytest.raises(ValueError):
+            SqliteStore(path, table)